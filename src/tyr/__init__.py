@@ -1 +1,18 @@
-from . import database, lineage, syntax, interpreter, network
+import importlib
+
+__version__ = "0.0.1"
+
+# Subpackages are imported on first use, so that "import tyr" does not load duckdb, pandas and
+# the rest until they are needed
+_submodules = ("database", "lineage", "syntax", "interpreter", "network", "registry")
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(rf".{name}", __name__)
+
+    raise AttributeError(rf"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_submodules))
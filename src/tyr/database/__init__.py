@@ -1 +1,15 @@
-from . import core, connections, orchestration, validation
+import importlib
+
+# Imported on first use, see tyr/__init__.py
+_submodules = ("core", "connections", "orchestration", "validation", "artifact")
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(rf".{name}", __name__)
+
+    raise AttributeError(rf"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_submodules))
@@ -0,0 +1,317 @@
+"""
+Compiled build artifacts. Compiling a schema renders the SQL of its tables once and saves it
+with the tables each depends on, their definitions and the files they read, and a hash of
+what the schema was built from. Later runs execute the artifact directly, only building the schema's lineage again when
+the input files, the code building the schema or the version of tyr change.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import types
+from typing import Callable, List, TYPE_CHECKING
+
+import tyr
+
+if TYPE_CHECKING:
+    from .connections import Connection
+    from tyr.lineage.schema.core import _Schema
+
+# Incremented whenever the layout of artifacts changes, so that older artifacts are recompiled
+ARTIFACT_VERSION = 3
+
+
+def _update(digest, data: bytes):
+    # Length prefixed, so that different splits of the same bytes between fields differ
+    digest.update(len(data).to_bytes(8, "little"))
+    digest.update(data)
+
+
+def hash_inputs(inputs: List[str]):
+    """
+    Content hash of the files a schema is built from
+
+    :param inputs: Paths of input files, e.g. file and column metadata
+    :type inputs: List[str]
+    :return: Hex digest
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+
+    for path in sorted(inputs):
+        _update(digest, os.path.basename(path).encode())
+
+        digest.update(os.path.getsize(path).to_bytes(8, "little"))
+
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def hash_code(function: Callable):
+    """
+    Hash of the code of function, and of the functions defined in it. Functions it calls are not
+    included
+
+    :param function: Function to hash, e.g. a schema factory
+    :type function: Callable
+    :return: Hex digest
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    stack = [function.__code__]
+
+    while stack:
+        code = stack.pop()
+
+        _update(digest, code.co_code)
+        _update(digest, repr(code.co_names).encode())
+
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                stack.append(const)
+            else:
+                _update(digest, repr(const).encode())
+
+    return digest.hexdigest()
+
+
+def compile_schema(
+    schema: "_Schema",
+    inputs: List[str] = [],
+    output_path: str = None,
+    schema_factory: Callable[[], "_Schema"] = None,
+):
+    """
+    Render the SQL of every table of the schema into an artifact
+
+    :param schema: Schema to compile
+    :type schema: _Schema
+    :param inputs: Paths of the files the schema is built from, hashed to detect changes
+    :type inputs: List[str]
+    :param output_path: Path to save the artifact to as JSON. Default: ``None`` - not saved
+    :type output_path: str
+    :param schema_factory: Function schema was returned by, hashed to detect changes to the code building the schema. Default: ``None`` - not hashed
+    :type schema_factory: Callable[[], _Schema]
+    :return: Artifact dict
+    """
+
+    # Only needed to compile, so loading a saved artifact does not import the lineage layer
+    from .core import (
+        table_dependencies,
+        table_definitions,
+        dependency_order,
+        bulk_records,
+    )
+    from tyr.lineage.core import sql_format
+
+    for table in schema.tables.list_tables_():
+        if bulk_records(table):
+            raise ValueError(
+                rf"{table.name} - tables with bulk records cannot be compiled, their records are not part of the SQL"
+            )
+
+    dependencies = table_dependencies(schema)
+    definitions = table_definitions(schema)
+
+    # Executed rather than read, so never reindented
+    with sql_format("compact"):
+        sql = {table.name: table.sql for table in schema.tables.list_tables_()}
+
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "tyr_version": tyr.__version__,
+        "compiled_at": datetime.datetime.now().isoformat(),
+        "inputs_hash": hash_inputs(inputs),
+        "code_hash": None if schema_factory is None else hash_code(schema_factory),
+        "schema": schema.settings.name,
+        "settings_sql": schema.settings.sql,
+        "threads": schema.settings.connection.get("threads", 1),
+        "build_order": dependency_order(dependencies),
+        "tables": {
+            table.name: {
+                "sql": sql[table.name],
+                "depends_on": dependencies[table.name],
+                "definition": definitions[table.name][0],
+                "files": definitions[table.name][1],
+            }
+            for table in schema.tables.list_tables_()
+        },
+    }
+
+    if output_path is not None:
+        save_artifact(artifact, output_path)
+
+    return artifact
+
+
+def save_artifact(artifact: dict, output_path: str):
+    # Written to a temporary file first so an interrupted save never leaves a partial artifact
+    with open(rf"{output_path}.tmp", "w") as f:
+        json.dump(artifact, f, indent=1)
+
+    os.replace(rf"{output_path}.tmp", output_path)
+
+
+def load_artifact(
+    path: str,
+    inputs: List[str] = None,
+    schema_factory: Callable[[], "_Schema"] = None,
+):
+    """
+    Load a saved artifact, if it is still valid
+
+    :param path: Path of saved artifact
+    :type path: str
+    :param inputs: Paths of the files the schema is built from. Default: ``None`` - not checked
+    :type inputs: List[str]
+    :param schema_factory: Function returning the schema. Default: ``None`` - not checked
+    :type schema_factory: Callable[[], _Schema]
+    :return: Artifact dict, or None when there is no artifact, it was saved by another artifact or tyr version, or the inputs or the code of schema_factory have changed
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r") as f:
+        artifact = json.load(f)
+
+    if artifact.get("version") != ARTIFACT_VERSION:
+        return None
+
+    if artifact["tyr_version"] != tyr.__version__:
+        return None
+
+    if inputs is not None and artifact["inputs_hash"] != hash_inputs(inputs):
+        return None
+
+    if schema_factory is not None and artifact["code_hash"] != hash_code(
+        schema_factory
+    ):
+        return None
+
+    return artifact
+
+
+class _ArtifactBuild:
+    """
+    Tables of a compiled schema, as built by execute_artifact. Compiled tables have no bulk
+    records and are not appended to, see core._SchemaBuild
+
+    :param artifact: Compiled schema, see compile_schema
+    :type artifact: dict
+    """
+
+    def __init__(self, artifact: dict) -> None:
+        from .core import BuildPlan, fingerprint
+
+        self.artifact = artifact
+        self.name = artifact["schema"]
+        self.settings_sql = artifact["settings_sql"]
+        self.threads = artifact["threads"]
+        self.plan = BuildPlan(
+            {
+                table: compiled["depends_on"]
+                for table, compiled in artifact["tables"].items()
+            }
+        )
+        # The files read are checked as they are now, so new and changed files are built again
+        self.fingerprints = {
+            table: fingerprint(compiled["definition"], compiled["files"])
+            for table, compiled in artifact["tables"].items()
+        }
+        self.definitions = {
+            table: compiled["definition"]
+            for table, compiled in artifact["tables"].items()
+        }
+        self.appendable = {}
+
+    def sql(self, table: str):
+        return self.artifact["tables"][table]["sql"]
+
+    def records(self, table: str):
+        return []
+
+
+def execute_artifact(
+    artifact: dict,
+    conn: "Connection",
+    overwrite: bool = True,
+    skip_errors: bool = False,
+    workers: int = None,
+    profile: bool = False,
+    run_id: str = None,
+):
+    """
+    Create the tables of a compiled schema, in the generations of their BuildPlan as
+    create_tables does
+
+    :param artifact: Compiled schema, see compile_schema
+    :type artifact: dict
+    :param conn: Connection to create the tables through
+    :type conn: Connection
+    :param overwrite: Drop and recreate the schema. If False, tables that exist are only built again when their fingerprint, from their compiled definition and the files they read as they are now, differs from the one recorded when they were built
+    :type overwrite: bool
+    :param skip_errors: See create_tables
+    :type skip_errors: bool
+    :param workers: See create_tables. Default: threads of the compiled schema settings
+    :type workers: int
+    :param profile: See create_tables
+    :type profile: bool
+    :param run_id: See create_tables
+    :type run_id: str
+    :return: pd.DataFrame - see create_tables
+    """
+
+    from .core import _build_tables
+
+    return _build_tables(
+        _ArtifactBuild(artifact),
+        conn,
+        overwrite=overwrite,
+        skip_errors=skip_errors,
+        workers=workers,
+        profile=profile,
+        run_id=run_id,
+    )
+
+
+def build(
+    path: str,
+    inputs: List[str],
+    schema_factory: Callable[[], "_Schema"],
+    conn: "Connection",
+    overwrite: bool = True,
+):
+    """
+    Execute the artifact at path, compiling it first only if it is missing or stale
+
+    :param path: Path of artifact
+    :type path: str
+    :param inputs: Paths of the files the schema is built from
+    :type inputs: List[str]
+    :param schema_factory: Function returning the schema, only called when the artifact must be compiled
+    :type schema_factory: Callable[[], _Schema]
+    :param conn: Connection to create the tables through
+    :type conn: Connection
+    :param overwrite: See execute_artifact
+    :type overwrite: bool
+    :return: Artifact dict
+    """
+
+    artifact = load_artifact(path, inputs=inputs, schema_factory=schema_factory)
+
+    if artifact is None:
+        artifact = compile_schema(
+            schema_factory(),
+            inputs=inputs,
+            output_path=path,
+            schema_factory=schema_factory,
+        )
+
+    execute_artifact(artifact, conn, overwrite=overwrite)
+
+    return artifact
@@ -1,5 +1,6 @@
 import duckdb
 import pandas as pd
+import threading
 
 # Athena is currently fucked. AWS wrangler seems like a really shit package.
 
@@ -22,6 +23,22 @@ class Response:
 
 
 class Connection:
+    """
+    Connection to a database. Queries are executed on a cursor per thread, opened on the first
+    query of the thread and reused by the queries after it, so queries can be executed from
+    worker threads. The cursors of threads that have finished are closed as new threads open
+    theirs.
+
+    :param name: Connection name
+    :type name: str
+    :param syntax: SQL syntax of the database e.g. duckdb
+    :type syntax: str
+    :param database: Path to the database, or ":memory:". Default: ``None`` - no database connection
+    :type database: str
+    :param read_only: Open the database read only. Default: ``False``
+    :type read_only: bool
+    """
+
     def __init__(
         self, name: str, syntax: str, database: str = None, read_only: bool = False
     ):
@@ -29,27 +46,83 @@ class Connection:
         self.database = database
         self.syntax = syntax
         self.read_only = read_only
+        self._cursors = {}
+        self._lock = threading.Lock()
 
         if database:
             self.connection = duckdb.connect(database, read_only=self.read_only)
         else:
             self.connection = None
 
-    def execute(self, query):
+    def cursor(self):
+        """
+        Cursor of the calling thread, opened on its first call from the thread
+
+        :return: duckdb.DuckDBPyConnection
+        """
+
+        if not self.connection:
+            raise AttributeError("No database connection defined")
+
+        thread = threading.current_thread()
+
+        try:
+            return self._cursors[thread]
+        except KeyError:
+            pass
+
+        with self._lock:
+            for finished in [
+                other for other in self._cursors.keys() if not other.is_alive()
+            ]:
+                self._cursors.pop(finished).close()
+
+            self._cursors[thread] = self.connection.cursor()
+
+        return self._cursors[thread]
+
+    def _close_cursors(self):
+        with self._lock:
+            for cursor in self._cursors.values():
+                cursor.close()
+
+            self._cursors = {}
+
+    def execute(self, query, parameters=None, fetch: bool = True):
+        """
+        Execute query on the cursor of the calling thread. The result is read before returning, as
+        the cursor is reused by the next query of the thread
+
+        :param query: Query, or data frame to respond with
+        :type query: str|pd.DataFrame
+        :param parameters: Values of the parameters of a prepared query, as a list for ? parameters or a dict for $name parameters. Default: ``None``
+        :type parameters: list|dict
+        :param fetch: Read the result into the response. Statements whose result is not used, e.g. DDL, pass ``False`` to skip building a data frame. Default: ``True``
+        :type fetch: bool
+        :return: Response, or ``None`` when not fetched
+        """
+
         if type(query) is str:
             if self.connection:
                 try:
+                    cursor = self.cursor().execute(query, parameters)
+
+                    if not fetch:
+                        return None
+
+                    # Empty queries, e.g. settings without statements, have no result to read
                     return Response(
-                        self.connection.cursor().execute(query), self.syntax
+                        cursor.df() if cursor.description else pd.DataFrame(),
+                        self.syntax,
                     )
-                except:
+                except Exception:
                     print(
                         rf"""
                     ERROR RUNNING FOLLOWING QUERY:
                     {query}
                     """
                     )
-                    self.connection.cursor().execute(query)
+                    raise
 
             else:
                 raise AttributeError("No database connection defined")
@@ -57,6 +130,36 @@ class Connection:
         elif type(query) is pd.DataFrame:
             return Response(query, self.syntax)
 
+    def executemany(self, query: str, parameters: list):
+        """
+        Prepare query once and execute it for each set of parameters, on the cursor of the calling
+        thread
+
+        :param query: Query with ? or $name parameters
+        :type query: str
+        :param parameters: Values of the parameters for each execution, see execute
+        :type parameters: List[list|dict]
+        """
+
+        if self.connection:
+            # Nothing to execute, which DuckDB rejects
+            if not parameters:
+                return
+
+            try:
+                self.cursor().executemany(query, parameters)
+            except Exception:
+                print(
+                    rf"""
+                ERROR RUNNING FOLLOWING QUERY:
+                {query}
+                """
+                )
+                raise
+
+        else:
+            raise AttributeError("No database connection defined")
+
     def available_functions(self):
         if self.connection:
             if self.syntax == "duckdb":
@@ -101,6 +204,7 @@ class Connection:
     def close(self):
         if self.connection:
             if self.syntax == "duckdb":
+                self._close_cursors()
                 self.connection.close()
         else:
             raise AttributeError("No database connection defined")
@@ -108,6 +212,9 @@ class Connection:
     def open(self):
         if self.connection:
             if self.syntax == "duckdb":
-                self.connection = duckdb.connect(self.database)
+                self._close_cursors()
+                self.connection = duckdb.connect(
+                    self.database, read_only=self.read_only
+                )
         else:
             raise AttributeError("No database connection defined")
@@ -2,11 +2,20 @@ import numpy as np
 import pandas as pd
 import re
 import logging.handlers
+import copy
+import datetime
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 from pythonjsonlogger import jsonlogger
 from .connections import Connection
-from tyr.lineage.schema.core import _Schema
+from tyr.lineage.schema.core import _Schema, Append
 from tyr import lineage
-import sqlparse
 
 logger = logging.getLogger()
 formatter = jsonlogger.JsonFormatter()
@@ -31,49 +40,15 @@ def normalize_column_name(column: str):
 
 
 def get_build_order(schema: _Schema):
-    print("Retrieving build order...")
-
-    build_order = pd.DataFrame(
-        columns=["table"] + schema.tables.list_names_()
-    ).set_index("table")
-
-    for table in schema.tables.list_tables_():
-        records = {"table": table.name}
-
-        records.update({table: 0 for table in schema.tables.list_names_()})
-
-        records = [records]
-
-        if (not build_order.empty) and (not records):
-            build_order = pd.concat(
-                [build_order, pd.DataFrame.from_records(records)], axis=1
-            )
-        elif not pd.DataFrame.from_records(records).empty:
-            build_order = pd.DataFrame.from_records(records)
-
-    build_order = build_order.set_index("table")
-
-    print("Iterating through build order...")
-    for table in schema.tables.list_tables_():
-        print(table.name)
-
-        try:
-            for node in [
-                node
-                for node in table.graph.rx_graph.nodes()
-                if node["type"] in [str(lineage.tables.Select)]
-            ]:
-                build_order.loc[node[0], table.name] = 1
-        except:
-            pass
-
-    build_order = build_order[build_order.sum().sort_values().index.tolist()].reindex(
-        build_order.sum().sort_values().index.tolist()
-    )
+    """
+    Order to build the tables of schema in, see BuildPlan
 
-    build_order = build_order.index.tolist()
+    :param schema: Schema to build
+    :type schema: _Schema
+    :return: List of table names
+    """
 
-    return build_order
+    return build_plan(schema).order
 
 
 def purge(c: Connection, verify: bool = True):
@@ -100,13 +75,710 @@ def purge(c: Connection, verify: bool = True):
         )
 
         for schema in schema_names:
-            c.execute(rf"DROP SCHEMA IF EXISTS {schema} CASCADE")
+            c.execute(rf"DROP SCHEMA IF EXISTS {schema} CASCADE", fetch=False)
     else:
         print("ABORTING PURGE")
 
 
 def purge_schema(schema: _Schema, c: Connection):
-    c.execute(rf"DROP SCHEMA IF EXISTS {schema.settings.name} CASCADE")
+    c.execute(rf"DROP SCHEMA IF EXISTS {schema.settings.name} CASCADE", fetch=False)
+
+
+def _table_inputs(table):
+    # Tables selected from, and source files read, by the lineage of table. Selected tables are
+    # built separately, so are not walked into
+    selected = {}
+    source_files = {}
+    seen = set()
+    stack = list(lineage.core._node_inputs(table))
+
+    while stack:
+        node = stack.pop()
+
+        if id(node) in seen:
+            continue
+
+        seen.add(id(node))
+
+        if isinstance(node, lineage.tables.Select):
+            selected.setdefault(id(node.source), node.source)
+
+            continue
+
+        if isinstance(node, lineage.schema.source.SourceFile):
+            source_files.setdefault(id(node), node)
+
+        stack.extend(lineage.core._node_inputs(node))
+
+    return list(selected.values()), list(source_files.values())
+
+
+def table_dependencies(schema: _Schema):
+    """
+    Tables of the schema that each table of the schema selects from
+
+    :param schema: Schema to inspect
+    :type schema: _Schema
+    :return: Dict of table name to list of the names of the tables it depends on
+    """
+
+    dependencies = {}
+
+    for table in schema.tables.list_tables_():
+        depends_on = []
+
+        for source in _table_inputs(table)[0]:
+            source_schema = getattr(source, "schema", None)
+
+            if (
+                source_schema
+                and source_schema.settings.name == schema.settings.name
+                and source.name != table.name
+                and source.name not in depends_on
+            ):
+                depends_on.append(source.name)
+
+        dependencies[table.name] = depends_on
+
+    return dependencies
+
+
+def _file_manifest(patterns):
+    manifest = []
+
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            status = os.stat(path)
+            manifest.append([path, status.st_size, status.st_mtime_ns])
+
+    return sorted(manifest)
+
+
+def source_manifest(table):
+    """
+    Files read by table, with their size and modification time
+
+    :param table: Table to inspect
+    :type table: tyr.lineage.core._Table
+    :return: List of [path, size, modification time in ns], sorted by path
+    """
+
+    return _file_manifest(
+        [source_file.file_regex.value for source_file in _table_inputs(table)[1]]
+    )
+
+
+def table_definitions(schema: _Schema):
+    """
+    Definition of each table of schema: a hash of its SQL and the definitions of the tables it
+    selects from, in this or other schemas, with the file patterns read by the table and those
+    tables. A table's definition changes when it or any of the tables it is built from changes,
+    but not as files are added or updated, see table_fingerprints.
+
+    :param schema: Schema to inspect
+    :type schema: _Schema
+    :return: Dict of table name to (hex digest, sorted list of file patterns)
+    """
+
+    definitions = {}
+
+    def definition(table):
+        try:
+            return definitions[id(table)]
+        except KeyError:
+            pass
+
+        selected, source_files = _table_inputs(table)
+
+        digest = hashlib.blake2b(digest_size=16)
+
+        # Compact, so that definitions do not depend on the format SQL is displayed in
+        with lineage.core.sql_format("compact"):
+            digest.update(table.sql.encode())
+
+        patterns = {source_file.file_regex.value for source_file in source_files}
+        upstream = []
+
+        for source in selected:
+            if source is not table:
+                source_digest, source_patterns = definition(source)
+                upstream.append(source_digest)
+                patterns.update(source_patterns)
+
+        for source_digest in sorted(upstream):
+            digest.update(source_digest.encode())
+
+        definitions[id(table)] = (digest.hexdigest(), sorted(patterns))
+
+        return definitions[id(table)]
+
+    return {table.name: definition(table) for table in schema.tables.list_tables_()}
+
+
+def fingerprint(definition: str, patterns: List[str]):
+    """
+    Fingerprint of a table from its definition and the files matching the patterns it reads, as
+    they are now, see table_definitions
+
+    :param definition: Hex digest of the table definition
+    :type definition: str
+    :param patterns: File patterns read by the table and the tables it selects from
+    :type patterns: List[str]
+    :return: Hex digest
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(definition.encode())
+    digest.update(json.dumps(_file_manifest(patterns)).encode())
+
+    return digest.hexdigest()
+
+
+def table_fingerprints(schema: _Schema, manifests: bool = True):
+    """
+    Fingerprint of each table of schema: its definition and the size and modification time of
+    the files it and the tables it selects from read, see table_definitions. A table's
+    fingerprint changes when it, any of the tables it is built from or any of those files change.
+
+    :param schema: Schema to fingerprint
+    :type schema: _Schema
+    :param manifests: Include the size and modification time of the files read. Otherwise only the definition of the tables is fingerprinted, which does not change as files are added to or updated. Default: ``True``
+    :type manifests: bool
+    :return: Dict of table name to hex digest
+    """
+
+    definitions = table_definitions(schema)
+
+    if not manifests:
+        return {table: digest for table, (digest, patterns) in definitions.items()}
+
+    return {
+        table: fingerprint(digest, patterns)
+        for table, (digest, patterns) in definitions.items()
+    }
+
+
+class BuildPlan:
+    """
+    Dependency graph of the tables of a schema, and the generations it is built in. Each table is
+    in the generation after the last of the tables it depends on, so the tables of a generation
+    only depend on earlier generations and can be built together.
+
+    :param dependencies: Dict of table name to list of the names of the tables it depends on, see table_dependencies. Dependencies on tables not in dependencies are ignored
+    :type dependencies: dict
+    """
+
+    def __init__(self, dependencies: dict) -> None:
+        import rustworkx as rx
+
+        self.dependencies = {
+            table: [
+                dependency for dependency in depends_on if dependency in dependencies
+            ]
+            for table, depends_on in dependencies.items()
+        }
+
+        self.graph = rx.PyDiGraph()
+        self._indices = {
+            table: self.graph.add_node(table) for table in self.dependencies.keys()
+        }
+
+        for table, depends_on in self.dependencies.items():
+            for dependency in depends_on:
+                self.graph.add_edge(
+                    self._indices[dependency], self._indices[table], None
+                )
+
+        if not rx.is_directed_acyclic_graph(self.graph):
+            cycle = [
+                self.graph[index]
+                for index in set(
+                    node for edge in rx.digraph_find_cycle(self.graph) for node in edge
+                )
+            ]
+
+            raise ValueError(rf"Circular dependency between tables: {sorted(cycle)}")
+
+        # Generations keep the order of the tables in dependencies
+        self.generations = [
+            sorted(
+                [self.graph[index] for index in generation],
+                key=lambda table: self._indices[table],
+            )
+            for generation in rx.topological_generations(self.graph)
+        ]
+
+    @property
+    def order(self):
+        """
+        Table names, each after the tables it depends on
+
+        :return: List of table names
+        """
+
+        return [table for generation in self.generations for table in generation]
+
+    def dependents(self, table: str):
+        """
+        Tables that depend on table, directly or through other tables
+
+        :param table: Table name
+        :type table: str
+        :return: List of table names in build order
+        """
+
+        import rustworkx as rx
+
+        descendants = rx.descendants(self.graph, self._indices[table])
+
+        return [
+            dependent
+            for dependent in self.order
+            if self._indices[dependent] in descendants
+        ]
+
+    def without(self, tables: List[str]):
+        """
+        Plan for the remaining tables when tables are already built
+
+        :param tables: Names of tables already built
+        :type tables: List[str]
+        :return: BuildPlan
+        """
+
+        return BuildPlan(
+            {
+                table: depends_on
+                for table, depends_on in self.dependencies.items()
+                if table not in tables
+            }
+        )
+
+
+def build_plan(schema: _Schema):
+    """
+    Plan for building the tables of schema, from the tables each selects from
+
+    :param schema: Schema to build
+    :type schema: _Schema
+    :return: BuildPlan
+    """
+
+    return BuildPlan(table_dependencies(schema))
+
+
+def dependency_order(dependencies: dict):
+    """
+    Order tables so that each comes after the tables it depends on
+
+    :param dependencies: Dict of table name to list of the names of the tables it depends on, see table_dependencies
+    :type dependencies: dict
+    :return: List of table names
+    """
+
+    return BuildPlan(dependencies).order
+
+
+def bulk_records(table):
+    """
+    Bulk record sources that must be loaded before the SQL of table can be executed. Tables
+    selected from are already built, so their sources are not included.
+
+    :param table: Table to be built
+    :type table: tyr.lineage.core._Table
+    :return: List of bulk RecordList and RecordGenerator objects
+    """
+
+    records = []
+    seen = set()
+    stack = [table]
+
+    while stack:
+        node = stack.pop()
+
+        if id(node) in seen or isinstance(node, lineage.tables.Select):
+            continue
+
+        seen.add(id(node))
+
+        if isinstance(node, lineage.core._Records) and node.bulk:
+            records.append(node)
+
+        stack.extend(lineage.core._node_inputs(node))
+
+    return records
+
+
+def load_records(
+    records: lineage.core._Records, conn: Connection, batch_size: int = 100_000
+):
+    """
+    Load bulk records into their relation, streaming them from the records one batch at a time
+
+    :param records: Bulk records to load
+    :type records: tyr.lineage.core.RecordList|tyr.lineage.core.RecordGenerator
+    :param conn: Connection to load the records through
+    :type conn: Connection
+    :param batch_size: Number of records per batch
+    :type batch_size: int
+    """
+
+    # Registered data frames are only visible to the cursor that registers them
+    cursor = conn.cursor()
+
+    cursor.execute(
+        rf"""CREATE OR REPLACE TABLE {records.relation} ({', '.join([column.name + " " + column.data_type.value for column in records.columns.list_columns_()])})"""
+    )
+
+    for batch in records.batches(batch_size):
+        cursor.register("records_batch", batch)
+        cursor.execute(rf"INSERT INTO {records.relation} SELECT * FROM records_batch")
+        cursor.unregister("records_batch")
+
+
+# Fingerprints, and watermarks of appended tables, of the tables built in the database, see
+# table_fingerprints and lineage.schema.core.Append
+_STATE_TABLE = "main.tyr_table_state"
+
+
+def _table_state(schema_name: str, conn: Connection):
+    conn.execute(
+        rf"CREATE TABLE IF NOT EXISTS {_STATE_TABLE} (schema_name VARCHAR, table_name VARCHAR, fingerprint VARCHAR, built_at TIMESTAMP)",
+        fetch=False,
+    )
+
+    # Added after the state table was introduced, so added to state tables already in databases
+    for column in ["definition", "watermark", "watermark_type"]:
+        conn.execute(
+            rf"ALTER TABLE {_STATE_TABLE} ADD COLUMN IF NOT EXISTS {column} VARCHAR",
+            fetch=False,
+        )
+
+    state = conn.execute(
+        rf"SELECT table_name, fingerprint, definition, watermark, watermark_type FROM {_STATE_TABLE} WHERE schema_name = ?",
+        [schema_name],
+    ).df()
+
+    return {row["table_name"]: row for row in state.to_dict("records")}
+
+
+def recorded_fingerprints(schema: _Schema, conn: Connection):
+    """
+    Fingerprints recorded for the tables of schema when they were last built
+
+    :param schema: Schema to look up
+    :type schema: _Schema
+    :param conn: Connection to the database
+    :type conn: Connection
+    :return: Dict of table name to fingerprint
+    """
+
+    return {
+        table: row["fingerprint"]
+        for table, row in _table_state(schema.settings.name, conn).items()
+    }
+
+
+def _sql_literal(value):
+    if value is None:
+        return "NULL"
+
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _record_state(schema_name: str, state: dict, conn: Connection):
+    # Tables without a state are forgotten, so they are built again
+    conn.executemany(
+        rf"DELETE FROM {_STATE_TABLE} WHERE schema_name = ? AND table_name = ?",
+        [[schema_name, table] for table in state.keys()],
+    )
+
+    conn.executemany(
+        rf"INSERT INTO {_STATE_TABLE} (schema_name, table_name, fingerprint, built_at, definition, watermark, watermark_type) VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?)",
+        [
+            [
+                schema_name,
+                table,
+                row["fingerprint"],
+                row["definition"],
+                row["watermark"],
+                row["watermark_type"],
+            ]
+            for table, row in state.items()
+            if row is not None
+        ],
+    )
+
+
+def _watermark(schema_name: str, table: str, event_time: str, conn: Connection):
+    watermark = conn.execute(
+        rf"""SELECT CAST(MAX("{event_time}") AS VARCHAR) AS watermark, typeof(MAX("{event_time}")) AS watermark_type FROM {schema_name}.{table}"""
+    ).df()
+
+    if watermark["watermark"][0] is None:
+        return None, None
+
+    return watermark["watermark"][0], watermark["watermark_type"][0]
+
+
+def append_sql(table, watermark: str, watermark_type: str, lookback=None):
+    """
+    SQL selecting the rows of table with an event_time past watermark. Rows from lookback before
+    watermark are read so that window functions over earlier rows give the same results as
+    selecting every row, but only rows past watermark are returned.
+
+    :param table: Table with an event_time
+    :type table: tyr.lineage.core._Table
+    :param watermark: Latest event_time already in the table, as VARCHAR
+    :type watermark: str
+    :param watermark_type: Data type of the event_time e.g. TIMESTAMP
+    :type watermark_type: str
+    :param lookback: How far before watermark rows are read, see lineage.schema.core.Append. Default: ``None``
+    :type lookback: datetime.timedelta|int|float
+    :return: str
+    """
+
+    if table.event_time is None:
+        raise ValueError(rf"Table {table.name} has no event_time to append by")
+
+    bound = rf"CAST({_sql_literal(watermark)} AS {watermark_type})"
+
+    if lookback is None:
+        start = bound
+    elif isinstance(lookback, datetime.timedelta):
+        start = rf"({bound} - INTERVAL '{lookback.total_seconds()} seconds')"
+    else:
+        start = rf"({bound} - {lookback})"
+
+    check = lineage.expressions.GreaterThanOrEqual(
+        left=table.event_time, right=lineage.values.Raw(start)
+    )
+
+    if table.where_condition is None:
+        where_condition = lineage.core.Condition(checks=[check])
+    else:
+        where_condition = lineage.core.Condition(
+            checks=table.where_condition.checks + [check],
+            link_operators=table.where_condition.link_operators
+            + [lineage.operators.And()],
+        )
+
+    # A copy restricted to the rows read, leaving the SQL and lineage of table as they are
+    appended = copy.copy(table)
+    object.__setattr__(appended, "where_condition", where_condition)
+
+    return rf"""SELECT * FROM ({appended.sql}) AS appended WHERE appended."{table.event_time.name}" > {bound}"""
+
+
+# Operators of the profiled table builds, see create_tables
+_PROFILE_TABLE = "main.tyr_run_profile"
+
+_PROFILE_COLUMNS = {
+    "run_id": "VARCHAR",
+    "schema_name": "VARCHAR",
+    "table_name": "VARCHAR",
+    "operator_id": "INTEGER",
+    "parent_id": "INTEGER",
+    "depth": "INTEGER",
+    "operator_type": "VARCHAR",
+    "extra_info": "VARCHAR",
+    "timing": "DOUBLE",
+    "cardinality": "BIGINT",
+    "peak_memory": "BIGINT",
+}
+
+# Profiled from DuckDB 1.1, where the metrics of a profile are selectable
+_PROFILE_METRICS = [
+    "OPERATOR_TYPE",
+    "OPERATOR_TIMING",
+    "OPERATOR_CARDINALITY",
+    "EXTRA_INFO",
+    "LATENCY",
+    "SYSTEM_PEAK_BUFFER_MEMORY",
+]
+
+
+def _enable_profiling(cursor, profile_path: str):
+    cursor.execute("PRAGMA enable_profiling='json'")
+    cursor.execute(rf"PRAGMA profiling_output='{profile_path}'")
+
+    metrics = json.dumps({metric: "true" for metric in _PROFILE_METRICS})
+
+    # Earlier versions of DuckDB always profile the timing and cardinality of each operator, but
+    # not peak memory
+    try:
+        cursor.execute(rf"PRAGMA custom_profiling_settings='{metrics}'")
+    except Exception:
+        pass
+
+
+def profile_operators(profile: dict):
+    """
+    Operators of a DuckDB JSON query profile, root first
+
+    :param profile: Query profile, as written by PRAGMA enable_profiling='json'
+    :type profile: dict
+    :return: List of dicts of operator_id, parent_id, depth, operator_type, extra_info, timing in seconds, cardinality and peak_memory in bytes. peak_memory is of the query, so only set for the root
+    """
+
+    operators = []
+
+    def visit(node, parent_id, depth):
+        operator_id = len(operators)
+        extra_info = node.get("extra_info")
+
+        # Key names differ between DuckDB versions, operator_* are from DuckDB 1.1
+        operators.append(
+            {
+                "operator_id": operator_id,
+                "parent_id": parent_id,
+                "depth": depth,
+                "operator_type": node.get("operator_type", node.get("name", "QUERY")),
+                "extra_info": (
+                    extra_info
+                    if extra_info is None or isinstance(extra_info, str)
+                    else json.dumps(extra_info)
+                ),
+                "timing": node.get(
+                    "operator_timing", node.get("timing", node.get("latency"))
+                ),
+                "cardinality": node.get(
+                    "operator_cardinality", node.get("cardinality")
+                ),
+                "peak_memory": node.get("system_peak_buffer_memory"),
+            }
+        )
+
+        for child in node.get("children", []):
+            visit(child, operator_id, depth + 1)
+
+    visit(profile, None, 0)
+
+    return operators
+
+
+def _record_profiles(schema_name: str, run_id: str, profiles: dict, conn: Connection):
+    conn.execute(
+        rf"CREATE TABLE IF NOT EXISTS {_PROFILE_TABLE} ({', '.join([column + ' ' + data_type for column, data_type in _PROFILE_COLUMNS.items()])})",
+        fetch=False,
+    )
+
+    profile = pd.DataFrame(
+        [
+            {
+                "run_id": run_id,
+                "schema_name": schema_name,
+                "table_name": table,
+                **operator,
+            }
+            for table, operators in profiles.items()
+            for operator in operators
+        ],
+        columns=list(_PROFILE_COLUMNS.keys()),
+    ).astype(
+        {
+            "operator_id": "Int64",
+            "parent_id": "Int64",
+            "depth": "Int64",
+            "timing": "Float64",
+            "cardinality": "Int64",
+            "peak_memory": "Int64",
+        }
+    )
+
+    # Registered data frames are only visible to the cursor that registers them
+    cursor = conn.cursor()
+    cursor.register("profile", profile)
+    cursor.execute(rf"INSERT INTO {_PROFILE_TABLE} SELECT * FROM profile")
+    cursor.unregister("profile")
+
+
+def _create_table(statement: str, conn: Connection, profile_path: str):
+    # Tables of a generation are created from worker threads, each on the cursor of its thread
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    error = None
+    operators = None
+
+    try:
+        # Statements are compact, and only reindented when they are logged
+        if logger.isEnabledFor(logging.DEBUG):
+            import sqlparse
+
+            logger.debug(sqlparse.format(statement, reindent=True))
+
+        # Profiling is per cursor, so only the statements of this thread are profiled
+        if profile_path is not None:
+            _enable_profiling(cursor, profile_path)
+
+        cursor.execute(statement)
+
+        if profile_path is not None:
+            with open(profile_path) as file:
+                operators = profile_operators(json.load(file))
+    except Exception as e:
+        error = e
+    finally:
+        if profile_path is not None:
+            cursor.execute("PRAGMA disable_profiling")
+
+    return start, time.perf_counter() - start, error, operators
+
+
+class _SchemaBuild:
+    """
+    Tables of a schema, as built by create_tables. See artifact._ArtifactBuild for the tables of
+    a compiled schema
+
+    :param schema: Schema to build
+    :type schema: _Schema
+    """
+
+    def __init__(self, schema: _Schema) -> None:
+        self.schema = schema
+        self.name = schema.settings.name
+        self.settings_sql = schema.settings.sql
+        self.threads = schema.settings.connection.get("threads", 1)
+        self.plan = build_plan(schema)
+        definitions = table_definitions(schema)
+
+        self.definitions = {
+            table: digest for table, (digest, patterns) in definitions.items()
+        }
+        self.fingerprints = {
+            table: fingerprint(digest, patterns)
+            for table, (digest, patterns) in definitions.items()
+        }
+
+        materializations = getattr(schema.settings, "materializations", {})
+
+        # Lookback of the tables that can be appended to, see lineage.schema.core.Append
+        self.appendable = {
+            table: materializations[table].lookback
+            for table in self.plan.dependencies.keys()
+            if isinstance(materializations.get(table), Append)
+            and schema.tables[table].event_time is not None
+        }
+
+    def sql(self, table: str):
+        # Executed rather than read, so never reindented
+        with lineage.core.sql_format("compact"):
+            return self.schema.tables[table].sql
+
+    def records(self, table: str):
+        return bulk_records(self.schema.tables[table])
+
+    def event_time(self, table: str):
+        return self.schema.tables[table].event_time.name
+
+    def append_sql(self, table: str, watermark: str, watermark_type: str):
+        with lineage.core.sql_format("compact"):
+            return append_sql(
+                self.schema.tables[table],
+                watermark,
+                watermark_type,
+                self.appendable[table],
+            )
 
 
 def create_tables(
@@ -114,18 +786,53 @@ def create_tables(
     conn: Connection,
     overwrite: bool = True,
     skip_errors: bool = False,
+    workers: int = None,
+    profile: bool = False,
+    run_id: str = None,
 ):
     """
     Parameters:
         - config:Dict[str,Any] - Python dictionary from yaml config.
         - c:duckdb:duckdb.DuckDBPyConnection=c - DuckDB connection.
+        - overwrite:bool - Drop and recreate the schema. Otherwise tables that exist are only built again when their fingerprint differs from the one recorded when they were built, see table_fingerprints. Tables materialized with lineage.schema.core.Append in the schema settings are appended to instead when only the files they are built from changed.
+        - skip_errors:bool - Report tables that fail to build instead of raising an error.
+        - workers:int - Number of tables built at once. Default: connection["threads"] of the schema settings, or 1.
+        - profile:bool - Profile the statement building each table. The operators of each profile are stored in main.tyr_run_profile, by run_id, schema_name and table_name, see profile_operators.
+        - run_id:str - Run id the profiles are stored under. Default: a new run id, see get_run_id.
     Returns:
+        - pd.DataFrame - Table, generation, status (built/appended/failed/skipped), start and duration in seconds of each table.
     Raises:
+        - ValueError - Tables failed to build and skip_errors is False. Tables that do not depend on them are still built.
     Description:
         - Create all tables in the provided config.
+        - Tables are built in the generations of their BuildPlan. The tables of a generation are
+          built concurrently, each on its own cursor. Tables depending on a table that failed are skipped.
     See Also:
+        - BuildPlan
     """
 
+    return _build_tables(
+        _SchemaBuild(schema),
+        conn,
+        overwrite=overwrite,
+        skip_errors=skip_errors,
+        workers=workers,
+        profile=profile,
+        run_id=run_id,
+    )
+
+
+def _build_tables(
+    build,
+    conn: Connection,
+    overwrite: bool = True,
+    skip_errors: bool = False,
+    workers: int = None,
+    profile: bool = False,
+    run_id: str = None,
+):
+    # Builds the tables of build, a _SchemaBuild or artifact._ArtifactBuild, see create_tables
+
     # Output path for log file
     # component_log_path = config["settings"]["component_log_path"]
 
@@ -143,75 +850,210 @@ def create_tables(
     #     logging.INFO, {"start_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")}
     # )
 
-    build_order = get_build_order(schema)
+    plan = build.plan
+    fingerprints = build.fingerprints
+    definitions = build.definitions
+    state = _table_state(build.name, conn)
+    appends = {}
 
-    print(build_order)
+    logger.debug(rf"Build generations: {plan.generations}")
 
     if overwrite:
-        purge_schema(schema, conn)
-        conn.execute(rf"CREATE SCHEMA {schema.settings.name}")
-        conn.execute(schema.settings.sql)
+        conn.execute(rf"DROP SCHEMA IF EXISTS {build.name} CASCADE", fetch=False)
+        _record_state(build.name, {table: None for table in state.keys()}, conn)
+        conn.execute(rf"CREATE SCHEMA {build.name}", fetch=False)
+        conn.execute(build.settings_sql, fetch=False)
 
     else:
-        conn.execute(schema.settings.sql)
+        conn.execute(build.settings_sql, fetch=False)
 
-        pass_tables = (
+        existing = (
             conn.execute(
                 rf"""
         SELECT name FROM 
-        (SHOW ALL TABLES) WHERE schema = '{schema.settings.name}'
+        (SHOW ALL TABLES) WHERE schema = '{build.name}'
         """
             )
             .df()["name"]
             .tolist()
         )
 
-        print(pass_tables)
+        existing = [
+            table for table in existing if table in state and table in fingerprints
+        ]
 
-        print(build_order)
+        # Tables are only kept if they were built from the same SQL, files and upstream tables
+        pass_tables = [
+            table
+            for table in existing
+            if state[table]["fingerprint"] == fingerprints[table]
+        ]
 
-        build_order = [table for table in build_order if table not in pass_tables]
+        # Appended to when built from the same SQL and upstream tables, only the files read changed
+        appends = {
+            table: state[table]
+            for table in existing
+            if table not in pass_tables
+            and table in build.appendable
+            and state[table]["definition"] == definitions[table]
+            and state[table]["watermark"] is not None
+        }
 
-    for table in build_order:
-        if skip_errors:
-            try:
-                print(
-                    rf"DROP TABLE IF EXISTS {schema.settings.name}.{table}; CREATE TABLE {schema.settings.name}.{table} AS {schema.tables[table].sql}"
-                )
+        logger.debug(rf"Tables kept: {pass_tables}")
 
-                conn.execute(rf"DROP TABLE IF EXISTS {schema.settings.name}.{table}")
+        plan = plan.without(pass_tables)
 
-                conn.execute(
-                    rf"""
-                    PRAGMA enable_profiling='json';
-                    PRAGMA profiling_output='/home/miles/F1/profile_staging_car_telemetry.json';
-                    PRAGMA custom_profiling_settings = '{{"CPU_TIME": "false", "EXTRA_INFO": "true", "OPERATOR_CARDINALITY": "true", "OPERATOR_TIMING": "true"}}';
-                    
-                    EXPLAIN (ANALYZE, format json) {schema.tables[table].sql}
-                """
+        logger.debug(rf"Build generations: {plan.generations}")
+
+    if workers is None:
+        workers = build.threads
+
+    if profile:
+        if run_id is None:
+            run_id = get_run_id("-")
+
+        logger.info(rf"Profiling run {run_id}")
+
+        profile_directory = tempfile.TemporaryDirectory()
+
+    report = []
+    failed = {}
+
+    for generation, tables in enumerate(plan.generations):
+        ready = []
+
+        for table in tables:
+            if any(dependency in failed for dependency in plan.dependencies[table]):
+                logger.warning(
+                    rf"Skipping {table}, depends on a table that was not built"
                 )
 
-                conn.execute(
-                    rf"""
-                DROP TABLE IF EXISTS {schema.settings.name}.{table}; CREATE TABLE {schema.settings.name}.{table} AS {schema.tables[table].sql}
-                """
+                failed[table] = None
+                report.append(
+                    {
+                        "table": table,
+                        "generation": generation,
+                        "status": "skipped",
+                        "start": None,
+                        "duration": None,
+                        "error": None,
+                    }
                 )
-            except:
-                print(rf"""Error encountered in creation of {table}""")
-        else:
-            print(
-                sqlparse.format(
-                    rf"DROP TABLE IF EXISTS {schema.settings.name}.{table}; CREATE TABLE {schema.settings.name}.{table} AS {schema.tables[table].sql}",
-                    reindent=True,
+            else:
+                ready.append(table)
+
+        # Loaded once per generation, as tables built together may share bulk records
+        records = {}
+
+        for table in ready:
+            for source in build.records(table):
+                records.setdefault(source.relation, source)
+
+        for source in records.values():
+            load_records(source, conn)
+
+        # Rendered up front, so that the workers only wait on the database
+        statements = {}
+
+        for table in ready:
+            if table in appends:
+                statements[table] = (
+                    rf"INSERT INTO {build.name}.{table} "
+                    + build.append_sql(
+                        table,
+                        appends[table]["watermark"],
+                        appends[table]["watermark_type"],
+                    )
+                )
+            else:
+                statements[table] = (
+                    rf"DROP TABLE IF EXISTS {build.name}.{table}; CREATE TABLE {build.name}.{table} AS {build.sql(table)}"
                 )
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(workers, len(ready)))
+        ) as executor:
+            results = executor.map(
+                lambda table: _create_table(
+                    statements[table],
+                    conn,
+                    (
+                        os.path.join(profile_directory.name, rf"{table}.json")
+                        if profile
+                        else None
+                    ),
+                ),
+                ready,
             )
 
-            conn.execute(
-                sqlparse.format(
-                    rf"DROP TABLE IF EXISTS {schema.settings.name}.{table}; CREATE TABLE {schema.settings.name}.{table} AS {schema.tables[table].sql}",
-                    reindent=True,
+            profiles = {}
+
+            for table, (start, duration, error, operators) in zip(ready, results):
+                if operators is not None:
+                    profiles[table] = operators
+
+                if error is None:
+                    logger.info(rf"Created {table} in {duration:.3f}s")
+                else:
+                    logger.error(rf"Error encountered in creation of {table}: {error}")
+
+                    failed[table] = error
+
+                report.append(
+                    {
+                        "table": table,
+                        "generation": generation,
+                        "status": (
+                            "failed"
+                            if error is not None
+                            else "appended" if table in appends else "built"
+                        ),
+                        "start": start,
+                        "duration": duration,
+                        "error": None if error is None else str(error),
+                    }
                 )
-            )
+
+        built = {}
+
+        for table in ready:
+            if table in failed:
+                built[table] = None
+                continue
+
+            watermark, watermark_type = None, None
+
+            # The latest event_time built, that the next build appends past
+            if table in build.appendable:
+                watermark, watermark_type = _watermark(
+                    build.name, table, build.event_time(table), conn
+                )
+
+            built[table] = {
+                "fingerprint": fingerprints[table],
+                "definition": definitions[table],
+                "watermark": watermark,
+                "watermark_type": watermark_type,
+            }
+
+        _record_state(build.name, built, conn)
+
+        if profiles:
+            _record_profiles(build.name, run_id, profiles, conn)
+
+        for source in records.values():
+            conn.execute(rf"DROP TABLE IF EXISTS {source.relation}", fetch=False)
+
+    if profile:
+        profile_directory.cleanup()
+
+    errors = [error for error in failed.values() if error is not None]
+
+    if errors and not skip_errors:
+        raise ValueError(
+            rf"Failed to create tables: {[table for table, error in failed.items() if error is not None]}"
+        ) from errors[0]
+
     # Finish
 
     # logging.log(
@@ -219,3 +1061,8 @@ def create_tables(
     # )
     #
     # logger.removeHandler(handler)
+
+    return pd.DataFrame(
+        report,
+        columns=["table", "generation", "status", "start", "duration", "error"],
+    )
@@ -5,12 +5,24 @@ interpreters = {"duckdb": DuckDB}
 
 
 class Interpreter:
-    def __init__(self, syntax="duckdb") -> None:
+    def __init__(self, syntax="duckdb", reindent: bool = True) -> None:
         self.syntax = interpreters[syntax]()
         self.spider = Spider()
+        self.reindent = reindent
 
     def to_sql(self, item):
-        return self.syntax.item_to_sql(item)
+        sql = self.syntax.item_to_sql(item)
+
+        if self.reindent:
+            import sqlparse
+
+            try:
+                return sqlparse.format(sql, reindent=True)
+            except sqlparse.exceptions.SQLParseError:
+                # Nested too deeply for sqlparse to group, so left as generated
+                pass
+
+        return sql
 
     def to_network(self, item):
         return self.spider.item_to_graph(item)
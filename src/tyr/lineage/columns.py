@@ -6,8 +6,6 @@ from ..lineage import core as lineage
 from ..lineage import values as lineage_values
 from ..lineage import dataframes as lineage_dataframes
 from ..lineage import functions as lineage_functions
-import networkx as nx
-import pandas as pd
 import copy
 
 
@@ -2,56 +2,800 @@
 Core intro
 """
 
+import contextlib
 import copy
+import datetime
+import decimal
 import os.path
 import rustworkx as rx
 
 from typing import List, Any, Dict, AnyStr
-import pandas as pd
 import re
 import units
 from ..interpreter import Interpreter
 from .. import network
 import collections
-import sqlparse
+import functools
+import itertools
+import weakref
+import hashlib
+import types
+import sys
+import threading
 
 _interpreters = {"beeswax_duckdb": Interpreter()}
 
+_SQL_FORMATS = ("pretty", "compact")
+
+
+def set_sql_format(sql_format: str = "pretty"):
+    """
+    Set how the SQL of lineage objects is rendered. Pretty SQL is reindented for reading, compact
+    SQL is left as generated, which is much quicker to render and is what the database executes.
+    Use ``pretty_sql`` to display compact SQL.
+
+    :param sql_format: Format of rendered SQL. Options: "pretty" (default), "compact"
+    :type sql_format: str
+    """
+
+    if sql_format not in _SQL_FORMATS:
+        raise ValueError(rf"sql_format must be one of {_SQL_FORMATS}, got {sql_format}")
+
+    _interpreters["beeswax_duckdb"].reindent = sql_format == "pretty"
+
+
+def get_sql_format():
+    """
+    :return: Format of rendered SQL, "pretty" or "compact"
+    """
+
+    return "pretty" if _interpreters["beeswax_duckdb"].reindent else "compact"
+
+
+@contextlib.contextmanager
+def sql_format(sql_format: str):
+    """
+    Render SQL in sql_format within the block, restoring the previous format afterwards, see
+    set_sql_format
+
+    :param sql_format: Format of rendered SQL. Options: "pretty", "compact"
+    :type sql_format: str
+    """
+
+    previous = get_sql_format()
+    set_sql_format(sql_format)
+
+    try:
+        yield
+    finally:
+        set_sql_format(previous)
+
+
+# Bookkeeping attributes of _Node, kept in slots so they never grow the instance dict
+_NODE_SLOTS = (
+    "_sql",
+    "_compact_sql",
+    "_key",
+    "_handle",
+    "_root_indices",
+    "_root_graph",
+    "_data",
+    "_dependents",
+    "_tracked",
+    "_owner",
+    "_lookups",
+    "_interned",
+)
+
+# Bookkeeping attributes, and the graph attribute of objects pickled before graphs were kept in
+# arenas. These are never lineage inputs.
+_NODE_STATE = _NODE_SLOTS + ("_arena", "graph")
+
+# Derived from the other attributes, or only used to present the graph, so not part of a node's
+# structure.
+_NODE_DERIVED = ("_node_data", "macro_group")
+
+# Back-references to the enclosing table or schema. Reassigning one invalidates the node itself,
+# but they are not followed when recording dependencies.
+_NODE_CONTEXT = ("current_table", "source_table", "schema")
+
+
+def _nodes_in(value):
+    if isinstance(value, _Node):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            if isinstance(item, _Node):
+                yield item
+    elif isinstance(value, dict):
+        for item in value.values():
+            if isinstance(item, _Node):
+                yield item
+
+
+def _node_inputs(node):
+    for key, value in node.__dict__.items():
+        if key not in _NODE_STATE and key not in _NODE_CONTEXT:
+            yield from _nodes_in(value)
+
+
+def _add_dependent(node, dependent):
+    try:
+        dependents = node._dependents
+    except AttributeError:
+        dependents = {}
+        object.__setattr__(node, "_dependents", dependents)
+
+    dependents[id(dependent)] = weakref.ref(dependent)
+
+
+def _track(node):
+    """
+    Register node as a dependent of its inputs, and those inputs as dependents of theirs.
+    Each node is only walked once.
+    """
+
+    stack = [node]
+
+    while stack:
+        node = stack.pop()
+
+        if getattr(node, "_tracked", False):
+            continue
+
+        object.__setattr__(node, "_tracked", True)
+
+        for item in _node_inputs(node):
+            _add_dependent(item, node)
+            stack.append(item)
+
+
+# Nodes render the SQL of their inputs inline up to this depth; deeper inputs are rendered first
+# from an explicit stack, so deep lineage never reaches the interpreter's recursion limit.
+_RENDER_DEPTH = 64
+
+_render_state = threading.local()
+
+
+class _Pending(Exception):
+    """
+    Raised when rendering reaches _RENDER_DEPTH, for the input whose SQL is needed first and the
+    nodes that were being rendered inline above it
+    """
+
+    def __init__(self, node, path):
+        self.node = node
+        self.path = path
+
+
+def _release(node, cache):
+    # Inputs that only node uses are not needed again once node is rendered
+    rendered = _render_state.rendered
+
+    for item in _node_inputs(node):
+        if id(item) in rendered and len(getattr(item, "_dependents", ())) == 1:
+            object.__delattr__(rendered.pop(id(item)), cache)
+
+
+def _render(node, interpreter, cache):
+    """
+    Render the SQL of node into its cache, and return it. Inputs are rendered inline and their
+    SQL is cached for the rest of the render, so none is rendered twice; that of inputs used by a
+    single node is dropped as soon as that node is rendered. Afterwards only tables keep their
+    SQL, so the SQL kept grows with the output rather than with the depth of the lineage.
+
+    If rendering reaches an input at _RENDER_DEPTH, that input is rendered first from an explicit
+    stack, then the nodes that were being rendered inline above it, deepest first, so rendering
+    resumes from the input rather than starting over.
+    """
+
+    _track(node)
+
+    rendered = {}
+    _render_state.rendered = rendered
+    stack = [node]
+
+    try:
+        while stack:
+            item = stack[-1]
+
+            if hasattr(item, cache):
+                stack.pop()
+                continue
+
+            _render_state.path = []
+
+            try:
+                sql = interpreter.to_sql(item)
+            except _Pending as pending:
+                stack.extend(pending.path)
+                stack.append(pending.node)
+                continue
+
+            object.__setattr__(item, cache, sql)
+
+            if item is not node and not isinstance(item, _Table):
+                rendered[id(item)] = item
+
+            _release(item, cache)
+            stack.pop()
+    finally:
+        del _render_state.rendered
+
+        for item in rendered.values():
+            try:
+                object.__delattr__(item, cache)
+            except AttributeError:
+                pass
+
+    return getattr(node, cache)
+
+
+def _claim(node, owner, claimed: dict = None):
+    """
+    Give owner its own copy of node to write its context into (a table setting current_table on
+    its columns, a schema setting schema on its tables). The copy is shallow: it shares the
+    inputs of node, so claiming stays cheap, while changes the caller later makes to node itself
+    never reach owner. Nodes owner has already claimed are returned as they are.
+
+    ``claimed`` maps the ids of nodes already copied for owner to their copies, so a node passed
+    to owner more than once, e.g. as a column and as the event time, is only copied once.
+    """
+
+    if getattr(node, "_owner", None) is owner:
+        return node
+
+    if claimed is not None and id(node) in claimed:
+        return claimed[id(node)]
+
+    copied = copy.copy(node)
+    object.__setattr__(copied, "_owner", owner)
+
+    if claimed is not None:
+        claimed[id(node)] = copied
+
+    return copied
+
+
+def _encode(value):
+    """
+    Reduce an attribute value to plain, reproducible python data for structural keys.
+    Nodes are represented by their own key, so each subtree is only hashed once.
+    """
+
+    if isinstance(value, _Node):
+        return structural_key(value)
+    elif value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    elif isinstance(value, (list, tuple)):
+        return tuple(_encode(item) for item in value)
+    elif isinstance(value, dict):
+        return tuple((_encode(key), _encode(item)) for key, item in value.items())
+    elif isinstance(value, (type, types.FunctionType)):
+        return rf"{value.__module__}.{value.__qualname__}"
+    elif isinstance(getattr(value, "_node_data", None), dict):
+        return _encode(value._node_data)
+    elif isinstance(getattr(value, "name", None), str):
+        return (_encode(type(value)), value.name)
+    elif isinstance(
+        value,
+        (datetime.date, datetime.time, datetime.timedelta, decimal.Decimal, bytes),
+    ):
+        return (_encode(type(value)), repr(value))
+    elif isinstance(value, (set, frozenset)):
+        return tuple(sorted((_encode(item) for item in value), key=repr))
+    else:
+        # An object's id would differ between processes, so there is nothing stable to key it by
+        raise ValueError(
+            rf"Cannot build a structural key from {value!r} ({type(value)}), give it a name or _node_data"
+        )
+
+
+def structural_key(node):
+    """
+    Stable content hash of a lineage node. Nodes built the same way from equal inputs share a key,
+    and the key is the same across processes.
+
+    Back-references to the enclosing table or schema only contribute their name.
+
+    :param node: Lineage object
+    :type node: _Node
+    :return: Hex digest
+    :rtype: str
+    """
+
+    try:
+        return node._key
+    except AttributeError:
+        pass
+
+    _track(node)
+
+    state = node.__dict__
+    structure = [_encode(type(node))]
+
+    for key in sorted(state):
+        if key in _NODE_STATE or key in _NODE_DERIVED:
+            continue
+
+        value = state[key]
+
+        if key in _NODE_CONTEXT:
+            structure.append((key, getattr(value, "name", None)))
+        else:
+            structure.append((key, _encode(value)))
+
+    key = hashlib.blake2b(repr(structure).encode(), digest_size=16).hexdigest()
+    object.__setattr__(node, "_key", key)
+
+    return key
+
+
+_interned = weakref.WeakValueDictionary()
+
+
+def _macro_group(node):
+    try:
+        return node.__dict__["macro_group"]
+    except KeyError:
+        pass
+
+    node_data = getattr(node, "_node_data", None)
+
+    if isinstance(node_data, dict):
+        return node_data.get("macro_group")
+
+    return None
+
+
+def intern(node):
+    """
+    Canonical instance of a lineage node. The first node interned with a given structure and
+    macro group is returned for every structurally equal node of the same macro group after it,
+    so repeated subtrees are only kept once.
+
+    Interned nodes are shared, so are frozen: modifying one raises a ValueError.
+
+    :param node: Lineage object
+    :type node: _Node
+    :return: Canonical lineage object
+    :rtype: _Node
+    """
+
+    key = (structural_key(node), _macro_group(node))
+    canonical = _interned.get(key)
+
+    if (
+        canonical is not None
+        and (structural_key(canonical), _macro_group(canonical)) == key
+    ):
+        return canonical
+
+    _interned[key] = node
+    object.__setattr__(node, "_interned", True)
+
+    return node
+
+
+_type_labels = {}
+
+
+def _type_label(node):
+    # "type" and "base" strings for _node_data, shared by every node of a class
+    cls = type(node)
+
+    if cls not in _type_labels:
+        _type_labels[cls] = (sys.intern(str(cls)), sys.intern(str(cls.__bases__[0])))
+
+    return _type_labels[cls]
+
+
+def _type_name(data_type):
+    if data_type:
+        if isinstance(data_type, str):
+            return data_type
+        else:
+            return data_type.name
+    else:
+        return ""
+
+
+class _NodeData:
+    """
+    ``_node_data`` built by the class's ``_build_node_data`` the first time it is needed, rather
+    than stored on every object when it is built.
+    """
+
+    def __get__(self, node, owner=None):
+        if node is None:
+            return self
+
+        try:
+            return node._data
+        except AttributeError:
+            pass
+
+        object.__setattr__(node, "_data", node._build_node_data())
+
+        return node._data
+
+
+def _shared(value):
+    # Data types and operators are never modified once built, so one instance of each can be shared
+    return intern(value) if isinstance(value, _Node) else value
+
+
+class _Node:
+    """
+    Base for lineage objects and their containers.
+
+    Derived values such as rendered SQL are cached on the node and cleared when the node, or any
+    node it is built from, is modified. Dependencies are recorded the first time a node is
+    rendered, so building lineage does not pay for them.
+
+    Nodes compare and hash by structure (see ``structural_key``), so a node must not be
+    modified while it is a dict key or set member. Interned nodes (see ``intern``) are frozen.
+
+    Bookkeeping and caches live in slots, so the instance dict only holds the attributes set
+    when the object is built.
+    """
+
+    __slots__ = _NODE_SLOTS
+
+    _caches = (
+        "_sql",
+        "_compact_sql",
+        "_key",
+        "_handle",
+        "_root_indices",
+        "_root_graph",
+    )
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+
+        if not isinstance(other, _Node):
+            return NotImplemented
+
+        return type(self) is type(other) and structural_key(self) == structural_key(
+            other
+        )
+
+    def __hash__(self):
+        return int(structural_key(self)[:16], 16)
+
+    def __setattr__(self, key, value):
+        if key not in _NODE_STATE and getattr(self, "_interned", False):
+            raise ValueError(
+                rf"{type(self).__qualname__} is interned and shared, so cannot be modified. Modify a copy instead"
+            )
+
+        object.__setattr__(self, key, value)
+
+        # Only tracked nodes can have dependents or cached values
+        if key in _NODE_STATE or not getattr(self, "_tracked", False):
+            return
+
+        for item in _nodes_in(value):
+            _add_dependent(item, self)
+            _track(item)
+
+        self._invalidate()
+
+    def __getstate__(self):
+        return {
+            key: value for key, value in self.__dict__.items() if key not in _NODE_STATE
+        }
+
+    def __copy__(self):
+        copied = type(self).__new__(type(self))
+        copied.__dict__.update(self.__getstate__())
+
+        # Graph data is updated in place, so each copy keeps its own
+        if isinstance(copied.__dict__.get("_node_data"), dict):
+            copied.__dict__["_node_data"] = dict(copied.__dict__["_node_data"])
+
+        return copied
+
+    def _invalidate(self):
+        stack = [self]
+        seen = set()
+
+        while stack:
+            node = stack.pop()
+
+            if id(node) in seen:
+                continue
+
+            seen.add(id(node))
+
+            for cache in node._caches:
+                try:
+                    object.__delattr__(node, cache)
+                except AttributeError:
+                    pass
+
+            for reference in list(getattr(node, "_dependents", {}).values()):
+                dependent = reference()
+
+                if dependent is not None:
+                    stack.append(dependent)
+
+
+class _Renderable(_Node):
+    """
+    Lineage object with SQL. ``sql`` is rendered on first access and cached until invalidated.
+    The SQL of the inputs rendered with it is only cached for tables, see _render.
+
+    Its place in the lineage graph is given by ``_lineage_edges``. The edges are added to a
+    ``GraphArena`` when a graph is first requested rather than when the object is built.
+    """
+
+    def _lineage_edges(self):
+        """
+        Edges between this object and the objects it is directly built from
+
+        :return: (parent, child, edge data) for each edge
+        :rtype: List[tuple]
+        """
+
+        return []
+
+    def _graph_arena(self):
+        schema = self.__dict__.get("schema")
+
+        if schema is None:
+            schema = getattr(self.__dict__.get("current_table"), "schema", None)
+
+        if isinstance(schema, _Renderable) and schema is not self:
+            return schema._graph_arena()
+        else:
+            return GraphArena()
+
+    @property
+    def graph(self):
+        """
+        Graph of this object and the objects it is directly connected to
+
+        :rtype: LineageGraph
+        """
+
+        arena = self._graph_arena()
+
+        return arena.subgraph(arena.register(self, depth=1))
+
+    def root_graph(self):
+        """
+        Graph of this object and everything it is built from. The graph is cached until the object
+        or anything it is built from is modified, so it should be copied before being changed.
+
+        :rtype: LineageGraph
+        """
+
+        try:
+            return self._root_graph
+        except AttributeError:
+            pass
+
+        arena = self._graph_arena()
+        indices = arena.register(self)
+
+        object.__setattr__(self, "_root_indices", (arena, indices))
+        object.__setattr__(self, "_root_graph", arena.subgraph(indices))
+
+        return self._root_graph
+
+    @property
+    def sql(self):
+        interpreter = _interpreters["beeswax_duckdb"]
+
+        # Each format is cached separately so switching formats never serves stale SQL
+        cache = "_sql" if interpreter.reindent else "_compact_sql"
+
+        try:
+            return getattr(self, cache)
+        except AttributeError:
+            pass
+
+        depth = getattr(_render_state, "depth", 0)
+
+        if depth == _RENDER_DEPTH:
+            raise _Pending(self, list(_render_state.path))
+
+        _render_state.depth = depth + 1
+
+        try:
+            if not depth:
+                return _render(self, interpreter, cache)
+
+            _track(self)
+            _render_state.path.append(self)
+
+            try:
+                sql = interpreter.to_sql(self)
+            finally:
+                _render_state.path.pop()
+        finally:
+            _render_state.depth = depth
+
+        # Rendered inline by the node using it, so only kept by tables once rendering ends, see
+        # _render
+        object.__setattr__(self, cache, sql)
+
+        if not isinstance(self, _Table):
+            _render_state.rendered[id(self)] = self
+
+        _release(self, cache)
+
+        return sql
+
+    @property
+    def pretty_sql(self):
+        """
+        SQL reindented for display, whatever the current SQL format
+        """
+
+        import sqlparse
+
+        return sqlparse.format(self.sql, reindent=True)
+
+
+class _LazySQL:
+    """
+    Stands in for a node's SQL within ``_node_data`` so graphs can be built without rendering.
+    The SQL is only rendered when the value is converted to a string. References to structurally
+    equal nodes are equal, so graph unions merge them without rendering either.
+    """
+
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def __str__(self):
+        return self.node.sql
+
+    def __repr__(self):
+        return repr(self.node.sql)
+
+    def __eq__(self, other):
+        if isinstance(other, _LazySQL):
+            return self.node == other.node
+
+        return self.node.sql == other
+
+    def __hash__(self):
+        return hash(self.node)
+
+
+def _data_key(node_data):
+    try:
+        return frozenset(node_data.items())
+    except TypeError:
+        return None
+
 
 class LineageGraph:
+    """
+    Lineage graph wrapping a ``rustworkx.PyDiGraph``.
+
+    Nodes are looked up by their data through an index that is kept up to date by the methods
+    below and rebuilt if ``rx_graph`` is modified directly. Node data that is changed in place
+    is still found by identity.
+    """
+
     def __init__(self, rx_graph: rx.PyDiGraph):
         self.rx_graph = rx_graph
 
+    def __getstate__(self):
+        return {"rx_graph": self.rx_graph}
+
+    def _node_index(self):
+        state = self.__dict__
+
+        if (
+            state.get("_indexed_graph") is not self.rx_graph
+            or state.get("_indexed_count") != self.rx_graph.num_nodes()
+        ):
+            by_id = {}
+            by_key = {}
+
+            for index in self.rx_graph.node_indices():
+                node_data = self.rx_graph[index]
+                by_id.setdefault(id(node_data), index)
+                key = _data_key(node_data)
+
+                if key is not None:
+                    by_key.setdefault(key, index)
+
+            state["_index"] = (by_id, by_key)
+            state["_indexed_graph"] = self.rx_graph
+            state["_indexed_count"] = self.rx_graph.num_nodes()
+
+        return state["_index"]
+
+    def _record(self, index, node_data):
+        state = self.__dict__
+
+        if (
+            state.get("_indexed_graph") is self.rx_graph
+            and state.get("_indexed_count") == self.rx_graph.num_nodes() - 1
+        ):
+            by_id, by_key = state["_index"]
+            by_id.setdefault(id(node_data), index)
+            key = _data_key(node_data)
+
+            if key is not None:
+                by_key.setdefault(key, index)
+
+            state["_indexed_count"] += 1
+
+        return index
+
     def save(self, filename):
-        rx.write_graphml(self.rx_graph, filename)
+        graph = self.rx_graph.copy()
+
+        for index in graph.node_indices():
+            graph[index] = {key: str(value) for key, value in graph[index].items()}
+
+        rx.write_graphml(graph, filename)
 
     def add_node(self, node_data):
-        self.rx_graph.add_node(node_data)
+        return self._record(self.rx_graph.add_node(node_data), node_data)
 
     def add_edge(self, start: int, end: int, data: Dict = {}):
         self.rx_graph.add_edge(start, end, data)
 
     def add_child(self, parent, node_data, edge_data: Dict = {}):
-        self.rx_graph.add_child(parent, node_data, edge_data)
+        return self._record(
+            self.rx_graph.add_child(parent, node_data, edge_data), node_data
+        )
 
     def add_parent(self, child, node_data, edge_data: Dict = {}):
-        self.rx_graph.add_node(node_data)
+        self.add_node(node_data)
         self.rx_graph.add_edge(
             self.node_index_from_data(node_data),
             child,
             edge_data,
         )
 
+    def _merge(self, graph):
+        """
+        Add the nodes and edges of graph, merging nodes with equal data and the edges between them
+        as ``rustworkx.union`` does, but looking nodes up through the index.
+        """
+
+        mapping = {}
+        merged = set()
+
+        for index in graph.rx_graph.node_indices():
+            node_data = graph.rx_graph[index]
+            match = self.node_index_from_data(node_data)
+
+            if match is None:
+                mapping[index] = self.add_node(node_data)
+            else:
+                mapping[index] = match
+                merged.add(index)
+
+        for start, end, edge_data in graph.rx_graph.weighted_edge_list():
+            if (
+                start in merged
+                and end in merged
+                and self.rx_graph.has_edge(mapping[start], mapping[end])
+                and edge_data
+                in self.rx_graph.get_all_edge_data(mapping[start], mapping[end])
+            ):
+                continue
+
+            self.rx_graph.add_edge(mapping[start], mapping[end], edge_data)
+
     def union(self, graphs: List):
         for graph in graphs:
             if isinstance(graph, type(self)):
                 try:
-                    self.rx_graph = rx.union(
-                        self.rx_graph,
-                        graph.rx_graph,
-                        merge_nodes=True,
-                        merge_edges=True,
-                    )
+                    self._merge(graph)
                 except:
                     print("Error encountered")
                     print(type(graph))
@@ -62,6 +806,25 @@ class LineageGraph:
                 raise TypeError(rf"Graph object is not LineageGraph: {type(graph)}")
 
     def node_index_from_data(self, node_data):
+        by_id, by_key = self._node_index()
+
+        index = by_id.get(id(node_data))
+
+        if index is not None and self.rx_graph[index] is node_data:
+            return index
+
+        key = _data_key(node_data)
+
+        if key is not None:
+            index = by_key.get(key)
+
+            if index is None:
+                return None
+
+            if self.rx_graph[index] == node_data:
+                return index
+
+        # Unhashable data, or node data changed in place since it was indexed
         for index in self.rx_graph.node_indices():
             data = self.rx_graph.get_node_data(index)
             if data == node_data:
@@ -72,7 +835,158 @@ class LineageGraph:
         return None
 
 
-class _Operator:
+def _graph_inputs(item):
+    if not hasattr(item, "_lineage_edges"):
+        return []
+
+    inputs = {}
+
+    for edge in item._lineage_edges():
+        for node in edge[:2]:
+            if node is not item and hasattr(node, "_node_data"):
+                inputs[id(node)] = node
+
+    return list(inputs.values())
+
+
+class GraphArena(LineageGraph):
+    """
+    Lineage graph shared by every object within a schema.
+
+    Objects are added once, the first time a graph containing them is requested, and hold a handle
+    to their node. Their edges are added in place. An object that is modified loses its handle and
+    its edges are replaced the next time it is requested.
+    """
+
+    def __init__(self):
+        super().__init__(rx.PyDiGraph())
+        self._contributed = {}
+        self._edge_counts = {}
+
+    def _node(self, item):
+        handle = getattr(item, "_handle", None)
+
+        if handle is not None and handle[0] is self:
+            return handle[1]
+
+        index = self.node_index_from_data(item._node_data)
+
+        if index is None:
+            index = self.add_node(item._node_data)
+
+        return index
+
+    def _add(self, item):
+        handle = getattr(item, "_handle", None)
+
+        if handle is not None and handle[0] is self:
+            return handle[1]
+
+        if isinstance(item, _Node):
+            _track(item)
+
+        index = self._node(item)
+
+        _, previous = self._contributed.pop(id(item), (None, []))
+
+        for edge in previous:
+            self._edge_counts[edge] -= 1
+
+            if not self._edge_counts[edge]:
+                del self._edge_counts[edge]
+                self.rx_graph.remove_edge_from_index(edge)
+
+        edges = []
+
+        if hasattr(item, "_lineage_edges"):
+            for parent, child, edge_data in item._lineage_edges():
+                if not (hasattr(parent, "_node_data") and hasattr(child, "_node_data")):
+                    continue
+
+                start = index if parent is item else self._node(parent)
+                end = index if child is item else self._node(child)
+
+                edge = next(
+                    (
+                        edge
+                        for edge in self.rx_graph.edge_indices_from_endpoints(
+                            start, end
+                        )
+                        if self.rx_graph.get_edge_data_by_index(edge) == edge_data
+                    ),
+                    None,
+                )
+
+                if edge is None:
+                    edge = self.rx_graph.add_edge(start, end, edge_data)
+
+                self._edge_counts[edge] = self._edge_counts.get(edge, 0) + 1
+                edges.append(edge)
+
+        self._contributed[id(item)] = (item, edges)
+
+        if isinstance(item, _Node):
+            object.__setattr__(item, "_handle", (self, index))
+
+        return index
+
+    def register(self, item, depth=None):
+        """
+        Add item, and the objects it is built from, to the arena
+
+        :param item: Lineage object
+        :type item: _Renderable
+        :param depth: Number of steps from item to follow - Default: ``None`` for all
+        :type depth: int
+        :return: Arena node indices
+        :rtype: set
+        """
+
+        if isinstance(item, _Node):
+            _track(item)
+
+        indices = set()
+        seen = set()
+        stack = [(item, 0)]
+
+        while stack:
+            item, level = stack.pop()
+
+            if id(item) in seen:
+                continue
+
+            seen.add(id(item))
+
+            if depth is not None and level >= depth:
+                indices.add(self._node(item))
+                continue
+
+            # Reuse the lineage of anything whose root graph has already been taken from this arena
+            cached = getattr(item, "_root_indices", None)
+
+            if depth is None and cached is not None and cached[0] is self:
+                indices.update(cached[1])
+                continue
+
+            indices.add(self._add(item))
+
+            for node in _graph_inputs(item):
+                stack.append((node, level + 1))
+
+        return indices
+
+    def subgraph(self, indices):
+        """
+        :param indices: Arena node indices
+        :type indices: set
+        :return: Graph of the nodes and the edges between them
+        :rtype: LineageGraph
+        """
+
+        return LineageGraph(self.rx_graph.subgraph(sorted(indices)))
+
+
+class _Operator(_Renderable):
     """
     Mathematical, text, sql operations
 
@@ -80,26 +994,26 @@ class _Operator:
     :type name: str
     """
 
+    _node_data = _NodeData()
+
     def __init__(self, name: str, macro_group: str = "") -> None:
         self.name = name
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
-        self._node_data = {
-            "label": rf"Operator ID: {id(self)}",
+        self.macro_group = macro_group
+
+    def _build_node_data(self):
+        node_type, base = _type_label(self)
+
+        return {
+            "label": str(self.name),
             "name": str(self.name),
-            "type": str(type(self)),
-            "base": str(type(self).__bases__[0]),
-            "macro_group": macro_group,
-            "sql": self.sql,
+            "type": node_type,
+            "base": base,
+            "macro_group": self.macro_group,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        self.graph = LineageGraph(rx_graph=graph)
 
-
-class _Expression:
+class _Expression(_Renderable):
     """
     Mathematical, text, SQL expressions applying an operator between a left and right parameter.
     e.g. 1 = 1 -> TRUE
@@ -120,6 +1034,8 @@ class _Expression:
     :type macro_group: str
     """
 
+    _node_data = _NodeData()
+
     def __init__(
         self,
         left,
@@ -129,52 +1045,34 @@ class _Expression:
         is_primary_key: bool = False,
         is_event_time: bool = False,
         macro_group: str = "",
-    ):
-        self.name = operator
-        self.left = left
-        self.right = right
-        self.operator = operator
-        self.on_null = on_null
-        self.is_primary_key = is_primary_key
-        self.is_event_time = is_event_time
-
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
-        self._node_data = {
-            "label": rf"Expression ID: {id(self)}",
-            "type": str(type(self)),
-            "base": str(type(self).__bases__[0]),
-            "macro_group": macro_group,
-            "sql": self.sql,
-        }
-
-        left = rx.PyDiGraph()
-        right = rx.PyDiGraph()
-
-        left.add_node(self.left._node_data)
-        right.add_node(self.right._node_data)
-
-        left.add_child(0, self._node_data, {})
-        right.add_child(0, self._node_data, {})
+    ):
+        operator = _shared(operator)
 
-        graph = rx.union(left, right, merge_nodes=True, merge_edges=True)
-        self.graph = LineageGraph(rx_graph=graph)
+        self.name = operator
+        self.left = left
+        self.right = right
+        self.operator = operator
+        self.on_null = on_null
+        self.is_primary_key = is_primary_key
+        self.is_event_time = is_event_time
+        self.macro_group = macro_group
 
-    def root_graph(self):
-        graph = self.graph
+    def _build_node_data(self):
+        node_type, base = _type_label(self)
 
-        graph.union(
-            [
-                self.left.root_graph(),
-                self.right.root_graph(),
-            ]
-        )
+        return {
+            "label": "Expression",
+            "type": node_type,
+            "base": base,
+            "macro_group": self.macro_group,
+            "sql": _LazySQL(self),
+        }
 
-        return graph
+    def _lineage_edges(self):
+        return [(self.left, self, {}), (self.right, self, {})]
 
 
-class _Column:
+class _Column(_Renderable):
     """
     Column lineage object
 
@@ -199,6 +1097,8 @@ class _Column:
     :rtype: _Column
     """
 
+    _node_data = _NodeData()
+
     def __init__(
         self,
         source,
@@ -212,7 +1112,7 @@ class _Column:
     ) -> None:
         self.source = source
         self.name = name
-        self.data_type = data_type
+        self.data_type = _shared(data_type)
         self.var_type = var_type
         self.on_null = on_null
         self.is_primary_key = is_primary_key
@@ -224,52 +1124,43 @@ class _Column:
         else:
             self.unit = source.unit
 
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
-
-        if self.data_type:
-            if isinstance(self.data_type, str):
-                data_type = self.data_type
-            else:
-                data_type = self.data_type.name
-        else:
-            data_type = ""
+        self.macro_group = macro_group
 
-        if self.var_type:
-            var_type = self.var_type
-        else:
-            var_type = ""
+    def _build_node_data(self):
+        node_type, base = _type_label(self)
 
-        self._node_data = {
+        return {
             "label": self.name,
             "name": self.name,
-            "data_type": data_type,
-            "var_type": var_type,
-            "type": str(type(self)),
-            "base": str(type(self).__bases__[0]),
+            "data_type": _type_name(self.data_type),
+            "var_type": self.var_type or "",
+            "type": node_type,
+            "base": base,
             "unit": self.unit.name,
-            "macro_group": macro_group,
-            "sql": self.sql,
+            "macro_group": self.macro_group,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self.source._node_data)
-        graph = LineageGraph(graph)
+    def _lineage_edges(self):
+        return [(self.source, self, {})]
 
-        graph.add_child(0, self._node_data, {})
 
-        self.graph = graph
+def _claim_members(container, members, owner, claimed: dict = None):
+    result = container
 
-    def root_graph(self):
-        graph = self.graph
+    for member in members:
+        item = _claim(member, owner, claimed)
 
-        graph.union([self.source.root_graph()])
+        if item is not member:
+            if result is container:
+                result = copy.copy(container)
 
-        return graph
+            setattr(result, member.name, item)
 
+    return result
 
-class ColumnList:
+
+class ColumnList(_Node):
     """
     Stores columns and column order.
     This object is necessary for the following reasons:
@@ -305,78 +1196,159 @@ class ColumnList:
                 rf"Duplicate column names detected: {dict(collections.Counter([column.name for column in columns]).items())}"
             )
 
+        # Columns are shared with the caller until a table claims them, see _claim_
         for column in columns:
-            setattr(self, column.name, copy.deepcopy(column))
+            setattr(self, column.name, column)
 
         self.order = [column.name for column in columns]
 
+    # Name lookups and filter results, cleared whenever the list, or a column read by a unit filter,
+    # is changed
+    _caches = _Node._caches + ("_lookups",)
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+
+        if key not in _NODE_STATE:
+            try:
+                object.__delattr__(self, "_lookups")
+            except AttributeError:
+                pass
+
+    def __delattr__(self, key):
+        object.__delattr__(self, key)
+
+        if key not in _NODE_STATE:
+            if getattr(self, "_tracked", False):
+                self._invalidate()
+            else:
+                try:
+                    object.__delattr__(self, "_lookups")
+                except AttributeError:
+                    pass
+
+    def __copy__(self):
+        copied = type(self).__new__(type(self))
+        copied.__dict__.update(self.__getstate__())
+        copied.__dict__["order"] = list(self.order)
+
+        return copied
+
     def __getitem__(self, item):
         if isinstance(item, list):
             return [getattr(self, value) for value in item]
         else:
             return getattr(self, item)
 
+    def __contains__(self, name):
+        return name in self._index()
+
     def __add__(self, other):
         if isinstance(other, ColumnList):
             return ColumnList(self.list_columns_() + other.list_columns_())
 
-    def list_columns_(
-        self, filter_regex: str = None, filter_unit: units.core.Unit = None
-    ):
-        if not self.is_empty:
-            if filter_regex:
-                columns = [
-                    getattr(self, item)
-                    for item in self.order
-                    if re.match(filter_regex, item)
-                ]
-            else:
-                columns = [getattr(self, item) for item in self.order]
-
-            if filter_unit:
-                columns = [
-                    getattr(self, item.name)
-                    for item in columns
-                    if filter_unit == getattr(self, item.name).unit
-                ]
+    def _get_lookups(self):
+        try:
+            return self._lookups
+        except AttributeError:
+            pass
 
+        if self.is_empty:
+            index = {}
         else:
-            columns = []
+            index = {name: getattr(self, name) for name in self.order}
 
-        return columns
+        object.__setattr__(self, "_lookups", {None: index})
 
-    def list_names_(
+        return self._lookups
+
+    def _index(self):
+        """
+        Ordered name -> column index
+        """
+
+        return self._get_lookups()[None]
+
+    def _filter_names(self, filter_regex: str = None, filter_unit=None):
+        lookups = self._get_lookups()
+        index = lookups[None]
+
+        if not (filter_regex or filter_unit):
+            return index
+
+        # Results are matched on the unit object itself, never on its id, which can be reused
+        results = lookups.setdefault(("filter", filter_regex), [])
+
+        for unit, names in results:
+            if unit is filter_unit:
+                return names
+
+        names = list(index)
+
+        if filter_regex:
+            pattern = re.compile(filter_regex)
+            names = [name for name in names if pattern.match(name)]
+
+        if filter_unit:
+            names = [name for name in names if filter_unit == index[name].unit]
+
+            # Unit filter results read the columns, so changes to the columns invalidate the list.
+            # Only registered here, as tracking every column when it is added costs a dependents
+            # entry for each node of its lineage.
+            for column in index.values():
+                _add_dependent(column, self)
+                _track(column)
+
+        results.append((filter_unit, names))
+
+        return names
+
+    def list_columns_(
         self, filter_regex: str = None, filter_unit: units.core.Unit = None
     ):
-        if not self.is_empty:
-            if filter_regex:
-                columns = [item for item in self.order if re.match(filter_regex, item)]
-            else:
-                columns = self.order
-
-            if filter_unit:
-                columns = [
-                    item for item in columns if filter_unit == getattr(self, item).unit
-                ]
+        index = self._index()
 
-            return columns
+        return [index[name] for name in self._filter_names(filter_regex, filter_unit)]
 
-        else:
-            return []
+    def list_names_(
+        self, filter_regex: str = None, filter_unit: units.core.Unit = None
+    ):
+        return list(self._filter_names(filter_regex, filter_unit))
 
     def add_(self, column, override: bool = False):
         if not isinstance(column, _Column):
             raise ValueError("_Column must be _Column object")
 
-        if column.name in self.list_names_() and not override:
+        index = self._index()
+
+        if column.name in index and not override:
             raise ValueError(rf"_Column '{column.name}' exists in ColumnList")
 
         setattr(self, column.name, column)
         self.is_empty = False
-        self.order = self.order + [column.name]
 
+        if column.name not in index:
+            self.order.append(column.name)
+
+        # Carry the index over rather than rebuilding it on the next lookup
+        index[column.name] = column
+        object.__setattr__(self, "_lookups", {None: index})
+
+    def _claim_(self, owner, claimed: dict = None):
+        """
+        Claim every column for owner, see _claim. Unless owner has already claimed every column, a
+        copy of this list holding the claimed columns is returned rather than changing this one.
 
-class OrderBy:
+        :param owner: Table writing its context into the columns
+        :type owner: _Table
+        :param claimed: Copies already made for owner, by id of the copied column. Default: ``None``
+        :type claimed: dict
+        """
+
+        return _claim_members(self, self.list_columns_(), owner, claimed)
+
+
+class OrderBy(_Renderable):
     """
     Columns and direction to order a table or partition
 
@@ -390,12 +1362,9 @@ class OrderBy:
 
         self.columns = columns
         self.how = how
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
 
-class PartitionBy(ColumnList):
+class PartitionBy(ColumnList, _Renderable):
     """
     PartitionBy is a specific subclass of ColumnList for the purpose of creating partitions.
     It has been made distinct for the following reasons:
@@ -407,78 +1376,74 @@ class PartitionBy(ColumnList):
 
     def __init__(self, columns: ColumnList):
         super().__init__(columns=columns.list_columns_())
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
 
-class _Value:
+@functools.lru_cache(maxsize=None)
+def _no_unit():
+    return units.core.Unit()
+
+
+@functools.lru_cache(maxsize=None)
+def _no_partition():
+    return PartitionBy(ColumnList([]))
+
+
+@functools.lru_cache(maxsize=None)
+def _no_order():
+    return OrderBy(columns=ColumnList([]), how=[])
+
+
+class _Value(_Renderable):
     """
     Value lineage object
 
     :param value: Value
     :param data_type: lineage.values.Datatype - Data type of value
     :param var_type: str - "categorical"/"numeric"/"key"
-    :param unit: lineage.units.core.Unit = lineage.units.core.Unit() - Unit of value
+    :param unit: lineage.units.core.Unit = None - Unit of value, dimensionless when None
     :param macro_group: Used to group multiple pre-fabricated lineage objects into the same custom node collection - Default: ``""``
     :type macro_group: str
     """
 
+    _node_data = _NodeData()
+
     def __init__(
         self,
         value,
         data_type,
         var_type: str = None,
-        unit: units.core.Unit = units.core.Unit(),
+        unit: units.core.Unit = None,
         macro_group: str = "",
     ) -> None:
         self.value = value
         self.name = value
-        self.data_type = data_type
+        self.data_type = _shared(data_type)
         self.var_type = var_type
-        self.unit = unit
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
-
-        if self.data_type:
-            if isinstance(self.data_type, str):
-                data_type = self.data_type
-            else:
-                data_type = self.data_type.name
-        else:
-            data_type = ""
+        self.unit = _no_unit() if unit is None else unit
+        self.macro_group = macro_group
 
-        if self.var_type:
-            var_type = self.var_type
-        else:
-            var_type = ""
+    def _build_node_data(self):
+        node_type, base = _type_label(self)
+        data_type = _type_name(self.data_type)
 
         if len(str(self.name)) > 25:
             label = str(data_type)
         else:
             label = str(self.name)
 
-        self._node_data = {
+        return {
             "label": label,
             "data_type": data_type,
-            "var_type": var_type,
-            "type": str(type(self)),
-            "base": str(type(self).__bases__[0]),
+            "var_type": self.var_type or "",
+            "type": node_type,
+            "base": base,
             "unit": self.unit.name,
-            "macro_group": macro_group,
-            "sql": self.sql,
+            "macro_group": self.macro_group,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        self.graph = LineageGraph(rx_graph=graph)
-
-    def root_graph(self):
-        return self.graph
-
 
-class _Function:
+class _Function(_Renderable):
     """
     Function lineage object
 
@@ -486,134 +1451,111 @@ class _Function:
     :param args: List[Any] - Function arguments in order
     :param data_type: lineage.values.Datatype - Data type of output
     :param var_type: str - "categorical"/"numeric"/"key"
-    :param partition_by: lineage.core.PartitionBy = lineage.core.PartitionBy(ColumnList([]))
-    :param order_by: lineage.core.OrderBy = lineage.core.OrderBy(columns=ColumnList([]), how=[])
-    :param unit: lineage.units.core.Unit = lineage.units.core.Unit() - Unit of output
+    :param partition_by: lineage.core.PartitionBy = None - No partitioning when None
+    :param order_by: lineage.core.OrderBy = None - No ordering when None
+    :param unit: lineage.units.core.Unit = None - Unit of output, dimensionless when None
     :param macro_group: Used to group multiple pre-fabricated lineage objects into the same custom node collection - default value [""]
     :type macro_group: str
     """
 
+    _node_data = _NodeData()
+
     def __init__(
         self,
         name: str,
         args: List[Any],
         data_type=None,
         var_type: str = None,
-        partition_by: PartitionBy = PartitionBy(ColumnList([])),
-        order_by: OrderBy = OrderBy(columns=ColumnList([]), how=[]),
-        unit: units.core.Unit = units.core.Unit(),
+        partition_by: PartitionBy = None,
+        order_by: OrderBy = None,
+        unit: units.core.Unit = None,
         distinct: bool = False,
         macro_group: str = "",
         framing: _Expression = None,
     ) -> None:
         self.name = name
         self.args = args
-        self.data_type = data_type
+        self.data_type = _shared(data_type)
         self.var_type = var_type
+
+        # Functions without a window share the same empty partition and ordering
+        if partition_by is None:
+            partition_by = _no_partition()
+
+        if order_by is None:
+            order_by = _no_order()
+
         self.partition_by = partition_by
         self.order_by = order_by
         self.is_primary_key = False
         self.is_event_time = False
-        self.unit = unit
+        self.unit = _no_unit() if unit is None else unit
         self.distinct = distinct
         self.framing = framing
+        self.macro_group = macro_group
 
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
-
-        if self.data_type:
-            if isinstance(self.data_type, str):
-                data_type = self.data_type
-            else:
-                data_type = self.data_type.name
-        else:
-            data_type = ""
-
-        if self.var_type:
-            var_type = self.var_type
-        else:
-            var_type = ""
+    def _build_node_data(self):
+        node_type, base = _type_label(self)
 
-        self._node_data = {
+        return {
             "label": self.name,
-            "data_type": data_type,
-            "var_type": var_type,
-            "type": str(type(self)),
-            "base": str(type(self).__bases__[0]),
+            "data_type": _type_name(self.data_type),
+            "var_type": self.var_type or "",
+            "type": node_type,
+            "base": base,
             "unit": self.unit.name,
-            "macro_group": macro_group,
-            "sql": self.sql,
+            "macro_group": self.macro_group,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        self.graph = LineageGraph(rx_graph=graph)
+    def _lineage_edges(self):
+        return [
+            (arg, self, {"type": "arg"})
+            for arg in self.args
+            if "_node_data" in dir(arg)
+        ]
 
-        for arg in [arg for arg in self.args if "_node_data" in dir(arg)]:
-            self.graph.add_parent(0, arg._node_data, edge_data={"type": "arg"})
 
-    def root_graph(self):
-        graph = self.graph
-
-        graph.union([arg.root_graph() for arg in self.args])
-
-        return graph
-
-
-class Condition:
+class Condition(_Renderable):
     def __init__(
         self, checks: List[Any], link_operators=None, macro_group: str = ""
     ) -> None:
         if not link_operators:
             link_operators = []
         self.checks = checks
-        self.link_operators = link_operators
+        self.link_operators = [_shared(operator) for operator in link_operators]
 
         if len(link_operators) != len(checks) - 1:
             raise ValueError(
                 rf"len(link_operators)!=len(checks)-1 : {len(link_operators)}!={len(checks)-1}"
             )
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
         self._node_data = {
-            "label": rf"Condition ID: {id(self)}",
+            "label": "Condition",
             "type": str(type(self)),
             "base": str(type(self).__bases__[0]),
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
         }
 
-        self.graph = LineageGraph(rx.PyDiGraph())
-
+    def _lineage_edges(self):
         if self.link_operators:
-            check_graphs = []
+            edges = []
 
             for i in range(len(self.link_operators)):
-                check_graph = LineageGraph(rx.PyDiGraph())
-                check_graph.add_node(self.checks[i]._node_data)
-                check_graph.add_child(0, self.link_operators[i]._node_data)
-                check_graph.add_parent(1, self.checks[i + 1]._node_data)
-                check_graph.add_child(1, self._node_data)
-                check_graphs.append(check_graph)
+                edges += [
+                    (self.checks[i], self.link_operators[i], {}),
+                    (self.checks[i + 1], self.link_operators[i], {}),
+                    (self.link_operators[i], self, {}),
+                ]
 
-            self.graph = self.graph.union(check_graphs)
+            return edges
 
         else:
-            self.graph.add_node(checks[0]._node_data)
-            self.graph.add_child(0, self._node_data)
-
-    def root_graph(self):
-        graph = self.graph
-
-        graph.union([LineageGraph(check.root_graph()) for check in self.checks])
-
-        return graph
+            return [(self.checks[0], self, {})]
 
 
-class CaseWhen:
+class CaseWhen(_Renderable):
     def __init__(
         self,
         conditions: List[Condition],
@@ -639,9 +1581,6 @@ class CaseWhen:
             self.on_null = "WARN"
         else:
             self.on_null = "PASS"
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
         if self.unit.name:
             unit = self.unit.name
@@ -649,39 +1588,42 @@ class CaseWhen:
             unit = ""
 
         self._node_data = {
-            "label": rf"CaseWhen ID: {id(self)}",
+            "label": "CaseWhen",
             "type": str(type(self)),
             "base": str(type(self).__bases__[0]),
             "unit": unit,
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        self.graph = LineageGraph(rx_graph=graph)
+    def _lineage_edges(self):
+        return [
+            (item, self, {})
+            for item in self.conditions + self.values + [self.else_value]
+            if "_node_data" in dir(item)
+        ]
 
 
-class _Blank:
+class _Blank(_Renderable):
     def __init__(
         self,
         name,
         data_type,
         var_type: str = None,
         macro_group: str = None,
-        unit: units.core.Unit = units.core.Unit(),
+        unit: units.core.Unit = None,
         on_null: str = "PASS",
         is_primary_key: bool = False,
         is_event_time: bool = False,
     ):
         self.name = name
-        self.data_type = data_type
+        self.data_type = _shared(data_type)
         self.var_type = var_type
         self.macro_group = macro_group
-        self.unit = unit
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
+        self.unit = _no_unit() if unit is None else unit
+        self.on_null = on_null
+        self.is_primary_key = is_primary_key
+        self.is_event_time = is_event_time
 
         if self.data_type:
             if isinstance(self.data_type, str):
@@ -709,31 +1651,106 @@ class _Blank:
             "base": str(type(self).__bases__[0]),
             "unit": self.unit.name,
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
         }
 
 
-class Record:
+class Record(_Renderable):
     def __init__(self, values: dict, macro_group: str = ""):
         self.values = list(values.values())
         self.columns = ColumnList(values.keys())
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
         self._node_data = {
             "type": str(type(self)),
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        self.graph = LineageGraph(rx_graph=graph)
 
+# Values that can be loaded in bulk, as opposed to expressions that must be rendered to SQL
+_BULK_VALUES = (
+    "Integer",
+    "Double",
+    "Float",
+    "Decimal",
+    "Varchar",
+    "Timestamp",
+    "Date",
+    "Boolean",
+)
+
+
+def _record_values(record):
+    # Imported here, as lineage.values imports this module
+    from . import values as lineage_values
+
+    bulk_values = tuple(getattr(lineage_values, name) for name in _BULK_VALUES)
+    values = []
+
+    for value in record.values:
+        if isinstance(value, lineage_values.Null):
+            values.append(None)
+        elif isinstance(value, bulk_values):
+            values.append(value.value)
+        else:
+            raise ValueError(
+                rf"Records loaded in bulk must only contain literal values, got {type(value)}"
+            )
+
+    return values
+
+
+class _Records(_Renderable):
+    """
+    Records written into the SQL as a VALUES list, or with bulk=True loaded into the database
+    separately (see ``tyr.database.core.load_records``), leaving the SQL to select from the loaded
+    relation. Bulk records must only contain literal values.
+    """
+
+    @property
+    def relation(self):
+        """
+        Relation the records are loaded into when bulk. Named by the structural key of the
+        records as well as their name, so records of the same name with different content are
+        loaded separately
+        """
+
+        return rf"main.records_{self.name}_{structural_key(self)}"
 
-class RecordList:
-    def __init__(self, name: str, records: List[Record], macro_group: str = ""):
+    def batches(self, batch_size: int = 100_000):
+        """
+        Values of the records, streamed in batches for bulk loading
+
+        :param batch_size: Number of records per batch
+        :type batch_size: int
+        :return: Iterator of pandas.DataFrame with one column per record column
+        """
+
+        import pandas as pd
+
+        records = iter(self.iter_records())
+        names = self.columns.list_names_()
+
+        while True:
+            batch = [
+                _record_values(record)
+                for record in itertools.islice(records, batch_size)
+            ]
+
+            if not batch:
+                return
+
+            yield pd.DataFrame(batch, columns=names)
+
+
+class RecordList(_Records):
+    def __init__(
+        self,
+        name: str,
+        records: List[Record],
+        macro_group: str = "",
+        bulk: bool = False,
+    ):
         if any([not isinstance(record, Record) for record in records]):
             raise ValueError("All records must be Record objects")
 
@@ -748,22 +1765,19 @@ class RecordList:
         self.name = name
         self.records = records
         self.columns = self.records[0].columns
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
+        self.bulk = bulk
 
         self._node_data = {
             "type": str(type(self)),
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        self.graph = LineageGraph(rx_graph=graph)
+    def iter_records(self):
+        return self.records
 
 
-class RecordGenerator:
+class RecordGenerator(_Records):
     def __init__(
         self,
         name: str,
@@ -771,38 +1785,87 @@ class RecordGenerator:
         n_records: int,
         generator_args: dict = {},
         macro_group: str = "",
+        bulk: bool = False,
     ):
-        if not isinstance(generator([1], generator_args).__next__(), Record):
+        record = generator([1], generator_args).__next__()
+
+        if not isinstance(record, Record):
             raise ValueError("generator must return Record object")
 
         self.name = name
-        self.generator = generator([x for x in range(n_records)], generator_args)
-        self.columns = generator([1], generator_args).__next__().columns
+        self.generator_function = generator
+        self.generator_args = generator_args
+        self.n_records = n_records
+        self.bulk = bulk
+        self.columns = record.columns
 
         for column in self.columns.list_columns_():
             setattr(column, "source_table", None)
             setattr(column, "current_table", None)
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
         self._node_data = {
             "type": str(type(self)),
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        self.graph = LineageGraph(rx_graph=graph)
+    @property
+    def generator(self):
+        # A fresh generator per access so the records can be rendered again after invalidation
+        return self.generator_function(range(self.n_records), self.generator_args)
+
+    def iter_records(self):
+        return self.generator
+
+
+class Series(_Renderable):
+    """
+    Series of n_records evenly spaced values, start, start + step, start + 2 * step, ...
+    generated by the database. A single lineage object however long the series, in place of a
+    RecordList with one Record per value.
+
+    :param name: Name of series, used as its alias in the selecting table
+    :type name: str
+    :param start: First value of series
+    :type start: _Value|_Function
+    :param step: Difference between consecutive values, e.g. an Interval for timestamps
+    :type step: _Value|_Function
+    :param n_records: Number of values in series
+    :type n_records: int
+    :param column: Column the values are read into
+    :type column: tyr.lineage.columns.Record
+    :param macro_group: Used to group multiple pre-fabricated lineage objects into the same custom node collection - Default: ``""``
+    :type macro_group: str
+    """
+
+    def __init__(
+        self,
+        name: str,
+        start,
+        step,
+        n_records: int,
+        column,
+        macro_group: str = "",
+    ):
+        self.name = name
+        self.start = start
+        self.step = step
+        self.n_records = n_records
+        self.columns = ColumnList([column])
+
+        self._node_data = {
+            "type": str(type(self)),
+            "macro_group": macro_group,
+            "sql": _LazySQL(self),
+        }
 
 
-class _Table:
+class _Table(_Renderable):
     def __init__(
         self,
         name,
         columns: ColumnList,
         source=None,
-        primary_key: ColumnList = ColumnList([]),
+        primary_key: ColumnList = None,
         event_time=None,
         distinct: bool = False,
         group_by: bool = False,
@@ -813,11 +1876,21 @@ class _Table:
         schema=None,
         macro_group: str = "",
     ) -> None:
+        if primary_key is None:
+            primary_key = ColumnList([])
+
         self.name = name
         self.source = source
-        self.columns = columns
-        self.primary_key = primary_key
-        self.event_time = event_time
+        claimed = {}
+
+        self.columns = columns._claim_(self, claimed)
+        self.primary_key = primary_key._claim_(self, claimed)
+
+        if event_time:
+            self.event_time = _claim(event_time, self, claimed)
+        else:
+            self.event_time = event_time
+
         self.schema = schema
 
         if self.event_time:
@@ -847,25 +1920,15 @@ class _Table:
 
         for column in self.columns.list_columns_():
             setattr(column, "current_table", self)
-            setattr(column, "sql", _interpreters["beeswax_duckdb"].to_sql(column))
 
         for column in self.primary_key.list_columns_():
             setattr(column, "current_table", self)
-            setattr(column, "sql", _interpreters["beeswax_duckdb"].to_sql(column))
 
         for column in self.static_primary_key.list_columns_():
             setattr(column, "current_table", self)
-            setattr(column, "sql", _interpreters["beeswax_duckdb"].to_sql(column))
 
         if self.event_time:
             setattr(self.event_time, "current_table", self)
-            setattr(
-                event_time, "sql", _interpreters["beeswax_duckdb"].to_sql(event_time)
-            )
-
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
         if self.schema:
             label = rf"{self.schema.settings.name}.{self.name}"
@@ -883,30 +1946,45 @@ class _Table:
             "type": str(type(self)),
             "base": str(type(self).__bases__[0]),
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        graph = LineageGraph(graph)
-
+    def _lineage_edges(self):
         if isinstance(self.source, TableList):
-            for table in self.source.list_tables_():
-                graph.add_parent(0, table._node_data, {})
+            edges = [(table, self, {}) for table in self.source.list_tables_()]
         else:
-            graph.add_parent(0, source._node_data, {})
+            edges = [(self.source, self, {})]
 
         for column in self.columns.list_columns_():
-            graph.add_child(
-                0,
-                column._node_data,
-                {
-                    "is_primary_key": column.is_primary_key,
-                    "is_event_time": column.is_event_time,
-                },
+            edges.append(
+                (
+                    self,
+                    column,
+                    {
+                        "is_primary_key": column.is_primary_key,
+                        "is_event_time": column.is_event_time,
+                    },
+                )
             )
 
-        self.graph = graph
+        return edges
+
+    def __copy__(self):
+        # The copy owns copies of the columns, so that their current_table is the copy
+        copied = super().__copy__()
+        claimed = {}
+
+        copied.columns = self.columns._claim_(copied, claimed)
+        copied.primary_key = self.primary_key._claim_(copied, claimed)
+        copied.static_primary_key = self.static_primary_key._claim_(copied, claimed)
+
+        if self.event_time:
+            copied.event_time = _claim(self.event_time, copied, claimed)
+
+        for column in claimed.values():
+            setattr(column, "current_table", copied)
+
+        return copied
 
     def update_graph(self):
         if self.schema:
@@ -916,39 +1994,16 @@ class _Table:
             self._node_data["label"] = self.name
             self._node_data["schema"] = ""
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        graph.add_parent(0, self.source._node_data, {})
-
-        for column in self.columns.list_columns_():
-            graph.add_child(
-                0,
-                column._node_data,
-                {
-                    "is_primary_key": column.is_primary_key,
-                    "is_event_time": column.is_event_time,
-                },
-            )
-
-        self.graph = LineageGraph(rx_graph=graph)
-
     def add_column(self, column):
+        column = _claim(column, self)
         setattr(column, "current_table", self)
-        self.columns.add(column)
-        setattr(column, "sql", _interpreters["beeswax_duckdb"].to_sql(column))
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
+        self.columns.add_(column)
 
         self.update_graph()
 
     def add_columns(self, columns):
         for column in columns.list_columns_():
             self.add_column(column)
-            setattr(column, "sql", _interpreters["beeswax_duckdb"].to_sql(column))
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
         self.update_graph()
 
@@ -956,11 +2011,10 @@ class _Table:
         for column in self.columns.list_columns_():
             setattr(column, "is_primary_key", False)
 
-        self.primary_key = primary_key
+        self.primary_key = primary_key._claim_(self)
 
         for column in self.primary_key.list_columns_():
             setattr(column, "current_table", self)
-            setattr(column, "sql", _interpreters["beeswax_duckdb"].to_sql(column))
 
         if self.event_time:
             self.static_primary_key = ColumnList(
@@ -970,9 +2024,6 @@ class _Table:
                     if column.name != self.event_time.name
                 ]
             )
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
         self.update_graph()
 
@@ -980,9 +2031,8 @@ class _Table:
         for column in self.columns.list_columns_():
             setattr(column, "is_event_time", False)
 
-        self.event_time = event_time
+        self.event_time = _claim(event_time, self)
         setattr(self.event_time, "current_table", self)
-        setattr(event_time, "sql", _interpreters["beeswax_duckdb"].to_sql(event_time))
 
         if self.primary_key:
             self.static_primary_key = ColumnList(
@@ -995,26 +2045,11 @@ class _Table:
 
         else:
             self.primary_key = self.event_time
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
         self.update_graph()
 
-    def root_graph(self):
-        graph = self.graph
-
-        graph.union([column.root_graph() for column in self.columns.list_columns_()])
-
-        if type(self.source) is ColumnList:
-            graph.union([table.root_graph() for table in self.source.list_tables_()])
-        else:
-            graph.union([self.source.root_graph()])
 
-        return graph
-
-
-class TableList:
+class TableList(_Node):
     def __init__(self, tables: List[Any]) -> None:
         if any([not isinstance(table, _Table) for table in tables]):
             raise ValueError("All tables must be _Table object")
@@ -1031,8 +2066,9 @@ class TableList:
                 rf"Duplicate table names detected: {dict(collections.Counter([table.name for table in tables]).items())}"
             )
 
+        # Tables are shared with the caller until a schema claims them, see _claim_
         for table in tables:
-            setattr(self, table.name, copy.deepcopy(table))
+            setattr(self, table.name, table)
 
         if tables != []:
             self.is_empty = False
@@ -1074,34 +2110,37 @@ class TableList:
         setattr(self, table.name, table)
         setattr(self, "is_empty", False)
 
+    def _claim_(self, owner):
+        """
+        Claim every table for owner, see _claim. Unless owner has already claimed every table, a
+        copy of this list holding the claimed tables is returned rather than changing this one.
+
+        :param owner: Schema writing its context into the tables
+        :type owner: _Schema
+        """
+
+        return _claim_members(self, self.list_tables_(), owner)
 
-class _Transformation:
+
+class _Transformation(_Renderable):
     def __init__(self, name, source, args, macro_group: str = ""):
         self.name = name
         self.source = source
         self.args = args
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
 
         self._node_data = {
             "label": self.name,
             "type": str(type(self)),
             "base": str(type(self).__bases__[0]),
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-
-        graph.add_child(0, self.source._node_data, {})
-
-        self.graph = LineageGraph(rx_graph=graph)
+    def _lineage_edges(self):
+        return [(self, self.source, {})]
 
 
-class AppendOperator:
-
+class AppendOperator(_Renderable):
     """
     **AppendOperator** behaves similarly to an **Expression** object with only the right side.
 
@@ -1113,21 +2152,15 @@ class AppendOperator:
 
     def __init__(self, source, operator, macro_group: str = ""):
         self.source = source
-        self.operator = operator
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
+        self.operator = _shared(operator)
 
         self._node_data = {
-            "label": rf"AppendOperator - {id(self)}",
+            "label": "AppendOperator",
             "type": str(type(self)),
             "base": str(type(self).__bases__[0]),
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
         }
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-
-        graph.add_child(0, self.source._node_data, {})
 
-        self.graph = LineageGraph(rx_graph=graph)
+    def _lineage_edges(self):
+        return [(self, self.source, {})]
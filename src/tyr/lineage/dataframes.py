@@ -30,7 +30,7 @@ class LambdaFunction(lineage._Function):
         args: typing.Dict[str, any],
         data_type,
         var_type=None,
-        unit=units.core.Unit(),
+        unit=None,
         macro_group: str = "",
     ):
         super().__init__(
@@ -18,9 +18,9 @@ class Average(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -30,8 +30,8 @@ class Average(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
@@ -121,9 +121,9 @@ class Minimum(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -133,8 +133,8 @@ class Minimum(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
@@ -159,9 +159,9 @@ class First(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -170,8 +170,8 @@ class First(lineage._Function):
     def __init__(
         self,
         source,
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(columns=lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         macro_group: str = "",
         framing: Between = None,
     ):
@@ -197,9 +197,9 @@ class Last(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -208,8 +208,8 @@ class Last(lineage._Function):
     def __init__(
         self,
         source,
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(columns=lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         macro_group: str = "",
         framing: Between = None,
     ):
@@ -235,9 +235,9 @@ class Maximum(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -246,8 +246,8 @@ class Maximum(lineage._Function):
     def __init__(
         self,
         source,
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(columns=lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         macro_group: str = "",
         framing: Between = None,
     ):
@@ -273,9 +273,9 @@ class Array(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -285,8 +285,8 @@ class Array(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
@@ -311,9 +311,9 @@ class StandardDeviation(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -323,8 +323,8 @@ class StandardDeviation(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         self.var_type = source.var_type
@@ -349,9 +349,9 @@ class PopulationStandardDeviation(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -361,8 +361,8 @@ class PopulationStandardDeviation(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         self.var_type = source.var_type
@@ -387,9 +387,9 @@ class SampleStandardDeviation(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -399,8 +399,8 @@ class SampleStandardDeviation(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         self.var_type = source.var_type
@@ -425,9 +425,9 @@ class PopulationVariance(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -437,8 +437,8 @@ class PopulationVariance(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         self.var_type = source.var_type
@@ -463,9 +463,9 @@ class SampleVariance(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -475,8 +475,8 @@ class SampleVariance(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
@@ -501,9 +501,9 @@ class Sum(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -513,8 +513,8 @@ class Sum(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
@@ -541,9 +541,9 @@ class Count(lineage._Function):
     :type distinct: bool
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -553,8 +553,8 @@ class Count(lineage._Function):
         self,
         source,
         distinct=False,
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(columns=lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         macro_group: str = "",
         framing: Between = None,
     ):
@@ -580,9 +580,9 @@ class Correlation(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -593,8 +593,8 @@ class Correlation(lineage._Function):
         y,
         x,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
@@ -618,9 +618,9 @@ class PopulationCovariance(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -631,8 +631,8 @@ class PopulationCovariance(lineage._Function):
         y,
         x,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
@@ -656,9 +656,9 @@ class SampleCovariance(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -669,8 +669,8 @@ class SampleCovariance(lineage._Function):
         y,
         x,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
@@ -694,9 +694,9 @@ class AbsoluteMedian(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -706,8 +706,8 @@ class AbsoluteMedian(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
@@ -732,9 +732,9 @@ class Median(lineage._Function):
     :type source: Any
     :param macro_group: Default: ``""``
     :type macro_group: str
-    :param partition_by: Default: ``lineage.PartitionBy(lineage.ColumnList([]))``
+    :param partition_by: Default: ``None`` - no partitioning
     :type partition_by: lineage.PartitionBy
-    :param order_by: Default: ``lineage.OrderBy(lineage.ColumnList([]))``
+    :param order_by: Default: ``None`` - no ordering
     :type order_by: lineage.OrderBy
     :param framing: Default: ``None``
     :type framing: lineage.expressions.Between
@@ -744,8 +744,8 @@ class Median(lineage._Function):
         self,
         source,
         macro_group: str = "",
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         framing: Between = None,
     ):
         super().__init__(
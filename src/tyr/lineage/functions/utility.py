@@ -1,7 +1,6 @@
 from ...lineage import core as lineage
 from ...lineage import values as lineage_values
 from typing import List as TypingList, Any
-import pandas as pd
 
 
 class Error(lineage._Function):
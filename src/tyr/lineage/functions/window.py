@@ -7,8 +7,8 @@ class Lag(lineage._Function):
     def __init__(
         self,
         source,
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(columns=lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         macro_group: str = "",
     ):
         self.source = source
@@ -29,8 +29,8 @@ class Lead(lineage._Function):
     def __init__(
         self,
         source,
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(columns=lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         macro_group: str = "",
     ):
         self.source = source
@@ -51,8 +51,8 @@ class Rank(lineage._Function):
     def __init__(
         self,
         source,
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(columns=lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         macro_group: str = "",
     ):
         self.source = source
@@ -71,8 +71,8 @@ class Rank(lineage._Function):
 class RowNumber(lineage._Function):
     def __init__(
         self,
-        partition_by: lineage.PartitionBy = lineage.PartitionBy(lineage.ColumnList([])),
-        order_by: lineage.OrderBy = lineage.OrderBy(columns=lineage.ColumnList([])),
+        partition_by: lineage.PartitionBy = None,
+        order_by: lineage.OrderBy = None,
         macro_group: str = "",
     ):
         self.source = None
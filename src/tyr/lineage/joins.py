@@ -1,11 +1,9 @@
 from ..lineage import core as lineage
 from ..lineage import columns as lineage_columns
 from typing import List
-import rustworkx as rx
-import sqlparse
 
 
-class Join:
+class Join(lineage._Renderable):
 
     """
     Join object
@@ -28,7 +26,7 @@ class Join:
     ) -> None:
         self.join_expression = join_expression
         self.condition = condition
-        self.name = rf"JOIN EXPRESSION - {id(self)}"
+        self.name = "JOIN EXPRESSION"
         self.primary_key = lineage.ColumnList([])
         self.event_time = None
 
@@ -54,43 +52,21 @@ class Join:
         right_ctes = self.join_expression.right.ctes.list_tables_()
 
         self.ctes = lineage.TableList(left_ctes + right_ctes)
-        self.sql = sqlparse.format(
-            lineage._interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
         self._node_data = {
             "type": str(type(self)),
             "base": str(type(self)),
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": lineage._LazySQL(self),
         }
 
-        left = rx.PyDiGraph()
-        right = rx.PyDiGraph()
-
-        left.add_node(self.join_expression.left._node_data)
-        right.add_node(self.join_expression.right._node_data)
-
-        left.add_child(0, self._node_data, {})
-        right.add_child(0, self._node_data, {})
-
-        left = rx.union(
-            left,
-            self.join_expression.left.graph.rx_graph,
-            merge_nodes=True,
-            merge_edges=True,
-        )
-        right = rx.union(
-            right,
-            self.join_expression.right.graph.rx_graph,
-            merge_nodes=True,
-            merge_edges=True,
-        )
-
-        graph = rx.union(left, right, merge_nodes=True, merge_edges=True)
-        self.graph = lineage.LineageGraph(rx_graph=graph)
+    def _lineage_edges(self):
+        return [
+            (self.join_expression.left, self, {}),
+            (self.join_expression.right, self, {}),
+        ]
 
 
-class CompoundJoin:
+class CompoundJoin(lineage._Renderable):
 
     """
     CompounJoin object which chains multiple joins together
@@ -102,7 +78,7 @@ class CompoundJoin:
     """
 
     def __init__(self, joins: List[Join], macro_group: str = ""):
-        self.name = rf"COMPOUND JOIN - {id(self)}"
+        self.name = "COMPOUND JOIN"
         self.joins = joins
 
         self.columns = lineage.ColumnList([])
@@ -111,36 +87,26 @@ class CompoundJoin:
         self.event_time = None
 
         for join in joins:
-            if not any(
+            if self.columns.is_empty or not any(
                 [
-                    column.current_table.name == column_name
-                    for column_name in self.columns.list_names_()
+                    column.current_table.name in self.columns
                     for column in join.columns.list_columns_()
                 ]
             ):
                 for column in join.columns.list_columns_():
-                    if column.name not in self.columns.list_names_():
+                    if column.name not in self.columns:
                         self.columns.add_(column)
 
         for join in joins:
             for cte in join.ctes.list_tables_():
                 if cte.name not in self.ctes.list_names_():
                     self.ctes.add_(cte)
-        self.sql = sqlparse.format(
-            lineage._interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
         self._node_data = {
             "type": str(type(self)),
             "base": str(type(self)),
             "macro_group": macro_group,
-            "sql": self.sql,
+            "sql": lineage._LazySQL(self),
         }
 
-        graph = rx.PyDiGraph()
-
-        for join in self.joins:
-            graph = rx.union(
-                graph, join.graph.rx_graph, merge_nodes=True, merge_edges=True
-            )
-
-        self.graph = lineage.LineageGraph(rx_graph=graph)
+    def _lineage_edges(self):
+        return [(join, self, {}) for join in self.joins]
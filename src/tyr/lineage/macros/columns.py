@@ -94,18 +94,21 @@ def select_all(
             for column in table.columns.list_columns_(
                 filter_regex=filter_regex, filter_unit=filter_unit
             )
-            if column.name not in table.primary_key.list_names_()
+            if column.name not in table.primary_key
         ]
     )
 
     return pk_columns + select_columns
 
 
-def staging_column_transform(source_column: lineage_columns.WildCard, column_metadata):
+def staging_column_transform(
+    source_column: lineage_columns.WildCard, column_metadata, macro_group: str = None
+):
     if "lineage.schema.source.ColumnMetadata" not in str(type(column_metadata)):
         raise ValueError("column_metadata must be ColumnMetadata object")
 
-    macro_group = rf"StagingColumnTransform - {id(source_column)}"
+    if macro_group is None:
+        macro_group = rf"StagingColumnTransform - {id(source_column)}"
 
     column = lineage_functions.data_type.TryCast(
         source=lineage_functions.utility.SourceWildToStagingColumn(
@@ -32,8 +32,11 @@ def point_from_distance_bearing(
     origin,
     bearing: lineage_values.Float,
     distance: lineage_values.Float,
-    radius: lineage_values.Float = lineage_values.Float(EARTH_RADIUS),
+    radius: lineage_values.Float = None,
 ):
+    if radius is None:
+        radius = lineage_values.Float(EARTH_RADIUS)
+
     if origin.data_type.value == "FLOAT[]":
         origin = origin
 
@@ -23,9 +23,12 @@ def event_time_interval_transform(
     max_event_time_diff: lineage_values.Interval = None,
     max_n_intervals: int = 2047,
     interpolation_function=interpolate.linear,
-    columns_to_interpolate: lineage.ColumnList = lineage.ColumnList([]),
+    columns_to_interpolate: lineage.ColumnList = None,
     start_time: lineage_values.Timestamp = None,
 ):
+    if columns_to_interpolate is None:
+        columns_to_interpolate = lineage.ColumnList([])
+
     macro_group = rf"EventTimeIntervalTransform:{name} - {id(source)} - {interval.sql}"
 
     if not (source.event_time and source.primary_key):
@@ -800,39 +803,26 @@ def date_vector_table(name: str, start_time, n_records: int, interval):
         rf"DateVector:{name} - {start_time.sql} - {str(n_records)} - {interval.sql}"
     )
 
-    return lineage_tables.Core(
-        name=name,
-        source=lineage.RecordList(
-            name="date_vector",
-            records=[
-                lineage.Record(
-                    {
-                        lineage_columns.Record(
-                            name="date",
-                            var_type="timestamp",
-                            data_type=lineage_values.Datatype(
-                                "TIMESTAMP", macro_group=macro_group
-                            ),
-                            macro_group=macro_group,
-                        ): lineage_functions.datetime.DateAdd(
-                            start_time,
-                            lineage_functions.math.Multiply(
-                                lineage_values.Integer(i, macro_group=macro_group),
-                                interval,
-                                macro_group=macro_group,
-                            ),
-                            macro_group=macro_group,
-                        )
-                    },
-                    macro_group=macro_group,
-                )
-                for i in range(n_records)
-            ],
+    source = lineage.Series(
+        name="date_vector",
+        start=start_time,
+        step=interval,
+        n_records=n_records,
+        column=lineage_columns.Record(
+            name="date",
+            var_type="timestamp",
+            data_type=lineage_values.Datatype("TIMESTAMP", macro_group=macro_group),
             macro_group=macro_group,
         ),
         macro_group=macro_group,
     )
 
+    return lineage_tables.FromRecords(
+        name=name,
+        source=source,
+        macro_group=macro_group,
+    )
+
 
 def forward_fill(source):
     macro_group = rf"ForwardFill - {id(source)}"
@@ -966,8 +956,14 @@ def forward_fill(source):
     return source_forward_filled
 
 
-def staging_table_transform(source: lineage_tables.Core, settings=None):
-    macro_group = rf"StagingTableTransform - {id(source)}"
+def staging_table_transform(
+    source: lineage_tables.Core,
+    settings=None,
+    macro_group: str = None,
+    column_macro_group: str = None,
+):
+    if macro_group is None:
+        macro_group = rf"StagingTableTransform - {id(source)}"
 
     expected_column_metadata = source.source.source.expected_column_metadata
 
@@ -986,6 +982,7 @@ def staging_table_transform(source: lineage_tables.Core, settings=None):
         event_time = staging_column_transform(
             source_column=source.columns.list_columns_()[0],
             column_metadata=event_time[0],
+            macro_group=column_macro_group,
         )
     else:
         event_time = None
@@ -1056,6 +1053,7 @@ def staging_table_transform(source: lineage_tables.Core, settings=None):
                 staging_column_transform(
                     source_column=source.columns.list_columns_()[0],
                     column_metadata=column_metadata,
+                    macro_group=column_macro_group,
                 )
                 for column_metadata in expected_column_metadata.values()
             ]
@@ -1066,6 +1064,7 @@ def staging_table_transform(source: lineage_tables.Core, settings=None):
                 staging_column_transform(
                     source_column=source.columns.list_columns_()[0],
                     column_metadata=column_metadata,
+                    macro_group=column_macro_group,
                 )
                 for column_metadata in expected_column_metadata.values()
                 if column_metadata.is_primary_key
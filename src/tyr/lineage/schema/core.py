@@ -1,11 +1,13 @@
-from ..core import TableList, _interpreters, LineageGraph
+from ..core import TableList, GraphArena, _Renderable, _LazySQL, _claim, _Table
 from ..tables import Core
 import pickle
 import os
-import pandas as pd
-import rustworkx as rx
+import io
+import json
+import mmap
+import struct
+import zlib
 from typing import Dict, List
-import sqlparse
 
 
 def load_schema_from_pkl(filepath):
@@ -13,7 +15,375 @@ def load_schema_from_pkl(filepath):
         return pickle.load(f)
 
 
-class _SchemaSettings:
+# Saved schema layout: magic, offset of the table of contents, one compressed entry per schema
+# and per table in a schema, then the table of contents as JSON. An entry is the pickled class of
+# the object followed by its pickled state, with references to other entries stored as entry
+# numbers, so that references back to an object can be resolved while its state is loaded.
+_MAGIC = b"TYRSCHEMA1\n"
+_OFFSET = struct.Struct("<Q")
+
+
+def _is_entry(item):
+    if isinstance(item, _Schema):
+        return True
+
+    if isinstance(item, _Table):
+        schema = item.__dict__.get("schema")
+
+        return (
+            isinstance(schema, _Schema)
+            and schema.tables.__dict__.get(item.name) is item
+        )
+
+    return False
+
+
+class _EntryPickler(pickle.Pickler):
+    def __init__(self, file, entry):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.entry = entry
+
+    def persistent_id(self, obj):
+        # References of an entry to itself included, as its state is loaded into it
+        if _is_entry(obj):
+            return self.entry(obj)
+
+        return None
+
+
+class _EntryUnpickler(pickle.Unpickler):
+    def __init__(self, file, store):
+        super().__init__(file)
+        self.store = store
+
+    def persistent_load(self, pid):
+        return self.store._load(pid)
+
+
+def save_schema(schema, filepath: str):
+    """
+    Save schema so that its tables can be loaded individually, see SchemaStore.
+    Cached SQL and graphs are not saved.
+
+    :param schema: Schema to save
+    :type schema: _Schema
+    :param filepath: Path of file to save to
+    :type filepath: str
+    """
+
+    numbers = {}
+    entries = []
+
+    def entry(item):
+        try:
+            return numbers[id(item)]
+        except KeyError:
+            numbers[id(item)] = len(entries)
+            entries.append(item)
+
+            return numbers[id(item)]
+
+    entry(schema)
+
+    for table in schema.tables.list_tables_():
+        entry(table)
+
+    offsets = []
+
+    with open(filepath, "wb") as f:
+        f.write(_MAGIC)
+        f.write(_OFFSET.pack(0))
+
+        # Schemas and tables referred to while pickling are appended, so this runs until all
+        # have been written
+        i = 0
+
+        while i < len(entries):
+            item = entries[i]
+            state = item.__getstate__()
+
+            if isinstance(item, _Schema):
+                # Tables are added back as they are loaded
+                del state["tables"]
+
+            buffer = io.BytesIO()
+            pickler = _EntryPickler(buffer, entry)
+            pickler.dump(type(item))
+            pickler.dump(state)
+
+            start = f.tell()
+            f.write(zlib.compress(buffer.getvalue()))
+            offsets.append([start, f.tell() - start])
+
+            i += 1
+
+        contents = f.tell()
+
+        f.write(
+            json.dumps(
+                {
+                    "entries": offsets,
+                    "tables": {
+                        table.name: numbers[id(table)]
+                        for table in schema.tables.list_tables_()
+                    },
+                }
+            ).encode()
+        )
+
+        f.seek(len(_MAGIC))
+        f.write(_OFFSET.pack(contents))
+
+
+class SchemaStore:
+    """
+    Read access to a schema saved with ``_Schema.save``. The file is memory mapped and only the
+    table of contents is read when opened. Tables are loaded on first access, together with the
+    tables and schemas they refer to, so loading one table does not depend on the size of the
+    schema. Loaded tables are added to the ``tables`` of their schema.
+
+    The mapping is held until ``close``, and the file cannot be replaced on some platforms while
+    it is held. Use the store as a context manager to close it when done, e.g.
+    ``with SchemaStore(filepath) as store: table = store.table("sessions")``. Tables already
+    loaded can still be used after the store is closed.
+
+    :param filepath: Path of saved schema
+    :type filepath: str
+    """
+
+    def __init__(self, filepath: str) -> None:
+        with open(filepath, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._data[: len(_MAGIC)] != _MAGIC:
+            self._data.close()
+            raise ValueError(rf"{filepath} is not a saved schema")
+
+        contents = _OFFSET.unpack_from(self._data, len(_MAGIC))[0]
+        contents = json.loads(self._data[contents:])
+
+        self._entries = contents["entries"]
+        self._tables = contents["tables"]
+        self._loaded = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Release the memory mapped file. Tables not yet loaded can no longer be loaded
+        """
+
+        self._data.close()
+
+    def list_names_(self):
+        return list(self._tables.keys())
+
+    def table(self, name: str):
+        """
+        Load a table of the schema, and the tables it refers to
+
+        :param name: Name of table
+        :type name: str
+        :return: _Table
+        """
+
+        try:
+            return self._load(self._tables[name])
+        except KeyError:
+            raise ValueError(rf"Table '{name}' not in saved schema")
+
+    def schema(self):
+        """
+        Load the schema with all of its tables
+
+        :return: _Schema
+        """
+
+        schema = self._load(0)
+
+        for number in self._tables.values():
+            table = self._load(number)
+
+            # Re-added so the tables keep their saved order
+            delattr(schema.tables, table.name)
+            schema.tables.add_(table)
+
+        return schema
+
+    def _load(self, number):
+        try:
+            return self._loaded[number]
+        except KeyError:
+            pass
+
+        start, length = self._entries[number]
+        unpickler = _EntryUnpickler(
+            io.BytesIO(zlib.decompress(self._data[start : start + length])), self
+        )
+
+        cls = unpickler.load()
+        item = cls.__new__(cls)
+
+        # Registered before the state is loaded, so entries referring back to it get this object
+        self._loaded[number] = item
+
+        if isinstance(item, _Schema):
+            # Tables are added as they are loaded
+            item.__dict__["tables"] = TableList([])
+
+        item.__dict__.update(unpickler.load())
+
+        if not isinstance(item, _Schema):
+            schema = item.__dict__.get("schema")
+
+            if isinstance(schema, _Schema):
+                schema.tables.add_(item, override=True)
+
+        return item
+
+
+def load_schema(filepath: str):
+    """
+    Load a schema saved with ``_Schema.save``. Use SchemaStore to load individual tables.
+
+    Schemas saved before ``.schema`` files were introduced are single pickles, saved to
+    ``{name}.pkl``. These are loaded with load_schema_from_pkl, and can be saved again with
+    ``_Schema.save`` to convert them.
+
+    :param filepath: Path of saved schema, or of a pickled schema
+    :type filepath: str
+    :return: _Schema
+    """
+
+    with open(filepath, "rb") as f:
+        pickled = f.read(len(_MAGIC)) != _MAGIC
+
+    if pickled:
+        return load_schema_from_pkl(filepath)
+
+    with SchemaStore(filepath) as store:
+        return store.schema()
+
+
+# Schema and function of a worker process building tables, see _build_tables
+_worker = {}
+
+
+def _context_references(context):
+    # The context schema, its tables and their columns, by name
+    references = {id(context): ("schema",)}
+
+    for table in context.tables.list_tables_():
+        references[id(table)] = ("table", table.name)
+
+        for column in table.columns.list_columns_():
+            references[id(column)] = ("column", table.name, column.name)
+
+    return references
+
+
+class _ContextPickler(pickle.Pickler):
+    def __init__(self, file, references):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.references = references
+
+    def persistent_id(self, obj):
+        return self.references.get(id(obj))
+
+
+class _ContextUnpickler(pickle.Unpickler):
+    def __init__(self, file, context):
+        super().__init__(file)
+        self.context = context
+
+    def persistent_load(self, pid):
+        if pid[0] == "schema":
+            return self.context
+        elif pid[0] == "table":
+            return self.context.tables.__dict__[pid[1]]
+        else:
+            return self.context.tables.__dict__[pid[1]].columns.__dict__[pid[2]]
+
+
+def _init_worker(function, context):
+    _worker["function"] = function
+    _worker["context"] = pickle.loads(context)
+    _worker["references"] = (
+        {} if _worker["context"] is None else _context_references(_worker["context"])
+    )
+
+
+def _build_in_worker(item):
+    buffer = io.BytesIO()
+    _ContextPickler(buffer, _worker["references"]).dump(
+        _worker["function"](_worker["context"], item)
+    )
+
+    return buffer.getvalue()
+
+
+def _build_tables(function, items: list, processes: int = None, context=None):
+    """
+    Build a table per item with function(context, item), in a pool of processes when processes is
+    given. The context schema is sent to each process once. References of the built tables to the
+    context schema, its tables and their columns are sent back by name and resolved against
+    context, so that the tables are the same as built in this process.
+
+    :param function: Module level function building a table
+    :type function: Callable
+    :param items: Arguments to build tables from, one per table
+    :type items: list
+    :param processes: Number of processes - default value [None] builds in this process
+    :type processes: int
+    :param context: Schema the tables are built from
+    :type context: _Schema
+    :return: List[_Table] in the order of items
+    """
+
+    if not processes or len(items) < 2:
+        return [function(context, item) for item in items]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    buffer = io.BytesIO()
+    pickle.dump(context, buffer, pickle.HIGHEST_PROTOCOL)
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(function, buffer.getvalue()),
+    ) as executor:
+        return [
+            _ContextUnpickler(io.BytesIO(table), context).load()
+            for table in executor.map(
+                _build_in_worker,
+                items,
+                chunksize=max(1, len(items) // (4 * processes)),
+            )
+        ]
+
+
+class Append:
+    """
+    Materialization of a table with an event_time that, once the table is built, only inserts the
+    rows past the latest event_time in the table. Rows up to lookback before it are read again so
+    that window functions over earlier rows, e.g. Lag and Lead, give the same results as a full
+    build, but are not inserted again. See database.core.create_tables.
+
+    :param lookback: How far before the latest event_time rows are read again. ``datetime.timedelta`` for TIMESTAMP, DATE and INTERVAL event times, a number for numeric event times. Default: ``None`` - only rows past the latest event_time
+    :type lookback: datetime.timedelta|int|float
+    """
+
+    def __init__(self, lookback=None) -> None:
+        self.lookback = lookback
+        self._node_data = {"type": str(type(self)), "lookback": str(lookback)}
+
+
+class _SchemaSettings(_Renderable):
     """
     Base class for storing schema settings. See lineage.macros.schema for example usage.
 
@@ -22,6 +392,7 @@ class _SchemaSettings:
     :param extensions: List[str] - List of extensions to install e.g. ['spatial']
     :param connection: Dict - Connection settings e.g. {"enable_progress_bar": True, "threads": 4}
     :param configuration: Dict - Any additional settings used by the tables within the datamodel e.g. {"min_datetime": '2025-01-01'}
+    :param materializations: Dict - Materialization of tables by table name e.g. {"weather": Append()}. Tables not included are rebuilt in full
     """
 
     def __init__(
@@ -31,18 +402,17 @@ class _SchemaSettings:
         extensions: List[Dict[str, str]] = {},
         connection: Dict = {"enable_progress_bar": True, "threads": 4},
         configuration: Dict = {},
+        materializations: Dict[str, Append] = None,
     ) -> None:
         self.name = name
         self.substitutions = substitutions
         self.extensions = extensions
         self.connection = connection
         self.configuration = configuration
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
+        self.materializations = materializations or {}
 
 
-class _Schema:
+class _Schema(_Renderable):
     """
     Storage object for schema settings and tables.
 
@@ -51,77 +421,71 @@ class _Schema:
         - tables:lineage.core.TableList - List of tables within the schema
     """
 
-    def __init__(self, settings: _SchemaSettings, tables=TableList([])) -> None:
+    def __init__(self, settings: _SchemaSettings, tables=None) -> None:
+        if tables is None:
+            tables = TableList([])
+
         self.name = settings.name
         self.settings = settings
-        self.tables = tables
-        self.sql = sqlparse.format(
-            _interpreters["beeswax_duckdb"].to_sql(self), reindent=True
-        )
+        self.tables = tables._claim_(self)
         self._node_data = {
             "label": self.name,
             "name": self.name,
-            "sql": self.sql,
+            "sql": _LazySQL(self),
             "type": str(type(self)),
             "base": str(type(self).__bases__[0]),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
-        graph = LineageGraph(graph)
-
         for table in self.tables.list_tables_():
             setattr(table, "schema", self)
             setattr(
                 table, "_node_data", table._node_data | {"schema": self.settings.name}
             )
             table.update_graph()
-            graph.add_child(0, table._node_data, {})
-
-        self.graph = graph
 
         self._outbound_edge_data = {}
         self._inbound_edge_data = {}
 
-    def save(self, output_directory: str = os.getcwd()):
+    def save(self, output_directory: str = None):
         """
-        Save schema to pickle object
+        Save schema to {name}.schema, see SchemaStore and load_schema. Schemas were previously
+        pickled to {name}.pkl; load_schema loads either
 
-        :param output_directory:str = os.path.expanduser(rf"~/")
+        :param output_directory:str = None - Current working directory when None
         :return:
         """
 
-        with open(
-            rf"{output_directory.rstrip('/')}/{self.settings.name}.pkl", "wb"
-        ) as f:
-            pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+        if output_directory is None:
+            output_directory = os.getcwd()
+
+        save_schema(
+            self, rf"{output_directory.rstrip('/')}/{self.settings.name}.schema"
+        )
 
     def add_table(self, table: Core, override: bool = False):
+        table = _claim(table, self)
         setattr(table, "schema", self)
         table.update_graph()
 
         try:
             self.tables.add_(table, override=override)
-            self.graph.add_child(0, table._node_data, {})
         except:
             setattr(table, "schema", None)
             table.update_graph()
             self.tables.add_(table, override=override)
-            self.graph.add_child(0, table._node_data, {})
 
     def add_tables(self, tables: TableList, override: bool = False):
         if not tables.is_empty:
             for table in tables.list_tables_():
+                table = _claim(table, self)
                 setattr(table, "schema", self)
                 table.update_graph()
                 try:
                     self.tables.add_(table, override=override)
-                    self.graph.add_child(0, table._node_data, {})
                 except:
                     setattr(table, "schema", None)
                     table.update_graph()
                     self.tables.add_(table, override=override)
-                    self.graph.add_child(0, table._node_data, {})
 
     def drop_tables(self, tables: List[str] = [], force=False):
         if not tables:
@@ -142,9 +506,14 @@ class _Schema:
             for table in tables:
                 delattr(self.tables, table)
 
-    def root_graph(self):
-        graph = self.graph
+    def _lineage_edges(self):
+        return [(self, table, {}) for table in self.tables.list_tables_()]
+
+    def _graph_arena(self):
+        # One arena per schema, shared by its tables and everything they are built from
+        state = self.__dict__
 
-        graph.union([table.graph for table in self.tables.list_tables_()])
+        if "_arena" not in state:
+            state["_arena"] = GraphArena()
 
-        return graph
+        return state["_arena"]
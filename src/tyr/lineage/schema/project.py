@@ -1,6 +1,6 @@
 from typing import Dict, List, Any
 from ..core import TableList
-from .core import _Schema, _SchemaSettings
+from .core import _Schema, _SchemaSettings, Append
 
 
 class ProjectSettings(_SchemaSettings):
@@ -10,12 +10,14 @@ class ProjectSettings(_SchemaSettings):
         substitutions: Dict[Any, Any] = {},
         extensions: List[Dict[str, str]] = [],
         connection: Dict = {},
+        materializations: Dict[str, Append] = None,
     ):
         super().__init__(
             name=name,
             substitutions=substitutions,
             extensions=extensions,
             connection=connection,
+            materializations=materializations,
         )
 
 
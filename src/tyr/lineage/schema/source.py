@@ -1,21 +1,37 @@
-import pandas as pd
 from ..values import Varchar, Datatype, Boolean
 from ..columns import WildCard
-from ..core import ColumnList, TableList, _Table, LineageGraph, _Transformation
+from ..core import (
+    ColumnList,
+    TableList,
+    _Table,
+    LineageGraph,
+    _Transformation,
+    _Renderable,
+)
 from .. import tables
-from ...interpreter import Interpreter
-from .core import _Schema, _SchemaSettings
+from .core import _Schema, _SchemaSettings, _build_tables
 from units.core import Unit
 import json
-from typing import List, Dict
+from typing import List, Dict, TYPE_CHECKING
 import os
 import re
 import rustworkx as rx
 
-_interpreters = {"beeswax_duckdb": Interpreter()}
+# pandas is only loaded when metadata is read
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _metadata_graph(node_data):
+    graph = rx.PyDiGraph()
+    graph.add_node(node_data)
+
+    return LineageGraph(rx_graph=graph)
 
 
 def read_column_metadata(filepath: str, separator: str = "\t"):
+    import pandas as pd
+
     column_metadata = pd.read_csv(filepath, sep=separator)
 
     column_metadata["ordinal_position"] = column_metadata["ordinal_position"].astype(
@@ -35,18 +51,60 @@ def read_column_metadata(filepath: str, separator: str = "\t"):
         column_metadata[column] = column_metadata[column].fillna("")
         column_metadata[column] = column_metadata[column].astype(str)
 
-    return {
-        dataset: {
-            column.name: ColumnMetadata(column)
-            for index, column in column_metadata[
-                column_metadata["dataset"] == dataset
-            ].iterrows()
-        }
-        for dataset in column_metadata.dataset.unique()
+    return read_column_metadata_frame(column_metadata)
+
+
+def read_column_metadata_frame(column_metadata: "pd.DataFrame"):
+    """
+    Build ColumnMetadata for each row of column_metadata, grouped by dataset and keyed by row index.
+    Datatypes, units and filter values are parsed once per distinct value and shared between rows.
+
+    :param column_metadata: Column metadata as cleaned by read_column_metadata
+    :type column_metadata: pd.DataFrame
+    :return: Dict[str, Dict[Any, ColumnMetadata]]
+    """
+
+    target_unit = column_metadata["target_unit"].where(
+        column_metadata["target_unit"] != "", column_metadata["source_unit"]
+    )
+
+    data_types = {
+        value: Datatype(value) for value in column_metadata["data_type"].unique()
     }
+    units = {
+        value: Unit(value)
+        for value in set(column_metadata["source_unit"].unique())
+        | set(target_unit.unique())
+    }
+    filter_values = {
+        value: json.loads(value) for value in column_metadata["filter_values"].unique()
+    }
+
+    # Column-wise conversion to python values, faster than converting row by row
+    names = column_metadata.columns.tolist()
+    rows = zip(*[column_metadata[name].tolist() for name in names])
+
+    result = {}
+
+    for index, values, target in zip(column_metadata.index, rows, target_unit.tolist()):
+        row = dict(zip(names, values))
+        item = ColumnMetadata.__new__(ColumnMetadata)
+        item._set(
+            row,
+            data_type=data_types[row["data_type"]],
+            source_unit=units[row["source_unit"]],
+            target_unit=units[target],
+            filter_values=list(filter_values[row["filter_values"]]),
+        )
+
+        result.setdefault(item.dataset, {})[index] = item
+
+    return result
 
 
 def read_file_metadata(filepath: str, separator: str = "\t"):
+    import pandas as pd
+
     file_metadata = pd.read_csv(filepath, sep=separator)
 
     file_metadata["distinct"] = file_metadata["distinct"].astype(bool)
@@ -56,7 +114,7 @@ def read_file_metadata(filepath: str, separator: str = "\t"):
         file_metadata[column] = file_metadata[column].astype(str)
 
     return {
-        file.dataset: FileMetadata(file) for index, file in file_metadata.iterrows()
+        file["dataset"]: FileMetadata(file) for file in file_metadata.to_dict("records")
     }
 
 
@@ -103,17 +161,35 @@ class ColumnMetadata:
     :type ordinal_position: int
     """
 
-    def __init__(self, column_metadata: pd.Series):
+    def __init__(self, column_metadata: "pd.Series"):
+        if column_metadata["target_unit"]:
+            target_unit = Unit(str(column_metadata["target_unit"]))
+        else:
+            target_unit = Unit(str(column_metadata["source_unit"]))
+
+        self._set(
+            column_metadata,
+            data_type=Datatype(str(column_metadata["data_type"])),
+            source_unit=Unit(str(column_metadata["source_unit"])),
+            target_unit=target_unit,
+            filter_values=json.loads(column_metadata["filter_values"]),
+        )
+
+    def _set(
+        self,
+        column_metadata,
+        data_type: Datatype,
+        source_unit: Unit,
+        target_unit: Unit,
+        filter_values: list,
+    ):
         self.dataset = str(column_metadata["dataset"])
         self.column_name = str(column_metadata["column_name"])
         self.column_alias = str(column_metadata["column_alias"])
         self.var_type = str(column_metadata["var_type"])
-        self.data_type = Datatype(str(column_metadata["data_type"]))
-        self.source_unit = Unit(str(column_metadata["source_unit"]))
-        if column_metadata["target_unit"]:
-            self.target_unit = Unit(str(column_metadata["target_unit"]))
-        else:
-            self.target_unit = Unit(str(column_metadata["source_unit"]))
+        self.data_type = data_type
+        self.source_unit = source_unit
+        self.target_unit = target_unit
         self.precision = str(column_metadata["precision"])
         if column_metadata["scale_factor"]:
             self.scale_factor = float(column_metadata["scale_factor"])
@@ -121,7 +197,7 @@ class ColumnMetadata:
             self.scale_factor = 1
         else:
             self.scale_factor = None
-        self.filter_values = json.loads(column_metadata["filter_values"])
+        self.filter_values = filter_values
         self.on_filter = str(column_metadata["on_filter"])
         self.on_null = str(column_metadata["on_null"])
         self.is_primary_key = bool(column_metadata["is_primary_key"])
@@ -157,10 +233,13 @@ class ColumnMetadata:
             "is_event_time": str(self.is_event_time),
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
+    @property
+    def graph(self):
+        # Built on first use, lineage graphs of schemas only use _node_data
+        if "_graph" not in self.__dict__:
+            self.__dict__["_graph"] = _metadata_graph(self._node_data)
 
-        self.graph = LineageGraph(rx_graph=graph)
+        return self.__dict__["_graph"]
 
     def root_graph(self):
         return self.graph
@@ -173,7 +252,7 @@ class ColumnMetadata:
 
 
 class FileMetadata:
-    def __init__(self, file_metadata: pd.Series):
+    def __init__(self, file_metadata: "pd.Series"):
         self.dataset = str(file_metadata["dataset"])
         self.file_regex = str(file_metadata["file_regex"])
         self.delim = str(file_metadata["delim"])
@@ -190,10 +269,12 @@ class FileMetadata:
             "label": rf"{self.dataset} - {self.file_regex}",
         }
 
-        graph = rx.PyDiGraph()
-        graph.add_node(self._node_data)
+    @property
+    def graph(self):
+        if "_graph" not in self.__dict__:
+            self.__dict__["_graph"] = _metadata_graph(self._node_data)
 
-        self.graph = LineageGraph(rx_graph=graph)
+        return self.__dict__["_graph"]
 
     def __getitem__(self, item):
         if isinstance(item, list):
@@ -202,7 +283,7 @@ class FileMetadata:
             return getattr(self, item)
 
 
-class SourceFile:
+class SourceFile(_Renderable):
     def __init__(
         self,
         file_metadata: FileMetadata,
@@ -214,31 +295,32 @@ class SourceFile:
         self.delim = Varchar(file_metadata.delim)
         self.distinct = file_metadata.distinct
         self.expected_column_metadata = expected_column_metadata
-        self.sql = _interpreters["beeswax_duckdb"].to_sql(self)
         self._node_data = file_metadata._node_data
-        self.graph = file_metadata.graph
         self.extension = Varchar(self.file_regex.value.split(".")[-1])
 
-        for column in self.expected_column_metadata.values():
-            self.graph.add_child(0, column._node_data, column._edge_data)
+    def _lineage_edges(self):
+        return [
+            (self, column, column._edge_data)
+            for column in self.expected_column_metadata.values()
+        ]
 
 
 class ReadCSV(_Transformation):
     def __init__(
         self,
         source_file: SourceFile,
-        union_by_name: Boolean = Boolean(False),
-        headers: Boolean = Boolean(False),
+        union_by_name: Boolean = None,
+        headers: Boolean = None,
         macro_group: str = "",
-        all_varchar: Boolean = Boolean(False),
+        all_varchar: Boolean = None,
     ):
         super().__init__(
             name="READ_CSV",
             source=source_file,
             args={
-                "union_by_name": union_by_name,
-                "header": headers,
-                "all_varchar": all_varchar,
+                "union_by_name": union_by_name or Boolean(False),
+                "header": headers or Boolean(False),
+                "all_varchar": all_varchar or Boolean(False),
             },
             macro_group=macro_group,
         )
@@ -280,44 +362,55 @@ class SourceSettings(_SchemaSettings):
         self.expected_column_metadata = expected_column_metadata
 
 
-class Source(_Schema):
-    def __init__(self, settings: SourceSettings):
-        source_tables = TableList([])
+def _source_table(context, item):
+    file, expected_column_metadata = item
 
-        for file in settings.file_metadata.values():
-            source_file = SourceFile(
-                file_metadata=file,
-                expected_column_metadata=settings.expected_column_metadata[
-                    file.dataset
-                ],
-            )
+    source_file = SourceFile(
+        file_metadata=file,
+        expected_column_metadata=expected_column_metadata,
+    )
+
+    if source_file.extension.value in ["json", "geojson"]:
+        source_table = tables.Core(
+            name=source_file.dataset.value,
+            columns=ColumnList([WildCard()]),
+            source=ReadGeoJson(source_file),
+            distinct=source_file.distinct,
+        )
+    else:
+        source_table = tables.Core(
+            name=source_file.dataset.value,
+            columns=ColumnList([WildCard()]),
+            source=ReadCSV(
+                source_file,
+                union_by_name=Boolean(True),
+                headers=Boolean(True),
+                all_varchar=Boolean(True),
+            ),
+            distinct=source_file.distinct,
+        )
+
+    setattr(
+        source_table,
+        "expected_column_metadata",
+        source_file.expected_column_metadata,
+    )
+
+    return source_table
 
-            if source_file.extension.value in ["json", "geojson"]:
-                source_table = tables.Core(
-                    name=source_file.dataset.value,
-                    columns=ColumnList([WildCard()]),
-                    source=ReadGeoJson(source_file),
-                    distinct=source_file.distinct,
-                )
-            else:
-                source_table = tables.Core(
-                    name=source_file.dataset.value,
-                    columns=ColumnList([WildCard()]),
-                    source=ReadCSV(
-                        source_file,
-                        union_by_name=Boolean(True),
-                        headers=Boolean(True),
-                        all_varchar=Boolean(True),
-                    ),
-                    distinct=source_file.distinct,
-                )
-
-            setattr(
-                source_table,
-                "expected_column_metadata",
-                source_file.expected_column_metadata,
-            )
 
+class Source(_Schema):
+    def __init__(self, settings: SourceSettings, processes: int = None):
+        source_tables = TableList([])
+
+        for source_table in _build_tables(
+            _source_table,
+            [
+                (file, settings.expected_column_metadata[file.dataset])
+                for file in settings.file_metadata.values()
+            ],
+            processes=processes,
+        ):
             source_tables.add_(source_table)
 
         super().__init__(settings=settings, tables=source_tables)
@@ -325,102 +418,276 @@ class Source(_Schema):
         return
 
 
-def init_column_metadata(
-    path: str = None,
-    file_metadata: pd.DataFrame = pd.DataFrame(),
+_COLUMN_METADATA_COLUMNS = [
+    "schema",
+    "dataset",
+    "column_name",
+    "column_alias",
+    "var_type",
+    "data_type",
+    "on_null",
+    "is_primary_key",
+    "is_event_time",
+    "filter_values",
+    "on_filter",
+    "regex",
+    "source_unit",
+    "target_unit",
+    "precision",
+    "ordinal_position",
+]
+
+# DuckDB sniffed types, and the data_type and var_type proposed for them
+_SNIFFED_TYPES = {
+    "BOOLEAN": ("BOOLEAN", "categorical"),
+    "TINYINT": ("INTEGER", "numeric"),
+    "SMALLINT": ("INTEGER", "numeric"),
+    "INTEGER": ("INTEGER", "numeric"),
+    "BIGINT": ("INTEGER", "numeric"),
+    "HUGEINT": ("INTEGER", "numeric"),
+    "FLOAT": ("FLOAT", "numeric"),
+    "DOUBLE": ("FLOAT", "numeric"),
+    "DATE": ("DATE", "timestamp"),
+    "TIMESTAMP": ("TIMESTAMP", "timestamp"),
+    "TIMESTAMP WITH TIME ZONE": ("TIMESTAMP", "timestamp"),
+    "TIME": ("INTERVAL", "timedelta"),
+    "INTERVAL": ("INTERVAL", "timedelta"),
+    "VARCHAR": ("VARCHAR", "string"),
+}
+
+
+def _resolve_files(file_regex: str, listings: Dict[str, List[str]]):
+    directory = "/".join(file_regex.split("/")[:-1])
+
+    if directory not in listings:
+        listings[directory] = (
+            sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+        )
+
+    pattern = re.compile(file_regex.replace(".", r"\.").replace("*", ".*"))
+
+    return [
+        directory + "/" + file
+        for file in listings[directory]
+        if pattern.search(directory + "/" + file)
+    ]
+
+
+def _propose_types(sniffed_type: str, count: int, n_distinct: int):
+    data_type, var_type = _SNIFFED_TYPES.get(sniffed_type, ("VARCHAR", ""))
+
+    # Few distinct values proposes categorical, unique integers key, given enough rows to tell
+    if var_type == "numeric" and data_type == "INTEGER" and n_distinct >= count > 20:
+        var_type = "key"
+    elif var_type == "string" and n_distinct <= max(20, count // 20):
+        var_type = "categorical"
+
+    return data_type, var_type
+
+
+def _sampled_files(files: List[str], sample_files: int):
+    # Spread over the sorted files, so that files written at different times are all sampled
+    if len(files) <= sample_files:
+        return files
+
+    if sample_files <= 1:
+        return files[:1]
+
+    return [
+        files[round(i * (len(files) - 1) / (sample_files - 1))]
+        for i in range(sample_files)
+    ]
+
+
+def _sniff_dataset(cursor, files: List[str], delim: str, sample_size: int):
+    """
+    Columns of delimited files with the data_type and var_type proposed from their first
+    sample_size rows. The files are read by name as one relation, so each file is sniffed by DuckDB and
+    their columns and types combined
+    """
+
+    options = ", delim = $delim" if delim else ""
+    parameters = {"files": files, "sample_size": int(sample_size)}
+
+    if delim:
+        parameters["delim"] = delim
+
+    relation = rf"read_csv($files, union_by_name = true, header = true, sample_size = $sample_size{options})"
+
+    columns = cursor.execute(
+        rf"DESCRIBE SELECT * FROM {relation}", parameters
+    ).fetchall()
+
+    if not columns:
+        return []
+
+    # Exact distinct counts over the first rows, so the same files always propose the same types.
+    # Insertion order is kept, so the rows read are the same on every run.
+    quoted = ['"' + column[0].replace('"', '""') + '"' for column in columns]
+    statistics = cursor.execute(
+        rf"""SELECT {', '.join([rf"COUNT({name}), COUNT(DISTINCT {name})" for name in quoted])} FROM (SELECT * FROM {relation} LIMIT {int(sample_size)})""",
+        parameters,
+    ).fetchone()
+
+    return [
+        (column[0],)
+        + _propose_types(column[1], statistics[2 * i] or 0, statistics[2 * i + 1] or 0)
+        for i, column in enumerate(columns)
+    ]
+
+
+def _sample_dataset(
+    row: Dict[str, str],
+    files: List[str],
+    cursor,
+    sample_size: int,
+    sample_files: int,
 ):
-    column_metadata_df = pd.DataFrame(
-        columns=[
-            "schema",
-            "dataset",
-            "column_name",
-            "column_alias",
-            "var_type",
-            "data_type",
-            "on_null",
-            "is_primary_key",
-            "is_event_time",
-            "filter_values",
-            "on_filter",
-            "regex",
-            "source_unit",
-            "target_unit",
-            "precision",
-            "ordinal_position",
+    import pandas as pd
+
+    files = _sampled_files(files, sample_files)
+
+    if row["delim"] == "t":
+        delim = "\t"
+    elif row["delim"] == "c":
+        delim = ","
+    else:
+        delim = row["delim"]
+
+    ext = row["file_regex"].split(".")[-1]
+
+    if ext in ["json", "geojson"]:
+        columns = [
+            (column, None, None)
+            for column in dict.fromkeys(
+                column
+                for file in files
+                for column in pd.read_json(file, nrows=10).columns.tolist()
+            )
         ]
+    else:
+        columns = _sniff_dataset(cursor, files, delim, sample_size)
+
+    return pd.DataFrame.from_records(
+        [
+            {
+                "schema": row["schema"],
+                "dataset": row["dataset"],
+                "column_name": column_name,
+                "column_alias": None,
+                "var_type": var_type,
+                "data_type": data_type,
+                "on_null": "PASS",
+                "is_primary_key": False,
+                "is_event_time": False,
+                "filter_values": None,
+                "on_filter": "PASS",
+                "regex": None,
+                "source_unit": None,
+                "target_unit": None,
+                "precision": None,
+                "ordinal_position": i,
+            }
+            for i, (column_name, data_type, var_type) in enumerate(columns)
+        ],
+        columns=_COLUMN_METADATA_COLUMNS,
     )
 
-    if not file_metadata.empty:
-        for index, row in file_metadata.iterrows():
-            if not [
-                "/".join(row["file_regex"].split("/")[:-1]) + "/" + file
-                for file in os.listdir("/".join(row["file_regex"].split("/")[:-1]))
-                if re.search(
-                    row["file_regex"].replace(".", "\.").replace("*", ".*"),
-                    "/".join(row["file_regex"].split("/")[:-1]) + "/" + file,
-                )
-            ]:
-                print(rf"""Nothing found for - {row['file_regex']}""")
-                return column_metadata_df
-
-            file = [
-                "/".join(row["file_regex"].split("/")[:-1]) + "/" + file
-                for file in os.listdir("/".join(row["file_regex"].split("/")[:-1]))
-                if re.search(
-                    row["file_regex"].replace(".", "\.").replace("*", ".*"),
-                    "/".join(row["file_regex"].split("/")[:-1]) + "/" + file,
-                )
-            ][0]
-
-            if row["delim"] == "t":
-                delim = "\t"
-            elif row["delim"] == "c":
-                delim = ","
-            else:
-                delim = row["delim"]
-
-            ext = row["file_regex"].split(".")[-1]
-
-            if delim:
-                df = pd.read_csv(file, delimiter=delim, nrows=10)
-            elif ext == "json":
-                df = pd.read_json(file, nrows=10)
-            elif ext == "geojson":
-                df = pd.read_json(file, nrows=10)
-            else:
-                df = pd.DataFrame
-
-            columns = df.columns.tolist()
-
-            column_metadata_df = pd.concat(
-                [
-                    column_metadata_df,
-                    pd.DataFrame.from_records(
-                        [
-                            {
-                                "schema": row["schema"],
-                                "dataset": row["dataset"],
-                                "column_name": columns[i],
-                                "column_alias": None,
-                                "var_type": None,
-                                "data_type": None,
-                                "on_null": "PASS",
-                                "is_primary_key": False,
-                                "is_event_time": False,
-                                "filter_values": None,
-                                "on_filter": "PASS",
-                                "regex": None,
-                                "source_unit": None,
-                                "target_unit": None,
-                                "precision": None,
-                                "ordinal_position": i,
-                            }
-                            for i in range(len(columns))
-                        ]
-                    ),
-                ],
-                ignore_index=True,
-            )
+
+def infer_column_metadata(
+    file_metadata: "pd.DataFrame",
+    sample_size: int = 1000,
+    max_workers: int = None,
+    sample_files: int = 5,
+):
+    """
+    Infer column metadata for each dataset of file_metadata from files matching its file_regex.
+    Directories are listed once, and datasets are sampled concurrently. Delimited files are read
+    by name with the CSV sniffer of DuckDB, which combines the columns and types of each file and
+    proposes data_type and var_type from the first rows.
+
+    :param file_metadata: File metadata, see init_file_metadata
+    :type file_metadata: pd.DataFrame
+    :param sample_size: Number of rows read per dataset to propose types
+    :type sample_size: int
+    :param sample_files: Number of files sampled per dataset, spread over the files in name order
+    :type sample_files: int
+    :param max_workers: Number of datasets sampled at once - default value [None] as ThreadPoolExecutor
+    :type max_workers: int
+    :return: pd.DataFrame
+    """
+
+    import duckdb
+    import pandas as pd
+    from concurrent.futures import ThreadPoolExecutor
+
+    listings = {}
+    datasets = []
+
+    for row in file_metadata.to_dict("records"):
+        files = _resolve_files(row["file_regex"], listings)
+
+        if not files:
+            print(rf"""Nothing found for - {row['file_regex']}""")
+        else:
+            datasets.append((row, files))
+
+    conn = duckdb.connect()
+
+    def sample(dataset):
+        # Cursors are independent connections to the same database, one per dataset
+        cursor = conn.cursor()
+
+        try:
+            return _sample_dataset(*dataset, cursor, sample_size, sample_files)
+        finally:
+            cursor.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            samples = list(executor.map(sample, datasets))
+    finally:
+        conn.close()
+
+    if not samples:
+        return pd.DataFrame(columns=_COLUMN_METADATA_COLUMNS)
+
+    return pd.concat(samples, ignore_index=True)
+
+
+def init_column_metadata(
+    path: str = None,
+    file_metadata: "pd.DataFrame" = None,
+    sample_size: int = 1000,
+    max_workers: int = None,
+    sample_files: int = 5,
+):
+    """
+    Initialise column metadata from the files described by file_metadata, see infer_column_metadata
+
+    :param path: Path to save column metadata to. Returned as pd.DataFrame when None
+    :type path: str
+    :param file_metadata: File metadata, see init_file_metadata
+    :type file_metadata: pd.DataFrame
+    :param sample_size: Number of rows read per dataset to propose types
+    :type sample_size: int
+    :param max_workers: Number of datasets sampled at once
+    :type max_workers: int
+    :param sample_files: Number of files sampled per dataset
+    :type sample_files: int
+    """
+
+    import pandas as pd
+
+    if file_metadata is None or file_metadata.empty:
+        column_metadata_df = pd.DataFrame(columns=_COLUMN_METADATA_COLUMNS)
+    else:
+        column_metadata_df = infer_column_metadata(
+            file_metadata,
+            sample_size=sample_size,
+            max_workers=max_workers,
+            sample_files=sample_files,
+        )
 
     if not path:
         return column_metadata_df
@@ -432,6 +699,8 @@ def init_column_metadata(
 def init_file_metadata(
     path: str = None,
 ):
+    import pandas as pd
+
     if not path:
         if not "configurations" in os.listdir(os.getcwd()):
             os.mkdir("configurations")
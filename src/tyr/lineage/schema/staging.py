@@ -1,6 +1,6 @@
 from typing import Dict, List, Any
 from ..core import TableList
-from .core import _Schema, _SchemaSettings
+from .core import _Schema, _SchemaSettings, _build_tables, Append
 from .source import Source
 from ..macros.tables import staging_table_transform
 import datetime
@@ -15,6 +15,7 @@ class StagingSettings(_SchemaSettings):
         connection: Dict = {},
         min_event_time: datetime.datetime = None,
         max_event_time: datetime.datetime = None,
+        materializations: Dict[str, Append] = None,
     ):
         super().__init__(
             name=name,
@@ -25,24 +26,50 @@ class StagingSettings(_SchemaSettings):
                 "min_event_time": min_event_time,
                 "max_event_time": max_event_time,
             },
+            materializations=materializations,
         )
 
 
+def _staging_table(source: Source, item):
+    name, macro_groups, settings = item
+
+    return staging_table_transform(
+        source.tables[name],
+        settings,
+        macro_group=macro_groups[0],
+        column_macro_group=macro_groups[1],
+    )
+
+
 class Staging(_Schema):
-    def __init__(self, source: Source, settings: StagingSettings):
+    def __init__(
+        self, source: Source, settings: StagingSettings, processes: int = None
+    ):
         self.source = source
 
         tables = TableList([])
 
-        for table in self.source.tables.list_tables_():
-            staging_table = staging_table_transform(table, settings)
-
+        # Tables are independent of each other, so can be built in a pool of processes. Macro
+        # groups are named here, as objects have other ids in the processes building them
+        for staging_table in _build_tables(
+            _staging_table,
+            [
+                (
+                    table.name,
+                    (
+                        rf"StagingTableTransform - {id(table)}",
+                        rf"StagingColumnTransform - {id(table.columns.list_columns_()[0])}",
+                    ),
+                    settings,
+                )
+                for table in self.source.tables.list_tables_()
+            ],
+            processes=processes,
+            context=self.source,
+        ):
             tables.add_(staging_table)
 
         super().__init__(settings=settings, tables=tables)
 
-        self.graph.union([self.source.graph])
-        self.graph.add_edge(
-            self.graph.node_index_from_data(self.source._node_data),
-            self.graph.node_index_from_data(self._node_data),
-        )
+    def _lineage_edges(self):
+        return [(self.source, self, {})] + super()._lineage_edges()
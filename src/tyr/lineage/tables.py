@@ -8,6 +8,9 @@ class Core(lineage._Table):
     """
     Core Table object that is the main table type required for most internal applications (Schema, TableList, etc.)
 
+    The table takes shallow copies of the columns, primary key and event time it is given, so
+    later changes to the objects passed in do not modify the table.
+
     :param name: Name of table object
     :type name: str
     :param columns: List of _Column objects belonging to table
@@ -16,7 +19,7 @@ class Core(lineage._Table):
     :type source: lineage._Table|lineage.joins.Join|lineage.joins.CompoundJoin|lineage.transformations.Union
     :param inherit_primary_key: Inherit primary key as Select objects from source table. Overrides primary_key. Default: ``False``
     :type inherit_primary_key: bool
-    :param primary_key: List of columns to use as primary key. Default: ``lineage.ColumnList([])``
+    :param primary_key: List of columns to use as primary key. Default: ``None`` - no primary key
     :type primary_key: lineage.ColumnList
     :param inherit_event_time: Inherit event time as Select object from source table. Overrides event_time. Default: ``False``
     :type inherit_event_time: bool
@@ -44,7 +47,7 @@ class Core(lineage._Table):
         columns,
         source=None,
         inherit_primary_key: bool = False,
-        primary_key: lineage.ColumnList = lineage.ColumnList([]),
+        primary_key: lineage.ColumnList = None,
         inherit_event_time: bool = False,
         event_time=None,
         distinct: bool = False,
@@ -55,6 +58,9 @@ class Core(lineage._Table):
         ctes=None,
         macro_group: str = "",
     ) -> None:
+        if primary_key is None:
+            primary_key = lineage.ColumnList([])
+
         if not all(
             [isinstance(column, lineage._Column) for column in columns.list_columns_()]
         ):
@@ -187,7 +193,7 @@ class FromRecords(lineage._Table):
         self,
         name: str,
         source: lineage.RecordList,
-        primary_key: lineage.ColumnList = lineage.ColumnList([]),
+        primary_key: lineage.ColumnList = None,
         event_time: lineage._Column = None,
         macro_group: str = "",
     ):
@@ -225,7 +231,7 @@ class Insert:
         self.target = target
 
         self._node_data = {
-            "label": rf"INSERT - {str(id(self))}",
+            "label": "INSERT",
             "macro_group": macro_group,
         }
 
@@ -275,11 +281,17 @@ class Union(lineage._Table):
         self,
         name: str,
         tables: lineage.TableList,
-        columns: lineage.ColumnList = lineage.ColumnList([]),
-        primary_key: lineage.ColumnList = lineage.ColumnList([]),
+        columns: lineage.ColumnList = None,
+        primary_key: lineage.ColumnList = None,
         event_time: lineage._Column = None,
         macro_group: str = "",
     ) -> None:
+        if columns is None:
+            columns = lineage.ColumnList([])
+
+        if primary_key is None:
+            primary_key = lineage.ColumnList([])
+
         if not all(
             [type(column) is lineage_columns.Core for column in columns.list_columns_()]
         ):
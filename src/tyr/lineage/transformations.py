@@ -7,9 +7,12 @@ class Limit(lineage._Transformation):
         self,
         source,
         limit: lineage_values.Integer,
-        offset: lineage_values.Integer = lineage_values.Integer(0),
+        offset: lineage_values.Integer = None,
         macro_group: str = "",
     ):
+        if offset is None:
+            offset = lineage_values.Integer(0)
+
         super().__init__(
             name="LIMIT", source=source, args=[limit, offset], macro_group=macro_group
         )
@@ -26,6 +26,9 @@ class Datatype(lineage._Value):
         else:
             return False
 
+    def __hash__(self):
+        return hash(self.value)
+
 
 class Interval(lineage._Value):
 
@@ -56,6 +59,9 @@ class Interval(lineage._Value):
         else:
             return False
 
+    def __hash__(self):
+        return hash((self.value, self.unit.name))
+
 
 class Timestamp(lineage._Value):
     """
@@ -122,7 +128,7 @@ class Double(lineage._Value):
     :type macro_group: str
     """
 
-    def __init__(self, value, unit=lineage.units.core.Unit(), macro_group: str = ""):
+    def __init__(self, value, unit=None, macro_group: str = ""):
         super().__init__(
             value=value,
             data_type=Datatype("DOUBLE"),
@@ -144,7 +150,7 @@ class Float(lineage._Value):
     :type macro_group: str
     """
 
-    def __init__(self, value, unit=lineage.units.core.Unit(), macro_group: str = ""):
+    def __init__(self, value, unit=None, macro_group: str = ""):
         super().__init__(
             value=value, data_type=Datatype("FLOAT"), unit=unit, macro_group=macro_group
         )
@@ -174,7 +180,7 @@ class Decimal(lineage._Value):
         value,
         width: int,
         scale: int,
-        unit=lineage.units.core.Unit(),
+        unit=None,
         macro_group: str = "",
     ):
         if scale > width:
@@ -209,7 +215,7 @@ class Subquery(lineage._Value):
             macro_group=macro_group,
         )
 
-        self.name = rf"SUBQUERY - {id(self)}"
+        self.name = "SUBQUERY"
 
 
 class List(lineage._Value):
@@ -223,7 +229,7 @@ class List(lineage._Value):
             macro_group=macro_group,
         )
 
-        self.name = rf"LIST - {id(self)}"
+        self.name = "LIST"
 
 
 class Struct(lineage._Value):
@@ -236,7 +242,7 @@ class Struct(lineage._Value):
             macro_group=macro_group,
         )
 
-        self.name = rf"STRUCT - {id(self)}"
+        self.name = "STRUCT"
 
 
 class WildCard(lineage._Value):
@@ -258,7 +264,7 @@ class Tuple(lineage._Value):
             macro_group=macro_group,
         )
 
-        self.name = rf"TUPLE - {id(self)}"
+        self.name = "TUPLE"
 
 
 class Null(lineage._Value):
@@ -285,7 +291,7 @@ class JSON(lineage._Value):
             value=source, data_type=Datatype("JSON"), macro_group=macro_group
         )
 
-        self.name = rf"JSON - {id(self)}"
+        self.name = "JSON"
 
 
 class Boolean(lineage._Value):
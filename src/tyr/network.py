@@ -1,6 +1,7 @@
 import units
 import itertools
 import rustworkx as rx
+from .registry import TypeRegistry
 
 
 def add_node(G, item):
@@ -157,6 +158,18 @@ def tables_from_records(item):
     return G
 
 
+def core_series(item):
+    G = rx.PyDiGraph()
+    G = add_node(G, item)
+
+    for arg in [item.start, item.step]:
+        G = add_node(G, arg)
+        G = add_edge(G, arg, item)
+        G = compose_all([G, item_to_graph(arg)])
+
+    return G
+
+
 def core_case_when(item):
     G = rx.PyDiGraph()
     G = add_node(G, item)
@@ -521,178 +534,79 @@ def macros_macro(item):
     return G
 
 
-def item_to_graph(item):
-    # SOURCE
+def core_unit(item):
+    return rx.PyDiGraph()
 
-    if "lineage.schema.source.SourceColumn" in str(type(item)):
-        G = source_column(item)
 
-    elif "lineage.schema.source.SourceFile" in str(type(item)):
-        G = source_file(item)
+graph_functions = TypeRegistry("GRAPH")
 
+for cls, function in {
+    # SOURCE
+    "tyr.lineage.schema.source.SourceFile": source_file,
     # COLUMNS
-
-    elif "lineage.core._Column" in str(type(item).__bases__[0]):
-        if "lineage.columns.Select" in str(type(item)):
-            G = core_column(item)
-
-        elif "lineage.columns.Core" in str(type(item)):
-            G = core_column(item)
-
-        elif "lineage.dataframes.LambdaOutput" in str(type(item)):
-            G = dataframes_data_frame_column(item)
-
-        elif "lineage.dataframes.DataFrameColumn" in str(type(item)):
-            G = dataframes_data_frame_column(item)
-
-        elif "lineage.columns.WildCard" in str(type(item)):
-            G = column_wild_card(item)
-
-    elif "lineage.columns.Blank" in str(type(item)):
-        G = column_blank(item)
-
+    "tyr.lineage.columns.Select": core_column,
+    "tyr.lineage.columns.Core": core_column,
+    "tyr.lineage.dataframes.LambdaOutput": dataframes_data_frame_column,
+    "tyr.lineage.dataframes.DataFrameColumn": dataframes_data_frame_column,
+    "tyr.lineage.columns.WildCard": column_wild_card,
     # VALUES
-
-    elif "lineage.core._Value" in str(type(item).__bases__[0]):
-        if "lineage.values.Varchar" in str(type(item)):
-            G = core_value(item)
-
-        elif "lineage.values.Integer" in str(type(item)):
-            G = core_value(item)
-
-        elif "lineage.values.Float" in str(type(item)):
-            G = core_value(item)
-
-        elif "lineage.values.Timestamp" in str(type(item)):
-            G = core_value(item)
-
-        elif "lineage.values.WildCard" in str(type(item)):
-            G = core_value(item)
-
-        elif "lineage.values.Subquery" in str(type(item)):
-            G = values_subquery(item)
-
-        elif "lineage.values.Null" in str(type(item)):
-            G = core_value(item)
-
-        elif "lineage.values.Interval" in str(type(item)):
-            G = values_interval(item)
-
-        elif "lineage.values.List" in str(type(item)):
-            G = values_list(item)
-
-        elif "lineage.values.GeoCoordinate" in str(type(item)):
-            G = values_list(item)
-
-        elif "lineage.values.Datatype" in str(type(item)):
-            G = core_value(item)
-
-        elif "lineage.values.Tuple" in str(type(item)):
-            G = core_value(item)
-
-        elif "lineage.values.Struct" in str(type(item)):
-            G = values_struct(item)
-
-        elif "lineage.values.Boolean" in str(type(item)):
-            G = values_boolean(item)
-
+    "tyr.lineage.values.Varchar": core_value,
+    "tyr.lineage.values.Integer": core_value,
+    "tyr.lineage.values.Float": core_value,
+    "tyr.lineage.values.Timestamp": core_value,
+    "tyr.lineage.values.WildCard": core_value,
+    "tyr.lineage.values.Subquery": values_subquery,
+    "tyr.lineage.values.Null": core_value,
+    "tyr.lineage.values.Interval": values_interval,
+    "tyr.lineage.values.List": values_list,
+    "tyr.lineage.values.GeoCoordinate": values_list,
+    "tyr.lineage.values.Datatype": core_value,
+    "tyr.lineage.values.Tuple": core_value,
+    "tyr.lineage.values.Struct": values_struct,
+    "tyr.lineage.values.Boolean": values_boolean,
     # UNITS
-
-    elif type(item) is units.core.Unit:
-        G = rx.PyDiGraph()
-
+    "units.core.Unit": core_unit,
     # TABLES
-
-    elif "lineage.core._Table" in str(type(item).__bases__[0]):
-        if "lineage.tables.Core" in str(type(item)):
-            G = core_table(item)
-
-        elif "lineage.tables.Select" in str(type(item)):
-            G = core_table(item)
-
-        elif "lineage.tables.Subquery" in str(type(item)):
-            G = tables_subquery(item)
-
-        elif "lineage.tables.Union" in str(type(item)):
-            G = unions_union(item)
-
-        elif "lineage.dataframes.DataFrame" in str(type(item)):
-            G = dataframes_data_frame(item)
-
-        elif "lineage.tables.FromRecords" in str(type(item)):
-            G = tables_from_records(item)
-
+    "tyr.lineage.tables.Core": core_table,
+    "tyr.lineage.tables.Select": core_table,
+    "tyr.lineage.tables.Subquery": tables_subquery,
+    "tyr.lineage.tables.Union": unions_union,
+    "tyr.lineage.dataframes.DataFrame": dataframes_data_frame,
+    "tyr.lineage.tables.FromRecords": tables_from_records,
+    "tyr.lineage.core.Series": core_series,
     # FUNCTIONS
-
-    elif "lineage.core._Function" in str(type(item).__bases__[0]):
-        if not any(
-            [
-                x in str(type(item))
-                for x in [
-                    "lineage.functions.data_type.ToInterval",
-                    "lineage.dataframes.LambdaFunction",
-                    "lineage.functions.utility.SourceWildToStagingColumn",
-                ]
-            ]
-        ):
-            G = core_function(item)
-        elif "lineage.functions.data_type.ToInterval" in str(type(item)):
-            G = core_function(item)
-
-        elif "lineage.dataframes.LambdaFunction" in str(type(item)):
-            G = dataframes_lambda_function(item)
-
-        elif "lineage.functions.utility.SourceWildToStagingColumn" in str(type(item)):
-            G = functions_source_wild_to_staging_column(item)
-        else:
-            G = core_function(item)
-
-    # EXPRESSIONS
-    elif "lineage.core._Expression" in str(type(item).__bases__[0]):
-        G = core_expression(item)
-
+    "tyr.lineage.core._Function": core_function,
+    "tyr.lineage.dataframes.LambdaFunction": dataframes_lambda_function,
+    "tyr.lineage.functions.utility.SourceWildToStagingColumn": functions_source_wild_to_staging_column,
     # JOINS
-    elif "lineage.joins.Join" in str(type(item)):
-        G = joins_join(item)
-
-    elif "lineage.joins.CompoundJoin" in str(type(item)):
-        G = joins_compound_join(item)
-
+    "tyr.lineage.joins.Join": joins_join,
+    "tyr.lineage.joins.CompoundJoin": joins_compound_join,
     # CORE
+    "tyr.lineage.core.CaseWhen": core_case_when,
+    "tyr.lineage.core.Condition": core_condition,
+    "tyr.lineage.transformations.Limit": transformations_limit,
+    "tyr.lineage.schema.source.ReadCSV": core_transformation,
+    "tyr.lineage.schema.source.ReadGeoJson": core_transformation,
+    "tyr.lineage.schema.core._Schema": core_schema,
+}.items():
+    graph_functions.register(cls, function)
 
-    elif "lineage.core.CaseWhen" in str(type(item)):
-        G = core_case_when(item)
 
-    elif "lineage.core.Condition" in str(type(item)):
-        G = core_condition(item)
+def register(cls, function):
+    """
+    Register how instances of a lineage class, and its subclasses, are added to a network graph
 
-    elif "lineage.transformations.Limit" in str(type(item)):
-        G = transformations_limit(item)
+    :param cls: Class, or dotted path to class
+    :type cls: type|str
+    :param function: Function taking the item and returning its rx.PyDiGraph
+    :type function: callable
+    """
 
-    elif "lineage.transformations.ReadCSV" in str(type(item)):
-        G = core_transformation(item)
+    graph_functions.register(cls, function)
 
-    elif "lineage.transformations.ReadGeoJson" in str(type(item)):
-        G = core_transformation(item)
 
-    # elif "lineage.core.OrderBy" in str(type(item)):
-    #
-    #     G = core_order_by(item)
-    #
-    # elif "lineage.datamodels.DataModelSettings" in str(type(item).__bases__[0]):
-    #
-    #     G = datamodel_settings(item)
-
-    elif "lineage.schema.core._Schema" in str(type(item).__bases__[0]):
-        G = core_schema(item)
-
-    else:
-        raise ValueError("COULD NOT PARSE - ", str(type(item)))
-
-    try:
-        return G
-    except:
-        print(rf"FAILED ON {str(type(item))}")
+def item_to_graph(item):
+    return graph_functions.resolve(type(item))(item)
 
 
 class Spider:
@@ -0,0 +1,62 @@
+class TypeRegistry:
+    """
+    Maps lineage classes to the handlers used to render or graph them.
+
+    A class resolves to the handler of the nearest registered class in its MRO, so subclasses,
+    including ones defined outside tyr, use their parent's handler unless they register their own.
+    Resolved handlers are cached per class until the registry changes.
+
+    Classes can be registered by dotted path (e.g. ``"tyr.lineage.columns.Core"``) so that a
+    registry can be filled in before the lineage modules are imported.
+
+    :param name: Name used in error messages
+    :type name: str
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._handlers = {}
+        self._resolved = {}
+
+    def register(self, cls, handler):
+        """
+        Register handler for cls and its subclasses
+
+        :param cls: Class, or dotted path to class
+        :type cls: type|str
+        :param handler: Handler for instances of cls
+        :type handler: Any
+        """
+
+        if not isinstance(cls, str):
+            cls = rf"{cls.__module__}.{cls.__qualname__}"
+
+        self._handlers[cls] = handler
+        self._resolved.clear()
+
+    def resolve(self, cls):
+        """
+        Handler for cls
+
+        :param cls: Class to resolve
+        :type cls: type
+        :return: Handler registered for the nearest class in the MRO of cls
+        """
+
+        try:
+            return self._resolved[cls]
+        except KeyError:
+            pass
+
+        for parent in cls.__mro__:
+            try:
+                handler = self._handlers[rf"{parent.__module__}.{parent.__qualname__}"]
+                break
+            except KeyError:
+                pass
+        else:
+            raise ValueError(rf"{self.name} - COULD NOT PARSE - ", str(cls))
+
+        self._resolved[cls] = handler
+
+        return handler
@@ -1,234 +1,101 @@
 import units
 import time
 from . import duckdb as duckdb_syntax
+from ..registry import TypeRegistry
 
 syntax_dict = {"duckdb": duckdb_syntax}
 
 
-def selector(item):
-    function_name = None
+sql_functions = TypeRegistry("SQL")
 
+for cls, function_name in {
     # SOURCE
-
-    if "lineage.schema.source.SourceFile" in str(type(item)):
-        function_name = "source_file"
-
-    elif "lineage.schema.source.SourceColumn" in str(type(item).__bases__[0]):
-        function_name = "columns_blank"
-
+    "tyr.lineage.schema.source.SourceFile": "source_file",
     # COLUMNS
-
-    elif "lineage.core._Column" in str(type(item).__bases__[0]):
-        if "lineage.columns.Select" in str(type(item)):
-            function_name = "columns_select"
-
-        elif "lineage.columns.Core" in str(type(item)):
-            function_name = "columns_core"
-
-        elif "lineage.columns.Blank" in str(type(item)):
-            function_name = "columns_blank"
-
-        elif "lineage.columns.WildCard" in str(type(item)):
-            function_name = "columns_wild_card"
-
-        elif "lineage.columns.Core" in str(type(item).__bases__[0]):
-            function_name = "columns_core"
-
-        elif "lineage.core._Column" in str(type(item).__bases__[0]):
-            function_name = "columns_core"
-
+    "tyr.lineage.core._Column": "columns_core",
+    "tyr.lineage.columns.Select": "columns_select",
+    "tyr.lineage.columns.Core": "columns_core",
+    "tyr.lineage.columns.WildCard": "columns_wild_card",
+    "tyr.lineage.columns.Record": "columns_record",
     # VALUES
-
-    elif "lineage.core._Value" in str(type(item).__bases__[0]):
-        if "lineage.values.Varchar" in str(type(item)):
-            function_name = "values_varchar"
-
-        elif "lineage.values.Integer" in str(type(item)):
-            function_name = "values_integer"
-
-        elif "lineage.values.Float" in str(type(item)):
-            function_name = "values_float"
-
-        elif "lineage.values.Timestamp" in str(type(item)):
-            function_name = "values_timestamp"
-
-        elif "lineage.values.Date" in str(type(item)):
-            function_name = "values_date"
-
-        elif "lineage.values.WildCard" in str(type(item)):
-            function_name = "values_wildcard"
-
-        elif "lineage.values.Subquery" in str(type(item)):
-            function_name = "values_subquery"
-
-        elif "lineage.values.Null" in str(type(item)):
-            function_name = "values_null"
-
-        elif "lineage.values.Interval" in str(type(item)):
-            function_name = "values_interval"
-
-        elif "lineage.values.List" in str(type(item)):
-            function_name = "values_list"
-
-        elif "lineage.values.GeoCoordinate" in str(type(item)):
-            function_name = "values_list"
-
-        elif "lineage.values.Datatype" in str(type(item)):
-            function_name = "values_datatype"
-
-        elif "lineage.values.Tuple" in str(type(item)):
-            function_name = "values_tuple"
-
-        elif "lineage.values.Boolean" in str(type(item)):
-            function_name = "values_boolean"
-
-        elif "lineage.values.Struct" in str(type(item)):
-            function_name = "values_struct"
-
-        elif "lineage.values.Decimal" in str(type(item)):
-            function_name = "values_decimal"
-
-        elif "lineage.values.Raw" in str(type(item)):
-            function_name = "values_raw"
-
+    "tyr.lineage.values.Varchar": "values_varchar",
+    "tyr.lineage.values.Integer": "values_integer",
+    "tyr.lineage.values.Float": "values_float",
+    "tyr.lineage.values.Timestamp": "values_timestamp",
+    "tyr.lineage.values.Date": "values_date",
+    "tyr.lineage.values.WildCard": "values_wildcard",
+    "tyr.lineage.values.Subquery": "values_subquery",
+    "tyr.lineage.values.Null": "values_null",
+    "tyr.lineage.values.Interval": "values_interval",
+    "tyr.lineage.values.List": "values_list",
+    "tyr.lineage.values.GeoCoordinate": "values_list",
+    "tyr.lineage.values.Datatype": "values_datatype",
+    "tyr.lineage.values.Tuple": "values_tuple",
+    "tyr.lineage.values.Boolean": "values_boolean",
+    "tyr.lineage.values.Struct": "values_struct",
+    "tyr.lineage.values.Decimal": "values_decimal",
+    "tyr.lineage.values.Raw": "values_raw",
     # UNITS
-
-    elif str(type(item)) is units.core.Unit:
-        function_name = "core_unit"
-
+    "units.core.Unit": "core_unit",
     # TABLES
-
-    elif "lineage.core._Table" in str(type(item).__bases__[0]):
-        if "lineage.tables.Core" in str(type(item)):
-            function_name = "tables_core"
-
-        elif "lineage.tables.Select" in str(type(item)):
-            function_name = "tables_select"
-
-        elif "lineage.tables.Subquery" in str(type(item)):
-            function_name = "tables_subquery"
-
-        elif "lineage.tables.Temp" in str(type(item)):
-            function_name = "tables_temp"
-
-        elif "lineage.tables.FromRecords" in str(type(item)):
-            function_name = "tables_from_records"
-
-        elif "lineage.tables.Union" in str(type(item)):
-            function_name = "unions_union"
-
-        elif "lineage.tables.Core" in str(type(item).__bases__[0]):
-            function_name = "tables_core"
-
-        elif "lineage.core._Table" in str(type(item).__bases__[0]):
-            function_name = "tables_core"
-
+    "tyr.lineage.core._Table": "tables_core",
+    "tyr.lineage.tables.Core": "tables_core",
+    "tyr.lineage.tables.Select": "tables_select",
+    "tyr.lineage.tables.Subquery": "tables_subquery",
+    "tyr.lineage.tables.Temp": "tables_temp",
+    "tyr.lineage.tables.FromRecords": "tables_from_records",
+    "tyr.lineage.tables.Union": "unions_union",
     # FUNCTIONS
-
-    elif "lineage.core._Function" in str(type(item).__bases__[0]):
-        if not any(
-            [
-                bh_type in str(type(item))
-                for bh_type in [
-                    "lineage.functions.data_type.ToInterval",
-                    "lineage.functions.array.ListExtract",
-                    "lineage.functions.json.JSONExtract",
-                    "lineage.functions.window.RowNumber",
-                    "lineage.functions.union.UnionColumn",
-                    "lineage.functions.string.StringExtract",
-                    "lineage.functions.utility.SourceWildToStagingColumn",
-                ]
-            ]
-        ):
-            function_name = "core_function"
-        elif "lineage.functions.data_type.ToInterval" in str(type(item)):
-            function_name = "functions_to_interval"
-        elif "lineage.functions.array.ListExtract" in str(type(item)):
-            function_name = "functions_list_extract"
-        elif "lineage.functions.json.JSONExtract" in str(type(item)):
-            function_name = "functions_json_extract"
-        elif "lineage.functions.window.RowNumber" in str(type(item)):
-            function_name = "functions_row_number"
-        elif "lineage.functions.union.UnionColumn" in str(type(item)):
-            function_name = "unions_union_column"
-        elif "lineage.functions.string.StringExtract" in str(type(item)):
-            function_name = "functions_list_extract"
-        elif "lineage.functions.utility.SourceWildToStagingColumn" in str(type(item)):
-            function_name = "functions_source_wild_to_staging"
-
+    "tyr.lineage.core._Function": "core_function",
+    "tyr.lineage.functions.data_type.ToInterval": "functions_to_interval",
+    "tyr.lineage.functions.array.ListExtract": "functions_list_extract",
+    "tyr.lineage.functions.json.JSONExtract": "functions_json_extract",
+    "tyr.lineage.functions.window.RowNumber": "functions_row_number",
+    "tyr.lineage.functions.union.UnionColumn": "unions_union_column",
+    "tyr.lineage.functions.string.StringExtract": "functions_list_extract",
+    "tyr.lineage.functions.utility.SourceWildToStagingColumn": "functions_source_wild_to_staging",
     # EXPRESSIONS
-    elif "lineage.core._Expression" in str(type(item).__bases__[0]):
-        function_name = "core_expression"
-
+    "tyr.lineage.core._Expression": "core_expression",
     # OPERATORS
-    elif "lineage.core._Operator" in str(type(item).__bases__[0]):
-        function_name = "core_operator"
-
+    "tyr.lineage.core._Operator": "core_operator",
     # JOINS
-    elif "lineage.joins.Join" in str(type(item)):
-        function_name = "joins_join"
-
-    elif "lineage.joins.CompoundJoin" in str(type(item)):
-        function_name = "joins_compound_join"
-
+    "tyr.lineage.joins.Join": "joins_join",
+    "tyr.lineage.joins.CompoundJoin": "joins_compound_join",
     # CORE
-    elif "lineage.core.CaseWhen" in str(type(item)):
-        function_name = "core_case_when"
-
-    elif "lineage.core.Condition" in str(type(item)):
-        function_name = "core_condition"
-
-    elif "lineage.core.OrderBy" in str(type(item)):
-        function_name = "core_order_by"
-
-    elif "lineage.core.PartitionBy" in str(type(item)):
-        function_name = "core_partition_by"
-
-    elif "lineage.core.AppendOperator" in str(type(item)):
-        function_name = "core_append_operator"
-
-    elif "lineage.schema.core._SchemaSettings" in str(type(item).__bases__[0]):
-        function_name = "schema_settings"
-
-    elif "lineage.schema.core._Schema" in str(type(item).__bases__[0]):
-        function_name = "core_schema"
-
-    elif "lineage.core.RecordList" in str(type(item)):
-        function_name = "core_record_list"
-
-    elif "lineage.core.RecordGenerator" in str(type(item)):
-        function_name = "core_record_generator"
-
-    elif "lineage.core.Record" in str(type(item)):
-        function_name = "core_record"
-
+    "tyr.lineage.core.CaseWhen": "core_case_when",
+    "tyr.lineage.core.Condition": "core_condition",
+    "tyr.lineage.core.OrderBy": "core_order_by",
+    "tyr.lineage.core.PartitionBy": "core_partition_by",
+    "tyr.lineage.core.AppendOperator": "core_append_operator",
+    "tyr.lineage.schema.core._SchemaSettings": "schema_settings",
+    "tyr.lineage.schema.core._Schema": "core_schema",
+    "tyr.lineage.core.RecordList": "core_record_list",
+    "tyr.lineage.core.RecordGenerator": "core_record_generator",
+    "tyr.lineage.core.Series": "core_series",
+    "tyr.lineage.core.Record": "core_record",
     # TRANSFORMATIONS
-    elif "lineage.transformations.Limit" in str(type(item)):
-        function_name = "transformations_limit"
-
-    elif "lineage.schema.source.ReadCSV" in str(type(item)):
-        function_name = "core_transformation"
+    "tyr.lineage.transformations.Limit": "transformations_limit",
+    "tyr.lineage.schema.source.ReadCSV": "core_transformation",
+    "tyr.lineage.schema.source.ReadGeoJson": "core_transformation",
+}.items():
+    sql_functions.register(cls, function_name)
 
-    elif "lineage.schema.source.ReadGeoJson" in str(type(item)):
-        function_name = "core_transformation"
 
-    # DATAFRAMES
-    elif "lineage.dataframes.DataFrame" in str(type(item)):
-        function_name = "dataframes_data_frame"
+def register(cls, function):
+    """
+    Register how instances of a lineage class, and its subclasses, are rendered to SQL
 
-    elif "lineage.dataframes.DataFrameColumn" in str(type(item)):
-        function_name = "dataframes_data_frame_column"
+    :param cls: Class, or dotted path to class
+    :type cls: type|str
+    :param function: Name of the rendering function in the syntax module, or a function taking the item and returning its SQL
+    :type function: str|callable
+    """
 
-    elif "lineage.dataframes.LambdaOutput" in str(type(item)):
-        function_name = "dataframes_lambda_output"
+    sql_functions.register(cls, function)
 
-    else:
-        raise ValueError("COULD NOT PARSE - ", str(type(item)))
 
-    if function_name:
-        return function_name
-    else:
-        raise ValueError("COULD NOT PARSE - ", str(type(item)))
+def selector(item):
+    return sql_functions.resolve(type(item))
 
 
 class Syntax:
@@ -237,7 +104,12 @@ class Syntax:
         self.syntax = syntax_dict[name]
 
     def item_to_sql(self, item):
-        return self.syntax.__dict__[selector(item)](item)
+        function = selector(item)
+
+        if isinstance(function, str):
+            function = self.syntax.__dict__[function]
+
+        return function(item)
 
 
 class DuckDB(Syntax):
@@ -195,7 +195,7 @@ def tables_core(item, ctes=True):
                     else rf"""{table.name} AS {table.sql}"""
                 )
                 for table in item.ctes.list_tables_()
-                if table not in item.source.ctes.list_tables_()
+                if all(table is not cte for cte in item.source.ctes.list_tables_())
             ]
         )
 
@@ -204,11 +204,16 @@ def tables_core(item, ctes=True):
         base_sql = rf"""SELECT {"DISTINCT" if item.distinct else ""} {', '.join([columns_core(column, alias=True) if "lineage.columns.Core" in str(type(column)) else column.sql for column in item.columns.list_columns_()])}"""
 
     if item.source:
-        if any(
-            [
-                "lineage.core.RecordGenerator" in str(type(item.source)),
-                "lineage.core.RecordList" in str(type(item.source)),
-            ]
+        # Imported here, as lineage.core imports this module through the interpreter
+        from ..lineage import core as lineage_core
+
+        if isinstance(
+            item.source,
+            (
+                lineage_core.RecordGenerator,
+                lineage_core.RecordList,
+                lineage_core.Series,
+            ),
         ):
             base_sql += rf""" FROM ({item.source.sql}) {item.source.name}({', '.join([column for column in item.source.columns.list_names_()])})"""
         elif "lineage.tables.Union" in str(type(item.source)):
@@ -462,19 +467,21 @@ def core_record(item):
 
 
 def core_record_list(item):
+    if item.bulk:
+        return rf"""SELECT * FROM {item.relation}"""
+
     return rf"""SELECT * FROM VALUES {', '.join([record.sql for record in item.records])} {item.name}({', '.join([column for column in item.columns.list_names_()])})"""
 
 
 def core_record_generator(item):
-    base_sql = "SELECT * FROM VALUES "
+    if item.bulk:
+        return rf"""SELECT * FROM {item.relation}"""
 
-    for record in item.generator:
-        base_sql += record.sql + ", "
+    return rf"""SELECT * FROM VALUES {', '.join([record.sql for record in item.generator])} {item.name}({', '.join([column for column in item.columns.list_names_()])})"""
 
-    return (
-        base_sql.rstrip(", ")
-        + rf" {item.name}({', '.join([column for column in item.columns.list_names_()])})"
-    )
+
+def core_series(item):
+    return rf"""SELECT {item.start.sql} + range * {item.step.sql} AS {item.columns.list_names_()[0]} FROM range({item.n_records})"""
 
 
 # UNIONS
@@ -494,7 +501,7 @@ def unions_union(item):
                     else rf"""{table.name} AS {table.sql}"""
                 )
                 for table in item.ctes.list_tables_()
-                if table not in item.source.ctes.list_tables_()
+                if all(table is not cte for cte in item.source.ctes.list_tables_())
             ]
         )
 
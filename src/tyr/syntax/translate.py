@@ -1,10 +1,11 @@
-import pandas as pd
 import re
 import os
 from importlib import resources
 
 
 def timestamp(timestamp_format, output_syntax):
+    import pandas as pd
+
     with resources.path("syntax.translations", "timestamp.tsv") as df:
         mappings = pd.read_csv(df, sep="\t")
 
@@ -0,0 +1,362 @@
+import gc
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import pytest
+import rustworkx as rx
+import tyr
+
+# Wall-clock comparisons depend on the machine and its load, so only run when asked
+benchmark = pytest.mark.skipif(
+    not os.environ.get("TYR_BENCHMARKS"),
+    reason="wall-clock benchmark, set TYR_BENCHMARKS=1 to run",
+)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def build_lineage_graph(n_nodes):
+    # Chains of parents as built by tables and functions, merged into one graph in chunks
+    graph = tyr.lineage.core.LineageGraph(rx.PyDiGraph())
+    graph.add_node({"label": "root", "type": "schema"})
+
+    chunk = tyr.lineage.core.LineageGraph(rx.PyDiGraph())
+    chunk.add_node({"label": "root", "type": "schema"})
+
+    for i in range(1, n_nodes):
+        chunk.add_parent(0, {"label": rf"node {i}", "type": "column"}, {})
+
+        if i % 1000 == 0:
+            graph.union([chunk])
+            chunk = tyr.lineage.core.LineageGraph(rx.PyDiGraph())
+            chunk.add_node({"label": "root", "type": "schema"})
+
+    graph.union([chunk])
+
+    assert graph.rx_graph.num_nodes() == n_nodes
+    assert graph.node_index_from_data({"label": "node 1", "type": "column"}) is not None
+
+
+def test_lineage_graph_build_is_linear():
+    small = timed(build_lineage_graph, 10_000)
+    large = timed(build_lineage_graph, 100_000)
+
+    # 10x the nodes, allowing generous headroom over 10x the time
+    assert large < small * 25
+
+
+def build_table_chain(n_tables):
+    # Each table selects every column of the one before, so all tables share their ancestors
+    table = tyr.lineage.tables.Core(
+        name="t0",
+        columns=tyr.lineage.core.ColumnList(
+            [
+                tyr.lineage.columns.Core(
+                    source=tyr.lineage.values.Integer(i), name=rf"c{i}"
+                )
+                for i in range(10)
+            ]
+        ),
+    )
+
+    for i in range(1, n_tables):
+        table = tyr.lineage.tables.Core(
+            name=rf"t{i}",
+            source=tyr.lineage.tables.Select(table),
+            columns=tyr.lineage.macros.columns.select_all(table),
+        )
+
+    return table
+
+
+def test_root_graph_shared_ancestors():
+    table = build_table_chain(200)
+
+    first = timed(table.root_graph)
+    cached = timed(table.root_graph)
+
+    assert first < 10
+    assert cached < first
+
+
+def count_nodes():
+    return sum(
+        1 for item in gc.get_objects() if isinstance(item, tyr.lineage.core._Node)
+    )
+
+
+def test_staging_memory_per_node(record_testsuite_property):
+    source = tyr.lineage.schema.source.Source(
+        settings=tyr.lineage.schema.source.SourceSettings(
+            file_metadata=tyr.lineage.schema.source.read_file_metadata(
+                os.path.join(
+                    os.path.dirname(__file__), "configurations/file_metadata.tsv"
+                )
+            ),
+            expected_column_metadata=tyr.lineage.schema.source.read_column_metadata(
+                os.path.join(
+                    os.path.dirname(__file__), "configurations/column_metadata.tsv"
+                )
+            ),
+        )
+    )
+
+    # Load the SQL renderer before measuring
+    source.tables.list_tables_()[0].sql
+
+    gc.collect()
+    existing = count_nodes()
+    tracemalloc.start()
+
+    staging = tyr.lineage.schema.staging.Staging(
+        source=source,
+        settings=tyr.lineage.schema.staging.StagingSettings(name="staging"),
+    )
+    built = tracemalloc.get_traced_memory()[0]
+
+    for table in staging.tables.list_tables_():
+        table.sql
+
+    staging.root_graph()
+    rendered = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+
+    gc.collect()
+    n_nodes = count_nodes() - existing
+
+    assert n_nodes > 0
+
+    # Reported in the test results, e.g. with --junitxml. Nodes with their bookkeeping in the
+    # instance dict and node data built eagerly took about 1,300 bytes each, about 500 with
+    # bookkeeping in slots and node data built on demand.
+    bytes_per_node = built / n_nodes
+    record_testsuite_property("staging_bytes_per_node", round(bytes_per_node))
+
+    assert bytes_per_node < 800, rf"{bytes_per_node:.0f} bytes per node"
+
+    # SQL and the root graph stay within a fixed multiple of the lineage they are built from
+    assert rendered < built * 10
+
+
+def build_column_list(n_columns):
+    columns = tyr.lineage.core.ColumnList([])
+
+    for i in range(n_columns):
+        columns.add_(
+            tyr.lineage.columns.Core(
+                source=tyr.lineage.values.Integer(i), name=rf"c{i}"
+            )
+        )
+
+    for i in range(100):
+        columns.list_columns_(filter_regex=r"^c1")
+        assert rf"c{i % n_columns}" in columns
+
+    return columns
+
+
+def test_column_list_lookups():
+    small = timed(build_column_list, 1_000)
+    large = timed(build_column_list, 10_000)
+
+    assert large < small * 25
+
+    columns = build_column_list(10)
+
+    assert columns.list_names_(filter_regex=r"^c1") == ["c1"]
+
+    columns.add_(
+        tyr.lineage.columns.Core(source=tyr.lineage.values.Integer(10), name="c10")
+    )
+
+    assert columns.list_names_(filter_regex=r"^c1") == ["c1", "c10"]
+
+
+def test_dispatch_per_node():
+    table = build_table_chain(20)
+    nodes = [
+        node["sql"].node
+        for node in table.root_graph().rx_graph.nodes()
+        if "sql" in node
+    ]
+
+    start = time.perf_counter()
+
+    for i in range(100):
+        for node in nodes:
+            tyr.syntax.core.selector(node)
+            tyr.network.graph_functions.resolve(type(node))
+
+    per_node = (time.perf_counter() - start) / (100 * len(nodes))
+
+    assert per_node < 1e-4
+
+
+def import_time(statement):
+    # A fresh interpreter per measurement, as for a CLI job
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            rf"import sys, time; start = time.perf_counter(); {statement}; "
+            rf"print(time.perf_counter() - start, ','.join(sorted(sys.modules)))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    return float(output[0]), output[1].split(",")
+
+
+def test_import_modules():
+    _, package_modules = import_time("import tyr")
+    _, lineage_modules = import_time("import tyr.lineage")
+
+    for module in ["pandas", "rustworkx", "duckdb", "networkx", "pythonjsonlogger"]:
+        assert module not in package_modules
+
+    for module in ["duckdb", "networkx", "pythonjsonlogger"]:
+        assert module not in lineage_modules
+
+
+@benchmark
+def test_import_time():
+    package, _ = import_time("import tyr")
+    lineage, _ = import_time("import tyr.lineage")
+
+    assert package < 0.05
+    assert lineage < 1
+
+
+def render_staging(sql_format):
+    tyr.lineage.core.set_sql_format(sql_format)
+
+    try:
+        staging = tyr.lineage.schema.staging.Staging(
+            source=tyr.lineage.schema.source.Source(
+                settings=tyr.lineage.schema.source.SourceSettings(
+                    file_metadata=tyr.lineage.schema.source.read_file_metadata(
+                        os.path.join(
+                            os.path.dirname(__file__),
+                            "configurations/file_metadata.tsv",
+                        )
+                    ),
+                    expected_column_metadata=tyr.lineage.schema.source.read_column_metadata(
+                        os.path.join(
+                            os.path.dirname(__file__),
+                            "configurations/column_metadata.tsv",
+                        )
+                    ),
+                )
+            ),
+            settings=tyr.lineage.schema.staging.StagingSettings(name="staging"),
+        )
+
+        start = time.perf_counter()
+        sql = [table.sql for table in staging.tables.list_tables_()]
+
+        return time.perf_counter() - start, sql
+    finally:
+        tyr.lineage.core.set_sql_format("pretty")
+
+
+def test_compact_sql(monkeypatch):
+    import sqlparse
+
+    reindented = []
+    sqlparse_format = sqlparse.format
+
+    def format(sql, **options):
+        if options.get("reindent"):
+            reindented.append(sql)
+
+        return sqlparse_format(sql, **options)
+
+    monkeypatch.setattr(sqlparse, "format", format)
+
+    _, compact_sql = render_staging("compact")
+
+    # Compact SQL is left as generated
+    assert reindented == []
+
+    _, pretty_sql = render_staging("pretty")
+
+    assert reindented != []
+
+    # Same statements, only the whitespace differs
+    assert len(pretty_sql) == len(compact_sql)
+
+    for pretty_table, compact_table in zip(pretty_sql, compact_sql):
+        assert pretty_table.split() != [] and "".join(pretty_table.split()) == "".join(
+            compact_table.split()
+        )
+
+
+@benchmark
+def test_compact_sql_time():
+    pretty, _ = render_staging("pretty")
+    compact, _ = render_staging("compact")
+
+    assert compact < pretty
+
+
+def test_read_column_metadata(tmp_path):
+    import pandas as pd
+
+    path = os.path.join(os.path.dirname(__file__), "configurations/column_metadata.tsv")
+    column_metadata = pd.read_csv(path, sep="\t")
+
+    # 100k column rows, as a catalog of many datasets
+    pd.concat(
+        [
+            column_metadata.assign(dataset=column_metadata["dataset"] + rf"_{i}")
+            for i in range(100_000 // len(column_metadata) + 1)
+        ]
+    ).head(100_000).to_csv(tmp_path / "column_metadata.tsv", sep="\t", index=False)
+
+    start = time.perf_counter()
+    catalog = tyr.lineage.schema.source.read_column_metadata(
+        str(tmp_path / "column_metadata.tsv")
+    )
+    duration = time.perf_counter() - start
+
+    assert sum(len(columns) for columns in catalog.values()) == 100_000
+    assert duration < 20
+
+    # Same objects as built one row at a time
+    rows = pd.DataFrame(
+        {
+            "schema": ["staging", "staging"],
+            "dataset": ["a", "a"],
+            "column_name": ["speed", "status"],
+            "column_alias": ["speed", "status"],
+            "var_type": ["numeric", "categorical"],
+            "data_type": ["FLOAT", "VARCHAR"],
+            "on_null": ["PASS", "PASS"],
+            "is_primary_key": [False, False],
+            "is_event_time": [False, False],
+            "filter_values": ["[]", '["x"]'],
+            "on_filter": ["PASS", "SKIP"],
+            "regex": ["", ""],
+            "source_unit": ["km", ""],
+            "target_unit": ["", ""],
+            "scale_factor": ["", ""],
+            "precision": ["", ""],
+            "ordinal_position": [0, 1],
+        }
+    )
+    columns = tyr.lineage.schema.source.read_column_metadata_frame(rows)["a"]
+
+    for index, row in rows.iterrows():
+        expected = tyr.lineage.schema.source.ColumnMetadata(row)
+
+        assert columns[index]._node_data == expected._node_data
+        assert columns[index].filter_values == expected.filter_values
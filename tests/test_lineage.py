@@ -1,5 +1,8 @@
+import copy
 import os
+import pickle
 import tyr
+import units
 
 
 def init_connection():
@@ -134,3 +137,1087 @@ def test_groupby():
     assert conn.execute(test.sql).df().equals(conn.execute(query).df())
 
     conn.close()
+
+
+def test_sql_invalidation():
+    test = tyr.lineage.tables.Core(
+        name="sessions",
+        source=tyr.lineage.tables.Select(staging.tables.sessions),
+        columns=tyr.lineage.core.ColumnList(
+            [
+                tyr.lineage.columns.Core(
+                    source=tyr.lineage.functions.math.Multiply(
+                        tyr.lineage.values.Integer(7), tyr.lineage.values.Integer(2)
+                    ),
+                    name="value",
+                )
+            ]
+        ),
+    )
+
+    assert "MULTIPLY(7, 2)" in test.sql
+
+    test.columns.value.source.args[0].value = 9
+
+    assert "MULTIPLY(9, 2)" in test.sql
+
+    test.add_column(
+        tyr.lineage.columns.Core(source=tyr.lineage.values.Integer(5), name="other")
+    )
+
+    assert "5 AS other" in test.sql
+
+
+def test_structural_keys():
+    def build():
+        return tyr.lineage.expressions.Equal(
+            tyr.lineage.columns.Select(staging.tables.sessions.columns.session_key),
+            tyr.lineage.values.Integer(1),
+        )
+
+    left = build()
+    right = build()
+
+    assert left is not right
+    assert left == right
+    assert hash(left) == hash(right)
+    assert tyr.lineage.core.intern(left) is tyr.lineage.core.intern(right)
+    assert left.operator is right.operator
+
+    graph = tyr.lineage.core.LineageGraph(left.graph.rx_graph.copy())
+    graph.union([right.graph])
+
+    assert len(graph.rx_graph.node_indices()) == len(left.graph.rx_graph.node_indices())
+
+    right.right.value = 2
+
+    assert left != right
+
+    # Interned nodes are shared, so cannot be modified
+    try:
+        left.right = tyr.lineage.values.Integer(2)
+    except ValueError:
+        pass
+    else:
+        assert False
+
+    # Nodes of different macro groups are interned separately
+    grouped = tyr.lineage.values.Integer(1, macro_group="group")
+
+    assert tyr.lineage.core.intern(grouped) is grouped
+    assert tyr.lineage.core.intern(tyr.lineage.values.Integer(1)) is not grouped
+
+    # Keys are the same in every process, so objects are never keyed by their id
+    try:
+        tyr.lineage.core.structural_key(tyr.lineage.values.Raw(object()))
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def test_column_ownership():
+    column = tyr.lineage.columns.Core(source=tyr.lineage.values.Integer(1), name="one")
+
+    first = tyr.lineage.tables.Core(
+        name="first", columns=tyr.lineage.core.ColumnList([column])
+    )
+    second = tyr.lineage.tables.Core(
+        name="second", columns=tyr.lineage.core.ColumnList([column])
+    )
+    isolated = tyr.lineage.tables.Core(
+        name="isolated", columns=tyr.lineage.core.ColumnList([copy.deepcopy(column)])
+    )
+
+    assert "1 AS one" in first.sql
+
+    # Every table owns its own copy of the column
+    column.source = tyr.lineage.values.Integer(2)
+
+    assert "1 AS one" in first.sql
+    assert "1 AS one" in second.sql
+    assert "1 AS one" in isolated.sql
+    assert first.columns.one.current_table is first
+    assert column.current_table is None
+
+    # Columns changed through the table still change the table
+    first.columns.one.source = tyr.lineage.values.Integer(3)
+
+    assert "3 AS one" in first.sql
+    assert "1 AS one" in second.sql
+
+
+def test_root_graph():
+    sessions = staging.tables.sessions
+    graph = sessions.root_graph().rx_graph
+    labels = [node["label"] for node in graph.nodes()]
+
+    assert "staging.sessions" in labels
+    assert "source.sessions" in labels
+
+    test = tyr.lineage.tables.Core(
+        name="sessions",
+        source=tyr.lineage.tables.Select(sessions),
+        columns=tyr.lineage.macros.columns.select_all(sessions),
+    )
+
+    n_nodes = test.root_graph().rx_graph.num_nodes()
+
+    test.add_column(
+        tyr.lineage.columns.Core(source=tyr.lineage.values.Integer(5), name="other")
+    )
+
+    graph = test.root_graph().rx_graph
+
+    assert graph.num_nodes() == n_nodes + 2
+    assert "other" in [node["label"] for node in graph.nodes()]
+
+
+def test_shared_columns():
+    sessions = staging.tables.sessions
+    columns = tyr.lineage.macros.columns.select_all(sessions)
+
+    first = tyr.lineage.tables.Core(
+        name="first", source=tyr.lineage.tables.Select(sessions), columns=columns
+    )
+    second = tyr.lineage.tables.Core(
+        name="second", source=tyr.lineage.tables.Select(sessions), columns=columns
+    )
+
+    # Each table gets its own copies, the caller's list is left as it is
+    assert first.columns is not columns
+    assert second.columns is not columns
+    assert first.columns.list_columns_()[0] is not columns.list_columns_()[0]
+    assert columns.list_columns_()[0].current_table is not first
+
+    for column in first.columns.list_columns_():
+        assert column.current_table is first
+
+    for column in second.columns.list_columns_():
+        assert column.current_table is second
+
+
+def test_column_list_unit_filter():
+    metre = units.core.Unit("metre")
+    columns = tyr.lineage.core.ColumnList(
+        [
+            tyr.lineage.columns.Core(source=tyr.lineage.values.Integer(1), name="a"),
+            tyr.lineage.columns.Core(source=tyr.lineage.values.Integer(2), name="b"),
+        ]
+    )
+
+    assert columns.list_names_(filter_unit=metre) == []
+
+    # Filter results follow changes to the columns of the list
+    columns.b.unit = metre
+
+    assert columns.list_names_(filter_unit=metre) == ["b"]
+
+    delattr(columns, "b")
+    columns.order.remove("b")
+
+    assert columns.list_names_(filter_unit=metre) == []
+
+
+def test_custom_sql_function():
+    class Percentage(tyr.lineage.values.Integer):
+        pass
+
+    # Subclasses defined outside tyr render as their nearest registered parent
+    assert Percentage(5).sql == tyr.lineage.values.Integer(5).sql
+
+    tyr.syntax.core.register(Percentage, lambda item: rf"{item.value} / 100")
+
+    assert Percentage(5).sql == "5 / 100"
+
+
+def test_deep_sql():
+    tyr.lineage.core.set_sql_format("compact")
+
+    try:
+        value = tyr.lineage.values.Integer(0)
+        chain = []
+
+        for i in range(2000):
+            value = tyr.lineage.functions.math.Add(value, tyr.lineage.values.Integer(1))
+            chain.append(value)
+
+        assert value.sql == "ADD(" * 2000 + "0" + ", 1)" * 2000
+
+        # Only the node asked for keeps its SQL, not every input in the chain
+        assert not any(hasattr(item, "_compact_sql") for item in chain[:-1])
+    finally:
+        tyr.lineage.core.set_sql_format("pretty")
+
+
+def test_bulk_records():
+    def generator(indices, args):
+        for i in indices:
+            yield tyr.lineage.core.Record(
+                {
+                    tyr.lineage.columns.Record(
+                        name="id", data_type=tyr.lineage.values.Datatype("INTEGER")
+                    ): tyr.lineage.values.Integer(i),
+                    tyr.lineage.columns.Record(
+                        name="label", data_type=tyr.lineage.values.Datatype("VARCHAR")
+                    ): tyr.lineage.values.Varchar(rf"record {i}"),
+                }
+            )
+
+    table = tyr.lineage.tables.FromRecords(
+        name="seed",
+        source=tyr.lineage.core.RecordGenerator(
+            name="seed", generator=generator, n_records=2500, bulk=True
+        ),
+    )
+
+    # The records are loaded separately, so the SQL does not grow with them
+    assert "record 1" not in table.sql
+
+    conn = tyr.database.connections.Connection(
+        name="test", syntax="duckdb", database=":memory:"
+    )
+
+    for records in tyr.database.core.bulk_records(table):
+        tyr.database.core.load_records(records, conn, batch_size=1000)
+
+    result = conn.execute(
+        rf"SELECT COUNT(*) AS n, MAX(id) AS max_id FROM ({table.sql})"
+    ).df()
+
+    assert result.n[0] == 2500
+    assert result.max_id[0] == 2499
+
+
+def test_bulk_records_same_name():
+    def generator(indices, args):
+        for i in indices:
+            yield tyr.lineage.core.Record(
+                {
+                    tyr.lineage.columns.Record(
+                        name="id", data_type=tyr.lineage.values.Datatype("INTEGER")
+                    ): tyr.lineage.values.Integer(i + args["offset"])
+                }
+            )
+
+    schema = tyr.lineage.schema.project.Project(
+        settings=tyr.lineage.schema.project.ProjectSettings(name="project")
+    )
+
+    # Both sources are named seed, but hold different records
+    for name, offset in [("a", 0), ("b", 10)]:
+        schema.add_table(
+            tyr.lineage.tables.FromRecords(
+                name=name,
+                source=tyr.lineage.core.RecordGenerator(
+                    name="seed",
+                    generator=generator,
+                    n_records=3,
+                    generator_args={"offset": offset},
+                    bulk=True,
+                ),
+            )
+        )
+
+    assert schema.tables["a"].source.relation != schema.tables["b"].source.relation
+
+    conn = tyr.database.connections.Connection(
+        name="test", syntax="duckdb", database=":memory:"
+    )
+
+    tyr.database.core.create_tables(schema, conn)
+
+    for name, ids in [("a", [0, 1, 2]), ("b", [10, 11, 12])]:
+        assert (
+            conn.execute(rf"SELECT id FROM project.{name} ORDER BY id")
+            .df()["id"]
+            .tolist()
+            == ids
+        )
+
+
+def test_date_vector_table():
+    table = tyr.lineage.macros.tables.date_vector_table(
+        name="dates",
+        start_time=tyr.lineage.values.Timestamp("2024-01-31 00:00:00"),
+        n_records=3,
+        interval=tyr.lineage.values.Interval(1, units.core.Unit("month")),
+    )
+
+    conn = tyr.database.connections.Connection(
+        name="test", syntax="duckdb", database=":memory:"
+    )
+
+    dates = conn.execute(table.sql).df()["date"].dt.strftime("%Y-%m-%d").tolist()
+
+    assert dates == ["2024-01-31", "2024-02-29", "2024-03-31"]
+
+
+def test_compile_artifact(tmp_path):
+    metadata = tmp_path / "metadata.tsv"
+    metadata.write_text("name\tvalue\none\t1\n")
+
+    compiled = []
+
+    def build_schema():
+        compiled.append(True)
+
+        schema = tyr.lineage.schema.project.Project(
+            settings=tyr.lineage.schema.project.ProjectSettings(name="project")
+        )
+        schema.add_table(
+            tyr.lineage.tables.Core(
+                name="numbers",
+                columns=tyr.lineage.core.ColumnList(
+                    [
+                        tyr.lineage.columns.Core(
+                            source=tyr.lineage.values.Integer(1), name="one"
+                        )
+                    ]
+                ),
+            )
+        )
+        schema.add_table(
+            tyr.lineage.tables.Core(
+                name="derived",
+                source=tyr.lineage.tables.Select(schema.tables["numbers"]),
+                columns=tyr.lineage.macros.columns.select_all(schema.tables["numbers"]),
+            )
+        )
+
+        return schema
+
+    conn = tyr.database.connections.Connection(
+        name="test", syntax="duckdb", database=":memory:"
+    )
+    path = str(tmp_path / "project.json")
+
+    for i in range(2):
+        artifact = tyr.database.artifact.build(
+            path, inputs=[str(metadata)], schema_factory=build_schema, conn=conn
+        )
+
+    # The second build executes the saved artifact without building the schema
+    assert len(compiled) == 1
+    assert artifact["build_order"] == ["numbers", "derived"]
+    assert artifact["tables"]["derived"]["depends_on"] == ["numbers"]
+    assert conn.execute("SELECT one FROM project.derived").df()["one"].tolist() == [1]
+
+    # Tables built from the same compiled fingerprint are kept
+    report = tyr.database.artifact.execute_artifact(artifact, conn, overwrite=False)
+
+    assert report.empty
+
+    # Artifacts compiled by another version of tyr, or by other code, are compiled again
+    artifact["tyr_version"] = "0.0.0"
+    tyr.database.artifact.save_artifact(artifact, path)
+
+    assert tyr.database.artifact.load_artifact(path, inputs=[str(metadata)]) is None
+
+    tyr.database.artifact.build(
+        path, inputs=[str(metadata)], schema_factory=build_schema, conn=conn
+    )
+
+    assert len(compiled) == 2
+    assert (
+        tyr.database.artifact.load_artifact(
+            path, inputs=[str(metadata)], schema_factory=lambda: None
+        )
+        is None
+    )
+
+    metadata.write_text("name\tvalue\none\t2\n")
+
+    assert tyr.database.artifact.load_artifact(path, inputs=[str(metadata)]) is None
+
+    # Files read are checked when the artifact is executed, not when it is compiled
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "a.csv").write_text("one\n1\n")
+
+    source = tyr.lineage.schema.source.Source(
+        settings=tyr.lineage.schema.source.SourceSettings(
+            file_metadata={
+                "numbers": tyr.lineage.schema.source.FileMetadata(
+                    {
+                        "dataset": "numbers",
+                        "file_regex": str(data / "*.csv"),
+                        "delim": "c",
+                        "distinct": False,
+                        "schema": "source",
+                    }
+                )
+            },
+            expected_column_metadata={"numbers": {}},
+        )
+    )
+    artifact = tyr.database.artifact.compile_schema(source)
+
+    tyr.database.artifact.execute_artifact(artifact, conn)
+
+    assert tyr.database.artifact.execute_artifact(artifact, conn, overwrite=False).empty
+
+    (data / "b.csv").write_text("one\n2\n")
+
+    report = tyr.database.artifact.execute_artifact(artifact, conn, overwrite=False)
+
+    assert report["table"].tolist() == ["numbers"]
+    assert len(conn.execute("SELECT * FROM source.numbers").df()) == 2
+
+    # Fields are length prefixed, so moving bytes between a file name and its contents differs
+    (tmp_path / "a").write_text("bc")
+    (tmp_path / "ab").write_text("c")
+
+    assert tyr.database.artifact.hash_inputs(
+        [str(tmp_path / "a")]
+    ) != tyr.database.artifact.hash_inputs([str(tmp_path / "ab")])
+
+
+def test_schema_storage(tmp_path):
+    schema = tyr.lineage.schema.project.Project(
+        settings=tyr.lineage.schema.project.ProjectSettings(name="project")
+    )
+    schema.add_table(
+        tyr.lineage.tables.Core(
+            name="numbers",
+            columns=tyr.lineage.core.ColumnList(
+                [
+                    tyr.lineage.columns.Core(
+                        source=tyr.lineage.values.Integer(1), name="one"
+                    )
+                ]
+            ),
+        )
+    )
+
+    for i in range(10):
+        schema.add_table(
+            tyr.lineage.tables.Core(
+                name=rf"derived_{i}",
+                source=tyr.lineage.tables.Select(schema.tables["numbers"]),
+                columns=tyr.lineage.macros.columns.select_all(schema.tables["numbers"]),
+            )
+        )
+
+    schema.save(str(tmp_path))
+    path = str(tmp_path / "project.schema")
+
+    with tyr.lineage.schema.core.SchemaStore(path) as store:
+        table = store.table("derived_3")
+
+        # Only the table, the table it selects from and the schema are loaded
+        assert table.sql == schema.tables["derived_3"].sql
+        assert len(store._loaded) == 3
+
+    assert store._data.closed
+
+    loaded = tyr.lineage.schema.core.load_schema(path)
+
+    assert loaded.tables.list_names_() == schema.tables.list_names_()
+    assert [table.sql for table in loaded.tables.list_tables_()] == [
+        table.sql for table in schema.tables.list_tables_()
+    ]
+    assert loaded.tables["derived_3"].source.source is loaded.tables["numbers"]
+
+    # Schemas pickled before .schema files still load
+    with open(tmp_path / "project.pkl", "wb") as f:
+        pickle.dump(schema, f, pickle.HIGHEST_PROTOCOL)
+
+    assert (
+        tyr.lineage.schema.core.load_schema(
+            str(tmp_path / "project.pkl")
+        ).tables.list_names_()
+        == schema.tables.list_names_()
+    )
+
+
+def test_infer_column_metadata(tmp_path):
+    import pandas as pd
+
+    for session in range(200):
+        # Later sessions add a column, which is only found by sampling more than the first file
+        pit_stops = session >= 100
+
+        with open(tmp_path / rf"laps_session_{session:03d}.tsv", "w") as f:
+            f.write(
+                "lap_id\tsession_key\tlap\tdriver\tlap_time\tstarted_at"
+                + ("\tpit_stop" if pit_stops else "")
+                + "\n"
+            )
+
+            for lap in range(50):
+                f.write(
+                    "\t".join(
+                        [
+                            str(session * 50 + lap),
+                            str(session),
+                            str(lap),
+                            ["VER", "HAM", "LEC"][lap % 3],
+                            str(90 + lap / 10),
+                            rf"2024-03-02 15:{lap:02d}:00",
+                        ]
+                        + (["true" if lap % 20 == 0 else "false"] if pit_stops else [])
+                    )
+                    + "\n"
+                )
+
+    (tmp_path / "drivers.csv").write_text("number,name\n1,VER\n44,HAM\n")
+
+    file_metadata = pd.DataFrame(
+        [
+            {
+                "schema": "staging",
+                "dataset": "laps",
+                "file_regex": str(tmp_path / "laps_session_*.tsv"),
+                "delim": "t",
+            },
+            {
+                "schema": "staging",
+                "dataset": "drivers",
+                "file_regex": str(tmp_path / "drivers.csv"),
+                "delim": "c",
+            },
+            {
+                "schema": "staging",
+                "dataset": "missing",
+                "file_regex": str(tmp_path / "missing_*.tsv"),
+                "delim": "t",
+            },
+        ]
+    )
+
+    column_metadata = tyr.lineage.schema.source.init_column_metadata(
+        file_metadata=file_metadata, max_workers=2
+    )
+
+    assert column_metadata["dataset"].tolist() == ["laps"] * 7 + ["drivers"] * 2
+    assert column_metadata["ordinal_position"].tolist() == [0, 1, 2, 3, 4, 5, 6, 0, 1]
+
+    laps = column_metadata[column_metadata["dataset"] == "laps"].set_index(
+        "column_name"
+    )
+
+    assert laps["data_type"].to_dict() == {
+        "lap_id": "INTEGER",
+        "session_key": "INTEGER",
+        "lap": "INTEGER",
+        "driver": "VARCHAR",
+        "lap_time": "FLOAT",
+        "started_at": "TIMESTAMP",
+        "pit_stop": "BOOLEAN",
+    }
+    assert laps["var_type"].to_dict() == {
+        "lap_id": "key",
+        "session_key": "numeric",
+        "lap": "numeric",
+        "driver": "categorical",
+        "lap_time": "numeric",
+        "started_at": "timestamp",
+        "pit_stop": "categorical",
+    }
+
+    # Types are proposed from the same rows on every run
+    assert tyr.lineage.schema.source.init_column_metadata(
+        file_metadata=file_metadata, max_workers=2
+    ).equals(column_metadata)
+
+
+def test_parallel_staging():
+    settings = tyr.lineage.schema.source.SourceSettings(
+        file_metadata=tyr.lineage.schema.source.read_file_metadata(
+            os.path.join(os.path.dirname(__file__), "configurations/file_metadata.tsv")
+        ),
+        expected_column_metadata=tyr.lineage.schema.source.read_column_metadata(
+            os.path.join(
+                os.path.dirname(__file__), "configurations/column_metadata.tsv"
+            )
+        ),
+    )
+
+    source = tyr.lineage.schema.source.Source(settings=settings)
+    staging = tyr.lineage.schema.staging.Staging(
+        source=source,
+        settings=tyr.lineage.schema.staging.StagingSettings(name="staging"),
+    )
+
+    parallel_source = tyr.lineage.schema.source.Source(settings=settings, processes=2)
+    parallel_staging = tyr.lineage.schema.staging.Staging(
+        source=parallel_source,
+        settings=tyr.lineage.schema.staging.StagingSettings(name="staging"),
+        processes=2,
+    )
+
+    assert parallel_staging.tables.list_names_() == staging.tables.list_names_()
+    assert [table.sql for table in parallel_staging.tables.list_tables_()] == [
+        table.sql for table in staging.tables.list_tables_()
+    ]
+    assert (
+        parallel_staging.root_graph().rx_graph.num_nodes()
+        == staging.root_graph().rx_graph.num_nodes()
+    )
+
+    # Built tables refer to the source tables of this process
+    for table in parallel_staging.tables.list_tables_():
+        assert table.source.source is parallel_source.tables[table.name]
+
+
+def test_build_plan():
+    schema = tyr.lineage.schema.project.Project(
+        settings=tyr.lineage.schema.project.ProjectSettings(name="project")
+    )
+
+    for name in ["numbers", "letters"]:
+        schema.add_table(
+            tyr.lineage.tables.Core(
+                name=name,
+                columns=tyr.lineage.core.ColumnList(
+                    [
+                        tyr.lineage.columns.Core(
+                            source=tyr.lineage.values.Integer(1), name="one"
+                        )
+                    ]
+                ),
+            )
+        )
+
+    for name, source in [("derived", "numbers"), ("twice_derived", "derived")]:
+        schema.add_table(
+            tyr.lineage.tables.Core(
+                name=name,
+                source=tyr.lineage.tables.Select(schema.tables[source]),
+                columns=tyr.lineage.macros.columns.select_all(schema.tables[source]),
+            )
+        )
+
+    plan = tyr.database.core.build_plan(schema)
+
+    assert plan.generations == [["numbers", "letters"], ["derived"], ["twice_derived"]]
+    assert tyr.database.core.get_build_order(schema) == plan.order
+    assert plan.dependents("numbers") == ["derived", "twice_derived"]
+    assert plan.without(["numbers"]).generations == [
+        ["letters", "derived"],
+        ["twice_derived"],
+    ]
+
+    plan = tyr.database.core.BuildPlan(
+        {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"], "e": ["missing"]}
+    )
+
+    assert plan.generations == [["a", "e"], ["b", "c"], ["d"]]
+
+    try:
+        tyr.database.core.BuildPlan({"a": ["b"], "b": ["a"], "c": []})
+    except ValueError as e:
+        assert "['a', 'b']" in str(e)
+    else:
+        assert False
+
+
+def test_parallel_create_tables():
+    schema = tyr.lineage.schema.project.Project(
+        settings=tyr.lineage.schema.project.ProjectSettings(
+            name="project", connection={"threads": 4}
+        )
+    )
+
+    def add_table(name, source=None, column=None):
+        if source is None:
+            schema.add_table(
+                tyr.lineage.tables.Core(
+                    name=name,
+                    columns=tyr.lineage.core.ColumnList(
+                        [tyr.lineage.columns.Core(source=column, name="one")]
+                    ),
+                )
+            )
+        else:
+            schema.add_table(
+                tyr.lineage.tables.Core(
+                    name=name,
+                    source=tyr.lineage.tables.Select(schema.tables[source]),
+                    columns=tyr.lineage.macros.columns.select_all(
+                        schema.tables[source]
+                    ),
+                )
+            )
+
+    add_table("numbers", column=tyr.lineage.values.Integer(1))
+    add_table(
+        "broken",
+        column=tyr.lineage.functions.data_type.Cast(
+            source=tyr.lineage.values.Varchar("one"),
+            data_type=tyr.lineage.values.Datatype("INTEGER"),
+        ),
+    )
+    add_table("derived", source="numbers")
+    add_table("broken_derived", source="broken")
+    add_table("twice_broken_derived", source="broken_derived")
+
+    conn = tyr.database.connections.Connection(
+        name="test", syntax="duckdb", database=":memory:"
+    )
+
+    try:
+        tyr.database.core.create_tables(schema, conn)
+    except ValueError as e:
+        assert "['broken']" in str(e)
+    else:
+        assert False
+
+    # Only the tables depending on the failed table are skipped
+    assert sorted(conn.tables(schema="project")["table_name"].tolist()) == [
+        "derived",
+        "numbers",
+    ]
+
+    for name in ["broken", "broken_derived", "twice_broken_derived"]:
+        delattr(schema.tables, name)
+
+    report = tyr.database.core.create_tables(schema, conn)
+
+    assert report["table"].tolist() == ["numbers", "derived"]
+    assert report["generation"].tolist() == [0, 1]
+    assert report["status"].tolist() == ["built", "built"]
+    assert (report["duration"] >= 0).all()
+    assert conn.execute("SELECT one FROM project.derived").df()["one"].tolist() == [1]
+
+
+def test_incremental_create_tables(tmp_path):
+    def build_schema(value):
+        schema = tyr.lineage.schema.project.Project(
+            settings=tyr.lineage.schema.project.ProjectSettings(name="project")
+        )
+
+        for name, number in [("numbers", value), ("others", 2)]:
+            schema.add_table(
+                tyr.lineage.tables.Core(
+                    name=name,
+                    columns=tyr.lineage.core.ColumnList(
+                        [
+                            tyr.lineage.columns.Core(
+                                source=tyr.lineage.values.Integer(number), name="one"
+                            )
+                        ]
+                    ),
+                )
+            )
+
+        for name, source in [("derived", "numbers"), ("other_derived", "others")]:
+            schema.add_table(
+                tyr.lineage.tables.Core(
+                    name=name,
+                    source=tyr.lineage.tables.Select(schema.tables[source]),
+                    columns=tyr.lineage.macros.columns.select_all(
+                        schema.tables[source]
+                    ),
+                )
+            )
+
+        return schema
+
+    conn = tyr.database.connections.Connection(
+        name="test", syntax="duckdb", database=":memory:"
+    )
+
+    assert len(tyr.database.core.create_tables(build_schema(1), conn)) == 4
+    assert tyr.database.core.create_tables(build_schema(1), conn, overwrite=False).empty
+
+    # Only the changed table and the tables built from it are built again
+    report = tyr.database.core.create_tables(build_schema(3), conn, overwrite=False)
+
+    assert report["table"].tolist() == ["numbers", "derived"]
+    assert conn.execute("SELECT one FROM project.derived").df()["one"].tolist() == [3]
+
+    # Source tables change with the files they read
+    path = tmp_path / "numbers.csv"
+    path.write_text("one\n1\n")
+
+    source = tyr.lineage.schema.source.Source(
+        settings=tyr.lineage.schema.source.SourceSettings(
+            file_metadata={
+                "numbers": tyr.lineage.schema.source.FileMetadata(
+                    {
+                        "dataset": "numbers",
+                        "file_regex": str(tmp_path / "*.csv"),
+                        "delim": "c",
+                        "distinct": False,
+                        "schema": "source",
+                    }
+                )
+            },
+            expected_column_metadata={"numbers": {}},
+        )
+    )
+
+    fingerprint = tyr.database.core.table_fingerprints(source)["numbers"]
+
+    assert tyr.database.core.source_manifest(source.tables["numbers"])[0][0] == str(
+        path
+    )
+
+    path.write_text("one\n1\n2\n")
+
+    assert tyr.database.core.table_fingerprints(source)["numbers"] != fingerprint
+
+
+def test_append_materialization(tmp_path):
+    import datetime
+    import pandas as pd
+
+    def write(name, minutes):
+        (tmp_path / name).write_text(
+            "time,value\n"
+            + "".join(rf"2025-01-01 00:{m:02d}:00,{m * m}" + "\n" for m in minutes)
+        )
+
+    column_metadata = pd.DataFrame(
+        {
+            "schema": ["staging", "staging"],
+            "dataset": ["readings", "readings"],
+            "column_name": ["time", "value"],
+            "column_alias": ["event_ts", "value"],
+            "var_type": ["timestamp", "numeric"],
+            "data_type": ["TIMESTAMP", "INTEGER"],
+            "on_null": ["PASS", "PASS"],
+            "is_primary_key": [True, False],
+            "is_event_time": [True, False],
+            "filter_values": ["[]", "[]"],
+            "on_filter": ["PASS", "PASS"],
+            "regex": ["%Y-%m-%d %H:%M:%S", ""],
+            "source_unit": ["", ""],
+            "target_unit": ["", ""],
+            "scale_factor": ["", ""],
+            "precision": ["", ""],
+            "ordinal_position": [0, 1],
+        }
+    )
+
+    def build_schemas():
+        source = tyr.lineage.schema.source.Source(
+            settings=tyr.lineage.schema.source.SourceSettings(
+                file_metadata={
+                    "readings": tyr.lineage.schema.source.FileMetadata(
+                        {
+                            "dataset": "readings",
+                            "file_regex": str(tmp_path / "*.csv"),
+                            "delim": "c",
+                            "distinct": False,
+                            "schema": "staging",
+                        }
+                    )
+                },
+                expected_column_metadata=tyr.lineage.schema.source.read_column_metadata_frame(
+                    column_metadata
+                ),
+            )
+        )
+
+        staging = tyr.lineage.schema.staging.Staging(
+            source=source,
+            settings=tyr.lineage.schema.staging.StagingSettings(
+                name="staging",
+                materializations={"readings": tyr.lineage.schema.core.Append()},
+            ),
+        )
+
+        readings = staging.tables["readings"]
+
+        # Lag reads the row before, so the last row already built is read again
+        project = tyr.lineage.schema.project.Project(
+            settings=tyr.lineage.schema.project.ProjectSettings(
+                name="project",
+                materializations={
+                    "changes": tyr.lineage.schema.core.Append(
+                        lookback=datetime.timedelta(minutes=1)
+                    )
+                },
+            )
+        )
+
+        project.add_table(
+            tyr.lineage.tables.Core(
+                name="changes",
+                source=tyr.lineage.tables.Select(readings),
+                inherit_event_time=True,
+                columns=tyr.lineage.core.ColumnList(
+                    [
+                        tyr.lineage.columns.Select(readings.columns["event_ts"]),
+                        tyr.lineage.columns.Core(
+                            name="previous",
+                            source=tyr.lineage.functions.window.Lag(
+                                source=tyr.lineage.columns.Select(
+                                    readings.columns["value"]
+                                ),
+                                order_by=tyr.lineage.core.OrderBy(
+                                    columns=tyr.lineage.core.ColumnList(
+                                        [
+                                            tyr.lineage.columns.Select(
+                                                readings.event_time
+                                            )
+                                        ]
+                                    ),
+                                    how=[tyr.lineage.operators.Ascending()],
+                                ),
+                            ),
+                        ),
+                    ]
+                ),
+            )
+        )
+
+        return [source, staging, project]
+
+    conn = tyr.database.connections.Connection(
+        name="test", syntax="duckdb", database=":memory:"
+    )
+
+    write("first.csv", range(0, 5))
+
+    for schema in build_schemas():
+        tyr.database.core.create_tables(schema, conn)
+
+    write("second.csv", range(5, 8))
+
+    reports = [
+        tyr.database.core.create_tables(schema, conn, overwrite=False)
+        for schema in build_schemas()
+    ]
+
+    assert [report["status"].tolist() for report in reports] == [
+        ["built"],
+        ["appended"],
+        ["appended"],
+    ]
+
+    changes = conn.execute(
+        "SELECT event_ts, previous FROM project.changes ORDER BY event_ts"
+    ).df()
+
+    # Same as a full build, without the rows read again
+    assert len(changes) == 8
+    assert changes["previous"].tolist()[1:] == [m * m for m in range(0, 7)]
+
+
+def test_profile_create_tables():
+    schema = tyr.lineage.schema.project.Project(
+        settings=tyr.lineage.schema.project.ProjectSettings(name="project")
+    )
+
+    schema.add_table(
+        tyr.lineage.tables.Core(
+            name="numbers",
+            columns=tyr.lineage.core.ColumnList(
+                [
+                    tyr.lineage.columns.Core(
+                        source=tyr.lineage.values.Integer(1), name="one"
+                    )
+                ]
+            ),
+        )
+    )
+
+    schema.add_table(
+        tyr.lineage.tables.Core(
+            name="derived",
+            source=tyr.lineage.tables.Select(schema.tables["numbers"]),
+            columns=tyr.lineage.macros.columns.select_all(schema.tables["numbers"]),
+        )
+    )
+
+    conn = tyr.database.connections.Connection(
+        name="test", syntax="duckdb", database=":memory:"
+    )
+
+    tyr.database.core.create_tables(schema, conn, profile=True, run_id="run")
+
+    profile = conn.execute(
+        "SELECT * FROM main.tyr_run_profile WHERE run_id = 'run' ORDER BY table_name, operator_id"
+    ).df()
+
+    assert sorted(profile["table_name"].unique().tolist()) == ["derived", "numbers"]
+    assert "CREATE_TABLE_AS" in profile["operator_type"].tolist()
+    assert profile["timing"].notnull().all()
+
+    # Operators are children of the operator before them, or of an earlier operator
+    for table, operators in profile.groupby("table_name"):
+        assert operators["parent_id"].isnull().sum() == 1
+        assert (operators["parent_id"].dropna() < operators["operator_id"][1:]).all()
+
+
+def test_connection_cursor_pool(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    conn = tyr.database.connections.Connection(
+        name="test", syntax="duckdb", database=str(tmp_path / "test.duckdb")
+    )
+
+    # One cursor per thread, reused by its queries
+    assert conn.cursor() is conn.cursor()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(conn.cursor).result() is not conn.cursor()
+
+    # Cursors of finished threads are closed as other threads open theirs
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(conn.cursor).result()
+
+    assert len(conn._cursors) == 2
+
+    # Responses are read when executed, so stay as they were after later queries
+    first = conn.execute("SELECT 1 AS number")
+    second = conn.execute("SELECT 2 AS number")
+
+    assert first.df()["number"].tolist() == [1]
+    assert second.df()["number"].tolist() == [2]
+
+    # Statements whose result is not used are not read into a response
+    assert (
+        conn.execute(
+            "CREATE TABLE numbers (number INTEGER, label VARCHAR)", fetch=False
+        )
+        is None
+    )
+    conn.executemany(
+        "INSERT INTO numbers VALUES (?, ?)", [[i, rf"number {i}"] for i in range(100)]
+    )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        labels = list(
+            executor.map(
+                lambda i: conn.execute(
+                    "SELECT label FROM numbers WHERE number = $number", {"number": i}
+                ).df()["label"][0],
+                range(100),
+            )
+        )
+
+    assert labels == [rf"number {i}" for i in range(100)]
+
+    # Failed queries are not executed again
+    try:
+        conn.execute("INSERT INTO numbers VALUES (100, 'x'); SELECT error('failed')")
+    except Exception as e:
+        assert "failed" in str(e)
+    else:
+        assert False
+
+    assert conn.execute("SELECT COUNT(*) AS n FROM numbers").df()["n"][0] == 101
+
+    conn.close()
+
+    conn = tyr.database.connections.Connection(
+        name="test",
+        syntax="duckdb",
+        database=str(tmp_path / "test.duckdb"),
+        read_only=True,
+    )
+
+    conn.close()
+    conn.open()
+
+    try:
+        conn.execute("CREATE TABLE others (number INTEGER)")
+    except Exception as e:
+        assert "read-only" in str(e)
+    else:
+        assert False